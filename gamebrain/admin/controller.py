@@ -58,6 +58,7 @@ from ..gamedata.model import (
     GamespaceData,
     TeamGamespaceInfo,
 )
+from ..metrics import TimedRoute
 from ..util import url_path_join, TeamLocks
 
 
@@ -66,7 +67,9 @@ Success = bool
 
 
 admin_router = APIRouter(
-    prefix="/admin", dependencies=(Depends(admin_api_key_dependency),)
+    prefix="/admin",
+    dependencies=(Depends(admin_api_key_dependency),),
+    route_class=TimedRoute,
 )
 
 
@@ -301,7 +304,7 @@ async def _internal_deploy(deployment_data: Deployment):
         for team in deployment_data.teams
         for player in team.players
     ]
-    await store_game_session(
+    session_id = await store_game_session(
         session_teams,
         deployment_data.session.sessionBegin,
         deployment_data.session.sessionEnd,
@@ -309,6 +312,9 @@ async def _internal_deploy(deployment_data: Deployment):
         deployment_data.game.id,
         players,
     )
+    await GameStateManager.register_session(
+        session_id, session_teams, deployment_data.game.id
+    )
 
     await GameStateManager.init_challenges(gamespace_info)
     await GameStateManager.update_all_active_team_urls()
@@ -36,6 +36,7 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
     Request,
+    Response,
 )
 from fastapi.exceptions import RequestValidationError
 from fastapi.exception_handlers import (
@@ -53,6 +54,7 @@ from gamebrain.gamedata.model import GenericResponse
 from .clients import gameboard, topomojo
 from .config import Settings, get_settings, Global
 from .gamedata.controller import gamestate_router as gd_router
+from . import metrics
 from .pubsub import PubSub, Subscriber
 from .test_endpoints import test_router
 from .util import url_path_join
@@ -130,8 +132,8 @@ async def validation_exception_handler(
 
 
 # unpriv_router = APIRouter(prefix="/unprivileged")
-priv_router = APIRouter(prefix="/privileged")
-gamestate_router = APIRouter(prefix="/gamestate")
+priv_router = APIRouter(prefix="/privileged", route_class=metrics.TimedRoute)
+gamestate_router = APIRouter(prefix="/gamestate", route_class=metrics.TimedRoute)
 
 
 def format_message(event_message, event_time: Optional[datetime] = None):
@@ -165,6 +167,16 @@ async def liveness_check():
     return
 
 
+if get_settings().metrics_enabled:
+    # Unauthenticated, so it's only served when turned on.
+    @APP.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        return Response(
+            metrics.render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
 class GetTeamPostData(BaseModel):
     user_token: str
     server_container_hostname: str
@@ -357,18 +369,8 @@ async def gamestate_get_is_team_active(
 async def get_is_team_active(
     team_id: str
 ) -> GenericResponse:
-    # from .util import enable_sql_logger, disable_sql_logger
-
-    logging.info("Enabling SQL logging")
-    # await enable_sql_logger()
-    active_teams = {
-        team["id"]
-        for team in await db.get_active_teams()
-    }
-    # await disable_sql_logger()
-    logging.info("Disabled SQL logging")
     response = GenericResponse(
-        success=(team_id in active_teams),
+        success=await db.is_team_active(team_id),
         message=team_id
     )
     return response
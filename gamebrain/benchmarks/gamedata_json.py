@@ -0,0 +1,149 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+"""
+Compares the time it takes to serialize one GameData response with FastAPI's
+default encoding, pydantic's .json(), and the gamestate router's response
+class, both with orjson and with its standard library fallback.
+
+Run from the repository root, next to initial_state.json:
+
+    python -m gamebrain.benchmarks.gamedata_json
+"""
+
+import argparse
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+
+from ..gamedata import jsonresponse
+from ..gamedata.cache import GameDataCacheSnapshot, construct_full
+from ..gamedata.model import (
+    GameDataResponse,
+    LocationDataFull,
+    MissionDataFull,
+    TaskDataFull,
+)
+
+
+def full_game_data(initial_state_path: str) -> GameDataResponse:
+    """
+    A response for a team that has unlocked every location, mission and task,
+    which is the largest GameData payload the initial state can produce.
+    """
+    with open(initial_state_path) as f:
+        cache = GameDataCacheSnapshot(**json.load(f)).to_internal()
+    cache.build_index()
+    index = cache.index
+    team_data = cache.team_initial_state
+
+    locations = [
+        construct_full(
+            LocationDataFull,
+            index.location_fields[location_id],
+            {"unlocked": True, "visited": True, "scanned": True},
+        )
+        for location_id in cache.location_map.__root__
+    ]
+    missions = []
+    for mission_id in cache.mission_map.__root__:
+        tasks = [
+            construct_full(
+                TaskDataFull,
+                index.task_fields[task_id],
+                {"visible": True},
+            )
+            for task_id in index.tasks_by_mission.get(mission_id, ())
+        ]
+        missions.append(
+            construct_full(
+                MissionDataFull,
+                index.mission_fields[mission_id],
+                {"unlocked": True, "visible": True, "taskList": tasks},
+            )
+        )
+
+    return GameDataResponse.construct(
+        currentStatus=team_data.currentStatus,
+        session=team_data.session,
+        ship=team_data.ship,
+        locations=locations,
+        missions=missions,
+    )
+
+
+def fastapi_default(response: GameDataResponse) -> bytes:
+    # What a route returning the model gets: jsonable_encoder, then
+    # JSONResponse.render.
+    return json.dumps(
+        jsonable_encoder(response),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--initial-state", default="initial_state.json")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    response = full_game_data(args.initial_state)
+    encoders = {
+        "fastapi default": fastapi_default,
+        "pydantic .json()": lambda r: r.json().encode("utf-8"),
+        "GameStateJSONResponse json": jsonresponse._json_dumps,
+    }
+    if jsonresponse.orjson:
+        encoders["GameStateJSONResponse orjson"] = jsonresponse.dumps
+
+    expected = json.loads(fastapi_default(response))
+    for name, encode in encoders.items():
+        if json.loads(encode(response)) != expected:
+            raise SystemExit(f"{name} produced different JSON.")
+
+    print(
+        f"GameData payload: {len(fastapi_default(response))} bytes, "
+        f"{len(response.locations)} locations, "
+        f"{len(response.missions)} missions."
+    )
+    if not jsonresponse.orjson:
+        print("orjson is not installed, so only the json fallback is timed.")
+    for name, encode in encoders.items():
+        best = min(
+            timeit.repeat(
+                lambda: encode(response),
+                number=args.number,
+                repeat=args.repeat,
+            )
+        )
+        print(f"{name:>30}: {best / args.number * 1e6:10.1f} us per payload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,513 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+"""
+Benchmarks the GameStateManager operations that run on every game server
+poll and player action, against in-process stand-ins for Gameboard, TopoMojo
+and the database.
+
+Run from the repository root:
+
+    python -m gamebrain.benchmarks.hotpaths --teams 100
+
+Reports operations per second, p50/p99 latency, and how long each operation
+held the global and team locks. --save-baseline writes the results to a
+file, and --baseline compares against one and exits with status 1 if any
+operation regressed by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import partial
+import json
+import logging
+import sys
+import time
+from typing import Awaitable, Callable
+
+import yaml
+
+from ..admin.controllermodels import DeploymentSession
+from ..config import SettingsModel
+from ..gamedata.cache import GameDataCacheSnapshot, GameStateManager
+from ..gamedata.model import GamespaceData, TeamGamespaceInfo
+from ..metrics import InstrumentedLock
+from .standins import FakeDatabase, FakeGameboard, FakeTopoMojo, installed
+
+GATEWAY_VM_NAME = "gateway"
+
+_current_operation: ContextVar[str | None] = ContextVar(
+    "current_operation", default=None
+)
+
+
+class TimedLock(InstrumentedLock):
+    """
+    Records how long it's held, under the operation that held it.
+    """
+
+    def __init__(self, kind: str, hold_times: dict):
+        super().__init__(kind)
+        self._kind = kind
+        self._hold_times = hold_times
+        self._timed_from = 0.0
+
+    async def acquire(self) -> bool:
+        await super().acquire()
+        self._timed_from = time.perf_counter()
+        return True
+
+    def release(self):
+        held = time.perf_counter() - self._timed_from
+        operation = _current_operation.get()
+        if operation is not None:
+            self._hold_times.setdefault((operation, self._kind), []).append(
+                held
+            )
+        super().release()
+
+
+@dataclass
+class BenchmarkConfig:
+    teams: int = 20
+    # Calls per team for team operations, and in total for the ones that
+    # cover every team.
+    iterations: int = 20
+    concurrency: int = 10
+    # Seconds each stand-in request takes.
+    latency: float = 0.0
+    initial_state: str = "initial_state.json"
+    settings: str = "example.settings.yaml"
+
+
+@dataclass
+class OperationResult:
+    operation: str
+    latencies: list[float]
+    elapsed: float
+    lock_hold_times: dict[str, list[float]] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, float]:
+        summary = {
+            "ops_per_sec": len(self.latencies) / self.elapsed,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+        }
+        for kind, hold_times in sorted(self.lock_hold_times.items()):
+            summary[f"{kind}_lock_mean_ms"] = (
+                sum(hold_times) / len(hold_times) * 1000
+            )
+            summary[f"{kind}_lock_max_ms"] = max(hold_times) * 1000
+        return summary
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    ordered = sorted(values)
+    rank = max(1, round(percent / 100 * len(ordered) + 0.5))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class Harness:
+    config: BenchmarkConfig
+    team_ids: list[str]
+    gameboard: FakeGameboard
+    topomojo: FakeTopoMojo
+    db: FakeDatabase
+    hold_times: dict = field(default_factory=dict)
+
+
+def load_settings(path: str) -> SettingsModel:
+    with open(path) as f:
+        settings = yaml.safe_load(f)
+    # The benchmarks don't make any real connections.
+    settings.pop("ca_cert_path", None)
+    return SettingsModel(**settings)
+
+
+async def set_up(harness: Harness):
+    """
+    Loads the initial state and deploys the teams. The stand-ins need to be
+    installed first.
+    """
+    config = harness.config
+    with open(config.initial_state) as f:
+        initial_state = GameDataCacheSnapshot(**json.load(f))
+    await GameStateManager.init(initial_state, load_settings(config.settings))
+
+    hold_times = harness.hold_times
+    GameStateManager._lock = TimedLock("global", hold_times)
+    GameStateManager._team_locks = {
+        team_id: TimedLock("team", hold_times) for team_id in harness.team_ids
+    }
+    GameStateManager._team_network_locks = {}
+
+    cache = GameStateManager._cache
+    location_ids = list(cache.location_map.__root__)
+    now = datetime.now(timezone.utc)
+    team_gamespaces = {}
+    for team_id in harness.team_ids:
+        ship_gamespace_id = f"{team_id}-ship"
+        ship_gamespace = GamespaceData(
+            gamespaceID=ship_gamespace_id,
+            consoleURLs=[],
+            gatewayVmName=GATEWAY_VM_NAME,
+            gatewayNic=1,
+            gatewayWanNetworkName="ship",
+        )
+        await GameStateManager.new_team(
+            team_id,
+            DeploymentSession(
+                sessionBegin=now,
+                sessionEnd=now + timedelta(hours=4),
+                now=now,
+            ),
+            ship_gamespace,
+        )
+        harness.db.add_team(team_id, ship_gamespace_id)
+
+        # One challenge gamespace per mission, like a deployed game.
+        challenges = {}
+        gamespaces = {}
+        for n, mission in enumerate(cache.mission_map.__root__.values()):
+            gamespace_id = f"{team_id}-{mission.missionID}"
+            challenges[gamespace_id] = mission.missionID
+            gamespaces[mission.taskList[0].taskID] = GamespaceData(
+                taskID=mission.taskList[0].taskID,
+                locationID=location_ids[n % len(location_ids)],
+                gatewayVmName=GATEWAY_VM_NAME,
+                gatewayNic=1,
+                gamespaceID=gamespace_id,
+                consoleURLs=[],
+            )
+        harness.gameboard.add_team(team_id, challenges)
+        team_gamespaces[team_id] = TeamGamespaceInfo(
+            ship_gamespace_id=ship_gamespace_id,
+            ship_gamespace_data=ship_gamespace,
+            gamespaces=gamespaces,
+        )
+
+    await GameStateManager.init_challenges(team_gamespaces)
+    await GameStateManager.register_session(0, harness.team_ids, "game")
+    # GameData is built from the prefetched scores.
+    await GameStateManager._score_refresh_body()
+
+
+def _unlock_codes() -> list[str]:
+    return [
+        location.unlockCode
+        for location in GameStateManager._cache.location_map.__root__.values()
+        if location.unlockCode
+    ]
+
+
+def _jump_targets(team_id: str) -> list[str]:
+    final_destination = GameStateManager._settings.game.final_destination_name
+    team_data = GameStateManager._cache.team_map.__root__[team_id]
+    return [
+        location_id
+        for location_id in team_data.locations
+        if location_id != final_destination
+    ]
+
+
+async def _get_team_data(team_id: str):
+    # What the GameData route does.
+    game_data, session = await GameStateManager.get_versioned_team_data(
+        team_id
+    )
+    game_data.json(session)
+
+
+TeamOperation = Callable[[str, int], Awaitable]
+
+
+def team_operations() -> dict[str, tuple[TeamOperation | None, TeamOperation]]:
+    """
+    Each team operation is an untimed setup step and the timed call, both
+    given the team ID and iteration number.
+    """
+
+    async def unlock_location(team_id, n):
+        codes = _unlock_codes()
+        await GameStateManager.unlock_location(team_id, codes[n % len(codes)])
+
+    async def toggle_power(team_id, n):
+        await GameStateManager.set_power_mode(
+            team_id, ("explorationMode", "launchMode")[n % 2]
+        )
+
+    async def cached(team_id, n):
+        await _get_team_data(team_id)
+
+    async def jump(team_id, n):
+        targets = _jump_targets(team_id)
+        await GameStateManager.jump(team_id, targets[n % len(targets)])
+
+    async def scan(team_id, n):
+        await GameStateManager.scan(team_id)
+
+    async def complete_comm_event(team_id, n):
+        await GameStateManager.complete_comm_event(team_id)
+
+    async def get_team_data(team_id, n):
+        await _get_team_data(team_id)
+
+    # Unlocking runs first, so that later operations see bigger teams.
+    return {
+        "unlock_location": (None, unlock_location),
+        "get_team_data": (cached, get_team_data),
+        "get_team_data_changed": (toggle_power, get_team_data),
+        "jump": (None, jump),
+        "scan": (None, scan),
+        "complete_comm_event": (None, complete_comm_event),
+    }
+
+
+def global_operations() -> dict[str, Callable[[], Awaitable]]:
+    return {
+        "mission_timer": partial(
+            GameStateManager._mission_timer_body, due_only=False
+        ),
+        "score_refresh": GameStateManager._score_refresh_body,
+        "snapshot_data": GameStateManager.snapshot_data,
+    }
+
+
+async def _run_team_operation(
+    harness: Harness,
+    name: str,
+    setup: TeamOperation | None,
+    operation: TeamOperation,
+) -> OperationResult:
+    config = harness.config
+    latencies = []
+    semaphore = asyncio.Semaphore(config.concurrency)
+
+    async def call(team_id: str, n: int):
+        async with semaphore:
+            token = _current_operation.set(name)
+            start = time.perf_counter()
+            try:
+                await operation(team_id, n)
+            finally:
+                latencies.append(time.perf_counter() - start)
+                _current_operation.reset(token)
+
+    elapsed = 0.0
+    for n in range(config.iterations):
+        # Setup for a round runs before it, so it isn't timed.
+        if setup is not None:
+            for team_id in harness.team_ids:
+                await setup(team_id, n)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(call(team_id, n) for team_id in harness.team_ids)
+        )
+        elapsed += time.perf_counter() - start
+    return OperationResult(name, latencies, elapsed)
+
+
+async def _run_global_operation(
+    harness: Harness, name: str, operation: Callable[[], Awaitable]
+) -> OperationResult:
+    latencies = []
+    token = _current_operation.set(name)
+    start = time.perf_counter()
+    try:
+        for _ in range(harness.config.iterations):
+            call_start = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - call_start)
+    finally:
+        _current_operation.reset(token)
+    return OperationResult(name, latencies, time.perf_counter() - start)
+
+
+async def run(config: BenchmarkConfig) -> dict[str, OperationResult]:
+    saved_locks = (
+        GameStateManager._lock,
+        GameStateManager._team_locks,
+        GameStateManager._team_network_locks,
+    )
+    harness = Harness(
+        config=config,
+        team_ids=[f"team{n:04}" for n in range(config.teams)],
+        gameboard=FakeGameboard(config.latency),
+        topomojo=FakeTopoMojo(GATEWAY_VM_NAME, config.latency),
+        db=FakeDatabase(),
+    )
+    results = {}
+    try:
+        with installed(harness.gameboard, harness.topomojo, harness.db):
+            await set_up(harness)
+            for name, (setup, operation) in team_operations().items():
+                results[name] = await _run_team_operation(
+                    harness, name, setup, operation
+                )
+            for name, operation in global_operations().items():
+                results[name] = await _run_global_operation(
+                    harness, name, operation
+                )
+    finally:
+        (
+            GameStateManager._lock,
+            GameStateManager._team_locks,
+            GameStateManager._team_network_locks,
+        ) = saved_locks
+
+    for (operation, kind), hold_times in harness.hold_times.items():
+        if operation in results:
+            results[operation].lock_hold_times[kind] = hold_times
+    return results
+
+
+def find_regressions(
+    summaries: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """
+    Operations whose throughput dropped, or whose latency rose, by more than
+    tolerance (a fraction) compared to the baseline.
+    """
+    regressions = []
+    for operation, expected in baseline.items():
+        actual = summaries.get(operation)
+        if actual is None:
+            continue
+        if actual["ops_per_sec"] < expected["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{operation}: {actual['ops_per_sec']:.1f} ops/sec, "
+                f"baseline {expected['ops_per_sec']:.1f}"
+            )
+        for key in ("p50_ms", "p99_ms"):
+            if actual[key] > expected[key] * (1 + tolerance):
+                regressions.append(
+                    f"{operation}: {key} {actual[key]:.3f}, "
+                    f"baseline {expected[key]:.3f}"
+                )
+    return regressions
+
+
+def print_report(summaries: dict[str, dict[str, float]]):
+    print(
+        f"{'operation':<24}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'team lock ms (mean/max)':>26}{'global lock ms (max)':>22}"
+    )
+    for operation, summary in summaries.items():
+        team_lock = (
+            f"{summary['team_lock_mean_ms']:.3f}/"
+            f"{summary['team_lock_max_ms']:.3f}"
+            if "team_lock_mean_ms" in summary
+            else "-"
+        )
+        global_lock = (
+            f"{summary['global_lock_max_ms']:.3f}"
+            if "global_lock_max_ms" in summary
+            else "-"
+        )
+        print(
+            f"{operation:<24}{summary['ops_per_sec']:>12.1f}"
+            f"{summary['p50_ms']:>10.3f}{summary['p99_ms']:>10.3f}"
+            f"{team_lock:>26}{global_lock:>22}"
+        )
+
+
+def main():
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(
+        description="Benchmark GameStateManager hot paths."
+    )
+    parser.add_argument("--teams", type=int, default=defaults.teams)
+    parser.add_argument("--iterations", type=int, default=defaults.iterations)
+    parser.add_argument(
+        "--concurrency", type=int, default=defaults.concurrency
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=defaults.latency,
+        help="Seconds each Gameboard and TopoMojo request takes.",
+    )
+    parser.add_argument("--initial-state", default=defaults.initial_state)
+    parser.add_argument("--settings", default=defaults.settings)
+    parser.add_argument("--baseline", help="Compare against this file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed regression against the baseline, as a fraction.",
+    )
+    parser.add_argument("--save-baseline", help="Write the results here.")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level)
+    config = BenchmarkConfig(
+        teams=args.teams,
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        initial_state=args.initial_state,
+        settings=args.settings,
+    )
+    results = asyncio.run(run(config))
+    summaries = {
+        operation: result.summary() for operation, result in results.items()
+    }
+    print_report(summaries)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(
+                {"config": asdict(config), "results": summaries}, f, indent=2
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["config"] != asdict(config):
+            print(
+                "Warning: the baseline was run with a different "
+                f"configuration: {baseline['config']}"
+            )
+        regressions = find_regressions(
+            summaries, baseline["results"], args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
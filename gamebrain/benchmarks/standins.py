@@ -0,0 +1,379 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+"""
+In-process stand-ins for Gameboard, TopoMojo and the database, so that the
+benchmarks exercise the real client code without any services running.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import random
+from typing import Any
+from urllib.parse import unquote
+
+from httpx import AsyncClient, MockTransport, Request, Response
+from starlette.requests import Request as ASGIRequest
+from starlette.responses import Response as ASGIResponse
+import yaml
+
+from ..clients import gameboard, topomojo
+from ..gamedata import cache as gd_cache
+
+GamespaceID = str
+MissionID = str
+TeamID = str
+
+
+class FakeService:
+    """
+    Answers requests from an httpx client. Each request waits for latency
+    seconds first, to stand in for the network, and fails with a 503 at the
+    given error rate.
+
+    The service is also an ASGI app, for clients that should go through a
+    full HTTP request cycle.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+
+    async def handle(self, request: Request) -> Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return Response(503, json={"message": "Service unavailable."})
+        path = unquote(request.url.path).strip("/").split("/")
+        # Drop the API prefix.
+        if path and path[0] == "api":
+            path = path[1:]
+        result = self.route(request.method, path, request)
+        if result is None:
+            return Response(404, json={"message": "Not found."})
+        return Response(200, json=result)
+
+    def route(self, method: str, path: list[str], request: Request) -> Any:
+        raise NotImplementedError
+
+    def client(self, base_url: str) -> AsyncClient:
+        return AsyncClient(
+            base_url=base_url, transport=MockTransport(self.handle)
+        )
+
+    async def __call__(self, scope, receive, send):
+        asgi_request = ASGIRequest(scope, receive)
+        response = await self.handle(
+            Request(
+                asgi_request.method,
+                str(asgi_request.url),
+                headers=asgi_request.headers.raw,
+                content=await asgi_request.body(),
+            )
+        )
+        await ASGIResponse(
+            response.content,
+            status_code=response.status_code,
+            media_type="application/json",
+        )(scope, receive, send)
+
+    def asgi_client(self, base_url: str) -> AsyncClient:
+        return AsyncClient(base_url=base_url, app=self)
+
+
+class FakeGameboard(FakeService):
+    def __init__(
+        self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0
+    ):
+        super().__init__(latency, error_rate, seed)
+        self.team_challenges: dict[TeamID, dict[GamespaceID, MissionID]] = {}
+        self.team_games: dict[TeamID, str] = {}
+        self.session_end = datetime.now(timezone.utc) + timedelta(hours=4)
+
+    def add_team(
+        self,
+        team_id: TeamID,
+        challenges: dict[GamespaceID, MissionID],
+        game_id: str = "game",
+    ):
+        self.team_challenges[team_id] = challenges
+        self.team_games[team_id] = game_id
+
+    def route(self, method: str, path: list[str], request: Request) -> Any:
+        match method, path:
+            case "GET", ["game", game_id, "score"]:
+                return self.game_score(game_id)
+            case "GET", ["team", team_id, "score"]:
+                return self.team_score(team_id)
+            case "GET", ["team", team_id]:
+                return {"teamId": team_id, "sessionEnd": str(self.session_end)}
+            case "GET", ["gameEngine", "state"]:
+                return self.game_engine_state(request.url.params["teamId"])
+        return None
+
+    def game_score(self, game_id: str) -> dict | None:
+        team_ids = [
+            team_id
+            for team_id, team_game_id in self.team_games.items()
+            if team_game_id == game_id
+        ]
+        if not team_ids:
+            return None
+        mission_ids = {
+            mission_id
+            for team_id in team_ids
+            for mission_id in self.team_challenges[team_id].values()
+        }
+        return {
+            "game": self._game_info(game_id, mission_ids),
+            "teams": [self._team_score(team_id) for team_id in team_ids],
+        }
+
+    def team_score(self, team_id: TeamID) -> dict:
+        return {
+            "gameInfo": self._game_info(
+                self.team_games.get(team_id, "game"),
+                self.team_challenges.get(team_id, {}).values(),
+            ),
+            "score": self._team_score(team_id),
+        }
+
+    @staticmethod
+    def _game_info(game_id: str, mission_ids) -> dict:
+        return {
+            "id": game_id,
+            "name": "Benchmark",
+            "isTeamGame": True,
+            "specs": [
+                {
+                    "id": f"spec-{mission_id}",
+                    "name": mission_id,
+                    "description": None,
+                    "completionScore": 100.0,
+                    "possibleBonuses": [],
+                    "maxPossibleScore": 150.0,
+                }
+                for mission_id in mission_ids
+            ],
+        }
+
+    def _team_score(self, team_id: TeamID) -> dict:
+        challenges = self.team_challenges.get(team_id, {})
+        return {
+            "team": {"id": team_id, "name": team_id},
+            "players": [],
+            "overallScore": _score(0),
+            "cumulativeTimeMs": 0,
+            "challenges": [
+                {
+                    "id": gamespace_id,
+                    "specId": f"spec-{mission_id}",
+                    "name": mission_id,
+                    "result": "none",
+                    "score": _score(0),
+                    "timeElapsed": None,
+                    "bonuses": [],
+                    "manualBonuses": [],
+                    "unclaimedBonuses": [
+                        {
+                            "id": "bonus",
+                            "description": "First solve",
+                            "pointValue": 50,
+                        }
+                    ],
+                }
+                for gamespace_id, mission_id in challenges.items()
+            ],
+        }
+
+    def game_engine_state(self, team_id: TeamID) -> list[dict]:
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                "id": gamespace_id,
+                "name": mission_id,
+                "managerId": team_id,
+                "managerName": team_id,
+                "markdown": None,
+                "audience": "gameboard",
+                "launchpointUrl": None,
+                "isActive": True,
+                "hasDeployedGamespace": True,
+                "players": [],
+                "vms": [],
+                "challenge": {
+                    "text": None,
+                    "maxPoints": 100,
+                    "maxAttempts": 3,
+                    "attempts": 0,
+                    "score": 0.0,
+                    "sectionCount": 1,
+                    "sectionIndex": 0,
+                    "sectionScore": 0.0,
+                    "sectionText": None,
+                    "lastScoreTime": str(now),
+                    "questions": [
+                        {
+                            "answer": None,
+                            "example": None,
+                            "hint": None,
+                            "isCorrect": False,
+                            "isGraded": False,
+                            "text": "Question",
+                            "weight": 1.0,
+                        }
+                    ],
+                },
+                "whenCreated": str(now),
+                "startTime": str(now),
+                "endTime": str(self.session_end),
+                "expirationTime": str(self.session_end),
+            }
+            for gamespace_id, mission_id in self.team_challenges.get(
+                team_id, {}
+            ).items()
+        ]
+
+
+def _score(points: int) -> dict:
+    return {
+        "completionScore": points,
+        "manualBonusScore": 0,
+        "bonusScore": 0,
+        "totalScore": points,
+    }
+
+
+class FakeTopoMojo(FakeService):
+    """
+    Every gamespace has one gateway VM, named gateway_vm_name. Gamespaces
+    added with add_gamespace also have a workspace document, which deployment
+    reads.
+    """
+
+    def __init__(
+        self,
+        gateway_vm_name: str,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        super().__init__(latency, error_rate, seed)
+        self.gateway_vm_name = gateway_vm_name
+        self.vm_nets: dict[str, str] = {}
+        self.documents: dict[GamespaceID, str] = {}
+
+    def add_gamespace(self, gamespace_id: GamespaceID, document: dict):
+        self.documents[gamespace_id] = yaml.safe_dump(document)
+
+    def route(self, method: str, path: list[str], request: Request) -> Any:
+        match method, path:
+            case "GET", ["vms"]:
+                gamespace_id = request.url.params["filter"]
+                return [
+                    {
+                        "id": f"{gamespace_id}-{self.gateway_vm_name}",
+                        "name": f"{self.gateway_vm_name}#{gamespace_id}",
+                    }
+                ]
+            case "GET", ["vm", vm_id, "nets"]:
+                gamespace_id = vm_id.rsplit("-", 1)[0]
+                return {
+                    "net": [
+                        f"ship#{gamespace_id}",
+                        f"deepspace#{gamespace_id}",
+                    ]
+                }
+            case "PUT", ["vm", vm_id, "change"]:
+                self.vm_nets[vm_id] = request.read().decode()
+                return {"id": vm_id}
+            case "POST", ["dispatch"]:
+                return {"id": "dispatch"}
+            case "GET", ["gamespace", gamespace_id]:
+                if document := self.documents.get(gamespace_id):
+                    return {"id": gamespace_id, "markdown": document}
+                return {"id": gamespace_id}
+        return None
+
+
+class FakeDatabase:
+    """
+    The team rows the game state manager looks up.
+    """
+
+    def __init__(self):
+        self.teams: dict[TeamID, dict] = {}
+
+    def add_team(self, team_id: TeamID, ship_gamespace_id: GamespaceID):
+        self.teams[team_id] = {
+            "id": team_id,
+            "ship_gamespace_id": ship_gamespace_id,
+            "active": True,
+        }
+
+    async def get_team(self, team_id: TeamID) -> dict:
+        return self.teams.get(team_id, {})
+
+
+@contextmanager
+def installed(
+    fake_gameboard: FakeGameboard,
+    fake_topomojo: FakeTopoMojo,
+    fake_db: FakeDatabase,
+):
+    """
+    Points the Gameboard and TopoMojo clients, and the game state manager's
+    database lookups, at the stand-ins until the block exits.
+    """
+    saved = (
+        gameboard.GAMEBOARD_CLIENT,
+        topomojo.TOPOMOJO_CLIENT,
+        gd_cache.get_team,
+    )
+    gameboard.GAMEBOARD_CLIENT = fake_gameboard.client(
+        "http://gameboard.benchmark/api/"
+    )
+    # Requests shared from an earlier run were made on another event loop.
+    gameboard.RequestBatcher.reset()
+    topomojo.TOPOMOJO_CLIENT = fake_topomojo.client(
+        "http://topomojo.benchmark/api/"
+    )
+    gd_cache.get_team = fake_db.get_team
+    try:
+        yield
+    finally:
+        (
+            gameboard.GAMEBOARD_CLIENT,
+            topomojo.TOPOMOJO_CLIENT,
+            gd_cache.get_team,
+        ) = saved
@@ -28,6 +28,7 @@ import logging
 
 from . import db
 from .clients import gameboard
+from .metrics import BackgroundCycle
 from .util import cleanup_team, cleanup_dead_sessions
 
 CLEANUP_INTERVAL = timedelta(seconds=30)
@@ -79,7 +80,8 @@ class BackgroundCleanupTask:
             try:
                 await asyncio.sleep(CLEANUP_INTERVAL.seconds)
 
-                await cls._cleanup_body()
+                async with BackgroundCycle("cleanup"):
+                    await cls._cleanup_body()
 
             except Exception as e:
                 logging.exception(f"Cleanup task exception: {str(e)}")
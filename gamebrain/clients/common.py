@@ -24,10 +24,13 @@
 
 from enum import Enum
 from logging import error
+import time
 from typing import Any
 
 from httpx import AsyncClient, Response
 
+from ..metrics import OUTBOUND_DURATION, OUTBOUND_ERRORS, normalize_endpoint
+
 
 class HttpMethod(Enum):
     GET = "GET"
@@ -42,7 +45,11 @@ class RequestFailure(Exception):
 
 
 async def _service_request_and_log(
-    client: AsyncClient, method: HttpMethod, endpoint: str, data: dict[Any] = None
+    client: AsyncClient,
+    method: HttpMethod,
+    endpoint: str,
+    data: dict[Any] = None,
+    service: str = "unknown",
 ) -> Response:
     args = {
         "method": method.value,
@@ -57,8 +64,17 @@ async def _service_request_and_log(
 
     request = client.build_request(**args)
 
-    response = await client.send(request)
+    labels = (service, method.value, normalize_endpoint(endpoint))
+    start = time.perf_counter()
+    try:
+        response = await client.send(request)
+    except Exception:
+        OUTBOUND_ERRORS.inc(*labels)
+        raise
+    finally:
+        OUTBOUND_DURATION.observe(time.perf_counter() - start, *labels)
     if not response.is_success:
+        OUTBOUND_ERRORS.inc(*labels)
         api_key = request.headers.get('x-api-key')
         if api_key:
             request.headers['x-api-key'] = '<secret>'
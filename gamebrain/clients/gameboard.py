@@ -22,10 +22,13 @@
 
 # DM23-0100
 
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
 import json as jsonlib
 from logging import error, warning
 import ssl
-from typing import Any, Optional
+import time
+from typing import Any, Optional, TypeVar
 
 from httpx import AsyncClient
 from pydantic import ValidationError
@@ -33,6 +36,7 @@ from pydantic import ValidationError
 from .common import _service_request_and_log, HttpMethod, RequestFailure
 from .gameboardmodels import (
     GameEngineGameState,
+    GameScore,
     TeamGameScoreQueryResponse,
     TeamData
 )
@@ -42,6 +46,12 @@ GAMEBOARD_CLIENT = None
 
 GameID = str
 
+# Used until the settings are initialized.
+DEFAULT_BATCH_WINDOW = 1.0
+DEFAULT_MAX_CONCURRENT_REQUESTS = 10
+
+T = TypeVar("T")
+
 
 class ModuleSettings:
     settings = None
@@ -78,7 +88,7 @@ async def _gameboard_request(
     method: HttpMethod, endpoint: str, data: Optional[Any]
 ) -> Optional[Any] | None:
     response = await _service_request_and_log(
-        _get_gameboard_client(), method, endpoint, data
+        _get_gameboard_client(), method, endpoint, data, "gameboard"
     )
     try:
         data = response.json()
@@ -112,6 +122,79 @@ async def _gameboard_put(
     return await _gameboard_request(HttpMethod.PUT, endpoint, json_data)
 
 
+class RequestBatcher:
+    """
+    Coalesces Gameboard requests. A request for something that was already
+    requested less than the batch window ago, or is still in flight, gets
+    that request's result instead of making its own. Failed requests aren't
+    shared after they finish. Per-team requests also share a limit on how
+    many are made at once.
+    """
+
+    _requests: dict[Hashable, tuple[float, asyncio.Task]] = {}
+    # Created on first use, with the limit from the settings.
+    _semaphore: asyncio.Semaphore | None = None
+    # Cleared if Gameboard doesn't have the game score endpoint.
+    game_scores_supported = True
+
+    @staticmethod
+    def _batch_settings() -> tuple[float, int]:
+        settings = ModuleSettings.settings
+        if settings is None:
+            return DEFAULT_BATCH_WINDOW, DEFAULT_MAX_CONCURRENT_REQUESTS
+        return (
+            settings.gameboard.batch_window,
+            settings.gameboard.max_concurrent_requests,
+        )
+
+    @classmethod
+    def reset(cls):
+        """
+        Forgets shared requests and the request limit, e.g. when the settings
+        change or before the client is used from another event loop.
+        """
+        cls._requests = {}
+        cls._semaphore = None
+        cls.game_scores_supported = True
+
+    @classmethod
+    async def shared(
+        cls,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[T]],
+        window: float | None = None,
+    ) -> T:
+        """
+        window overrides the batch window from the settings.
+        """
+        if window is None:
+            window = cls._batch_settings()[0]
+        now = time.monotonic()
+        request = cls._requests.get(key)
+        if request is None or (
+            request[1].done() and now - request[0] >= window
+        ):
+            task = asyncio.create_task(fetch())
+            task.add_done_callback(lambda task: cls._forget_failure(key, task))
+            request = cls._requests[key] = (now, task)
+        # One caller being cancelled shouldn't cancel the others' request.
+        return await asyncio.shield(request[1])
+
+    @classmethod
+    def _forget_failure(cls, key: Hashable, task: asyncio.Task):
+        if task.cancelled() or task.exception() or task.result() is None:
+            request = cls._requests.get(key)
+            if request is not None and request[1] is task:
+                del cls._requests[key]
+
+    @classmethod
+    async def limited(cls, fetch: Callable[[], Awaitable[T]]) -> T:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(cls._batch_settings()[1])
+        async with cls._semaphore:
+            return await fetch()
+
+
 class TeamDoesNotExist(Exception):
     """
     Raised when get_team receives a response
@@ -137,23 +220,16 @@ async def get_teams(game_id: str):
         return None
 
 
-async def mission_update(
-        team_id: str,
-        ignore_ids: list[str] = None,
+async def _fetch_challenge_states(
+    team_id: str,
 ) -> list[GameEngineGameState] | None:
     try:
         result = await _gameboard_get("gameEngine/state", {"teamId": team_id})
     except RequestFailure:
         return None
 
-    if ignore_ids is None:
-        ignore_ids = []
-    ignore_ids = set(ignore_ids)
-
     challenge_states = []
     for challenge_status in result:
-        if challenge_status["id"] in ignore_ids:
-            continue
         try:
             game_state = GameEngineGameState(**challenge_status)
         except ValidationError:
@@ -167,7 +243,39 @@ async def mission_update(
     return challenge_states
 
 
-async def team_score(team_id: str) -> TeamGameScoreQueryResponse | None:
+async def mission_update(
+        team_id: str,
+        ignore_ids: list[str] = None,
+) -> list[GameEngineGameState] | None:
+    """
+    Gameboard has no game-level version of gameEngine/state, so this is
+    always a per-team request. It's only shared while it's in flight, since
+    the mission timer polls sooner after player actions to see their effect.
+    The returned states are shared with other callers and must not be
+    modified.
+    """
+    challenge_states = await RequestBatcher.shared(
+        ("gameEngine/state", team_id),
+        lambda: RequestBatcher.limited(
+            lambda: _fetch_challenge_states(team_id)
+        ),
+        window=0,
+    )
+    if challenge_states is None:
+        return None
+
+    if ignore_ids is None:
+        ignore_ids = []
+    ignore_ids = set(ignore_ids)
+
+    return [
+        game_state
+        for game_state in challenge_states
+        if game_state.id not in ignore_ids
+    ]
+
+
+async def _fetch_team_score(team_id: str) -> TeamGameScoreQueryResponse | None:
     try:
         result = await _gameboard_get(f"team/{team_id}/score")
     except RequestFailure:
@@ -180,3 +288,66 @@ async def team_score(team_id: str) -> TeamGameScoreQueryResponse | None:
             f"Gameboard team/{team_id}/score returned JSON that could "
             f"not be validated as a TeamGameScoreSummary - {str(e)}"
         )
+
+
+async def _fetch_game_scores(
+    game_id: GameID,
+) -> dict[str, TeamGameScoreQueryResponse] | None:
+    """
+    Returns each team's score in the game, by team ID.
+    """
+    try:
+        result = await _gameboard_get(f"game/{game_id}/score")
+    except RequestFailure as e:
+        if e.status_code in (404, 405):
+            warning(
+                "Gameboard does not support game/{id}/score. Team scores "
+                "will be requested one team at a time."
+            )
+            RequestBatcher.game_scores_supported = False
+        return None
+
+    try:
+        game_score = GameScore(**result)
+    except (TypeError, ValidationError) as e:
+        error(
+            f"Gameboard game/{game_id}/score returned JSON that could "
+            f"not be validated as a GameScore - {str(e)}"
+        )
+        return None
+
+    return {
+        team_score.team.id: TeamGameScoreQueryResponse(
+            gameInfo=game_score.game, score=team_score
+        )
+        for team_score in game_score.teams
+    }
+
+
+async def team_score(
+    team_id: str,
+    game_id: GameID | None = None,
+    max_age: float | None = None,
+) -> TeamGameScoreQueryResponse | None:
+    """
+    Given the team's game, its score comes from the whole game's scores,
+    which are requested once for all of the game's teams. Otherwise, or if
+    that request fails, the team's score is requested on its own. The
+    returned score is shared with other callers and must not be modified.
+    max_age overrides the batch window, e.g. 0 to only join a request that's
+    still in flight.
+    """
+    if game_id is not None and RequestBatcher.game_scores_supported:
+        game_scores = await RequestBatcher.shared(
+            ("game/score", game_id),
+            lambda: _fetch_game_scores(game_id),
+            max_age,
+        )
+        if game_scores and team_id in game_scores:
+            return game_scores[team_id]
+
+    return await RequestBatcher.shared(
+        ("team/score", team_id),
+        lambda: RequestBatcher.limited(lambda: _fetch_team_score(team_id)),
+        max_age,
+    )
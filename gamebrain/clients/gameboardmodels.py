@@ -152,6 +152,11 @@ class TeamGameScoreQueryResponse(BaseModel):
     score: GameScoreTeam
 
 
+class GameScore(BaseModel):
+    game: GameScoreGameInfo
+    teams: list[GameScoreTeam]
+
+
 class TeamData(BaseModel):
     teamId: str
     sessionEnd: datetime
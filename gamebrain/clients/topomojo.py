@@ -75,7 +75,7 @@ async def _topomojo_request(
 ) -> Optional[Any] | None:
     try:
         response = await _service_request_and_log(
-            _get_topomojo_client(), method, endpoint, data
+            _get_topomojo_client(), method, endpoint, data, "topomojo"
         )
     except RequestFailure:
         return None
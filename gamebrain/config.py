@@ -28,11 +28,18 @@ import json
 import logging
 import os.path
 import ssl
+import time
 from typing import Optional, Literal
 
 import httpx
 import yaml
-from pydantic import BaseModel, validator, ValidationError
+from pydantic import (
+    BaseModel,
+    Field,
+    root_validator,
+    validator,
+    ValidationError,
+)
 
 from .clients import gameboard, topomojo
 from .dispatch import GamespaceStatusTask
@@ -40,6 +47,8 @@ from .gamedata.cache import (
     GameStateManager,
     GameDataCacheSnapshot,
 )
+from .gamedata.journal import ActionJournal
+from .metrics import BackgroundCycle
 from .cleanup import BackgroundCleanupTask
 import gamebrain.db as db
 from .pubsub import PubSub
@@ -62,6 +71,11 @@ class GameboardSettingsModel(BaseModel):
     base_api_url: str
     x_api_key: str
     x_api_client: str
+    # Score requests made within this many seconds of each other share one
+    # request to Gameboard.
+    batch_window: float = Field(default=1.0, ge=0)
+    # How many per-team requests are made to Gameboard at once.
+    max_concurrent_requests: int = Field(default=10, ge=1)
 
 
 class TopomojoSettingsModel(BaseModel):
@@ -74,6 +88,11 @@ class DbSettingsModel(BaseModel):
     connection_string: str
     drop_app_tables: Optional[bool]
     echo_sql: Optional[bool]
+    snapshot_format: db.SnapshotFormat = "json"
+    # Seconds between cache snapshots. Actions taken in between are kept in
+    # the journal, which is written every journal_flush_interval seconds.
+    checkpoint_interval: float = Field(default=60.0, gt=0)
+    journal_flush_interval: float = Field(default=1.0, gt=0)
 
 
 class ChangeNetArgumentsModel(BaseModel):
@@ -106,6 +125,31 @@ class ChallengeTask(BaseModel):
         return hash((self.task_id, self.vm_name, self.dispatch_command))
 
 
+class MissionUpdatePollingSettingsModel(BaseModel):
+    """
+    Intervals are in seconds. Each team is polled at its own interval, which
+    doubles (by backoff_factor) every time its challenge states are unchanged
+    and goes back to the minimum after a player action, a grading result or
+    a deploy. The mission timer sleeps until the next team is due, but for
+    at least global_min_interval and at most global_max_interval.
+    """
+
+    team_min_interval: float = Field(default=2.0, gt=0)
+    team_max_interval: float = Field(default=30.0, gt=0)
+    backoff_factor: float = Field(default=2.0, ge=1)
+    global_min_interval: float = Field(default=0.5, gt=0)
+    global_max_interval: float = Field(default=5.0, gt=0)
+
+    @root_validator(skip_on_failure=True)
+    def min_not_over_max(cls, values):
+        for scope in ("team", "global"):
+            if values[f"{scope}_min_interval"] > values[f"{scope}_max_interval"]:
+                raise ValueError(
+                    f"{scope}_min_interval is greater than {scope}_max_interval."
+                )
+        return values
+
+
 class GameSettingsModel(BaseModel):
     # Currently unused.
     event_actions: list[EventActionsSettingsModel] = []
@@ -124,6 +168,14 @@ class GameSettingsModel(BaseModel):
 
     headless_client_urls: dict[Hostname, ServerPublicUrl]
 
+    # How many teams' mission updates the mission timer fetches at once.
+    mission_update_concurrency: int = Field(default=10, ge=1)
+    mission_update_polling: MissionUpdatePollingSettingsModel = (
+        MissionUpdatePollingSettingsModel()
+    )
+    # Seconds between refreshes of every team's scores from Gameboard.
+    score_refresh_interval: float = Field(default=2.0, gt=0)
+
 
 class SettingsModel(BaseModel):
     ca_cert_path: str = None
@@ -134,6 +186,8 @@ class SettingsModel(BaseModel):
     db: DbSettingsModel
     game: GameSettingsModel
     profiling: bool = False
+    # Serve /metrics. It has no authentication.
+    metrics_enabled: bool = False
     gamebrain_admin_api_key: str
     log_level: Literal["DEBUG", "INFO",
                        "WARNING", "ERROR", "CRITICAL"] = "INFO"
@@ -186,12 +240,18 @@ class Global:
             settings.db.echo_sql,
         )
         gameboard.ModuleSettings.settings = settings
+        gameboard.RequestBatcher.reset()
         topomojo.ModuleSettings.settings = settings
         cls._init_jwks()
         await PubSub.init(settings)
 
         if stored_cache := await db.get_cache_snapshot():
             stored_cache_dict = json.loads(stored_cache)
+            # Teams are stored separately from the global data. Snapshots from
+            # before that have the teams inline, but a separately stored team
+            # is always newer.
+            for team_id, team_snapshot in (await db.get_team_snapshots()).items():
+                stored_cache_dict["team_map"][team_id] = json.loads(team_snapshot)
             try:
                 initial_cache = GameDataCacheSnapshot(**stored_cache_dict)
             except ValidationError as e:
@@ -207,6 +267,14 @@ class Global:
             logging.info(
                 "Initializing game data cache from initial_state.json.")
         await GameStateManager.init(initial_cache, settings)
+        for session in await db.get_active_game_sessions():
+            await GameStateManager.register_session(
+                session["id"],
+                [team["id"] for team in session["teams"]],
+                session["game_id"],
+            )
+        await GameStateManager.replay_journal(await ActionJournal.load())
+        ActionJournal.start(settings.db.journal_flush_interval)
         await GameStateManager.start_game_timers()
 
         cls._init_db_sync_task()
@@ -228,17 +296,54 @@ class Global:
 
     @classmethod
     async def _db_sync_task(cls):
+        settings = get_settings()
+        last_checkpoint = 0.0
         while True:
-            snapshot = await GameStateManager.snapshot_data()
-            try:
-                await db.store_cache_snapshot(snapshot)
-            except Exception as e:
-                logging.exception(e)
-            else:
-                time = datetime.datetime.now(tz=datetime.timezone.utc)
-                logging.debug(f"Saved cache snapshot at {time}.")
+            # Team actions are journaled, so their snapshots can wait for the
+            # next checkpoint. Global data isn't, so it's saved promptly.
+            checkpoint_due = (
+                time.monotonic() - last_checkpoint
+                >= settings.db.checkpoint_interval
+            )
+            if not checkpoint_due and not GameStateManager.global_data_changed():
+                await asyncio.sleep(10)
+                continue
+            async with BackgroundCycle("db_sync"):
+                saved = await cls._db_sync_body(settings)
+            if saved:
+                last_checkpoint = time.monotonic()
             await asyncio.sleep(10)
 
+    @classmethod
+    async def _db_sync_body(cls, settings: SettingsModel) -> bool:
+        """
+        Returns True if the changes were saved, or there were none.
+        """
+        changes = await GameStateManager.snapshot_changes()
+        if changes is None:
+            logging.debug("No cache changes to save.")
+            return True
+        try:
+            async with ActionJournal.checkpoint():
+                await db.store_cache_snapshot_changes(
+                    changes.global_snapshot,
+                    changes.team_snapshots,
+                    changes.replace_teams,
+                    settings.db.snapshot_format,
+                    changes.journal_checkpoints,
+                    changes.journal_obsolete_through,
+                )
+        except Exception as e:
+            logging.exception(e)
+            return False
+        GameStateManager.mark_snapshot_persisted(changes)
+        time_now = datetime.datetime.now(tz=datetime.timezone.utc)
+        logging.debug(
+            f"Saved cache snapshot at {time_now} with "
+            f"{len(changes.team_snapshots)} changed teams."
+        )
+        return True
+
     @classmethod
     def _init_db_sync_task(cls):
         cls.db_sync_task = asyncio.create_task(cls._db_sync_task())
@@ -22,12 +22,17 @@
 
 # DM23-0100
 
+import asyncio
+from contextlib import asynccontextmanager
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import partial
 import json
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Literal, Optional
+import zlib
 
 from sqlalchemy import (
     Column,
@@ -36,20 +41,48 @@ from sqlalchemy import (
     String,
     Boolean,
     JSON,
+    LargeBinary,
     ForeignKey,
     TIMESTAMP,
     inspect,
     select,
     delete,
+    event,
 )
+from sqlalchemy.sql.expression import Delete
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import (
+    declarative_base,
+    noload,
+    relationship,
+    sessionmaker,
+)
+
+from .metrics import DB_QUERY_DURATION
 
 
 NonNullStrCol = partial(Column, String, nullable=False)
 NonNullBoolCol = partial(Column, Boolean, nullable=False)
 NonNullIntCol = partial(Column, Integer, nullable=False)
 
+SnapshotFormat = Literal["json", "compressed"]
+# Compressed snapshots start with this, followed by a single format version
+# byte. Version 1 is zlib-compressed UTF-8 JSON.
+COMPRESSED_SNAPSHOT_MAGIC = b"GBSNAP"
+COMPRESSED_SNAPSHOT_VERSION = 1
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    context._gamebrain_start = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    # The statement type (SELECT, INSERT, ...) keeps the label set small.
+    statement_type = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    DB_QUERY_DURATION.observe(
+        time.perf_counter() - context._gamebrain_start, statement_type
+    )
+
 
 class DBManager:
     orm_base = declarative_base()
@@ -130,12 +163,42 @@ class DBManager:
         id = Column(Integer, primary_key=True)
         snapshot = Column(JSON)
 
+    class TeamSnapshot(orm_base):
+        __tablename__ = "team_snapshot"
+
+        id = Column(String(36), primary_key=True)
+        snapshot = Column(JSON)
+
+    class CompressedCacheSnapshot(orm_base):
+        __tablename__ = "compressed_cache_snapshot"
+
+        id = Column(Integer, primary_key=True)
+        snapshot = Column(LargeBinary, nullable=False)
+
+    class CompressedTeamSnapshot(orm_base):
+        __tablename__ = "compressed_team_snapshot"
+
+        id = Column(String(36), primary_key=True)
+        snapshot = Column(LargeBinary, nullable=False)
+
+    class JournalEntry(orm_base):
+        __tablename__ = "action_journal"
+
+        seq = Column(Integer, primary_key=True, autoincrement=False)
+        team_id = NonNullStrCol()
+        action = NonNullStrCol()
+        # JSON-formatted string
+        args = NonNullStrCol()
+        recorded_time = Column(TIMESTAMP(timezone.utc), nullable=False)
+
     @classmethod
-    def _orm_obj_to_dict(cls, obj: orm_base) -> Dict:
+    def _orm_obj_to_dict(cls, obj: orm_base, exclude: tuple[str] = ()) -> Dict:
         result = {}
         for column in inspect(obj).mapper.column_attrs.keys():
             result[column] = getattr(obj, column)
         for relation in inspect(obj).mapper.relationships.keys():
+            if relation in exclude:
+                continue
             result[relation] = [
                 cls._orm_obj_to_dict(item) for item in getattr(obj, relation)
             ]
@@ -151,16 +214,24 @@ class DBManager:
     ):
         if cls.engine and not (drop_first or change_echo):
             return
+        engine_args = {}
+        # SQLite (used in tests) doesn't pool its connections.
+        if not connection_string.startswith("sqlite"):
+            engine_args["pool_timeout"] = 10
         cls.engine = create_async_engine(
             connection_string,
             echo=echo,
             future=True,
             pool_pre_ping=True,
-            pool_timeout=10,
             connect_args={
                 "timeout": 10,
             },
+            **engine_args,
+        )
+        event.listen(
+            cls.engine.sync_engine, "before_cursor_execute", _before_execute
         )
+        event.listen(cls.engine.sync_engine, "after_cursor_execute", _after_execute)
         # I don't know if expire_on_commit is necessary here, but the SQLAlchemy docs used it.
         cls.session_factory = sessionmaker(
             cls.engine, expire_on_commit=False, class_=AsyncSession
@@ -169,23 +240,49 @@ class DBManager:
             if drop_first:
                 await connection.run_sync(cls.orm_base.metadata.drop_all)
             await connection.run_sync(cls.orm_base.metadata.create_all)
+        SessionDirectory.invalidate()
 
     @classmethod
-    async def get_rows(cls, orm_class: orm_base, *args) -> List[Dict]:
+    async def get_rows(
+        cls, orm_class: orm_base, *args, exclude: tuple[str] = ()
+    ) -> List[Dict]:
+        """
+        exclude: Names of relationships to leave unloaded and out of the
+        returned rows.
+        """
         async with cls.session_factory() as session:
-            query = select(orm_class).where(*args)
+            query = select(orm_class).where(*args).options(
+                *(noload(getattr(orm_class, name)) for name in exclude)
+            )
             result = (await session.execute(query)).unique().scalars().all()
-            return [cls._orm_obj_to_dict(item) for item in result]
+            return [cls._orm_obj_to_dict(item, exclude) for item in result]
 
     @classmethod
-    async def merge_rows(cls, items: list[object]) -> list[object]:
+    async def merge_rows(
+        cls, items: list[object], deletes: tuple[Delete] = ()
+    ) -> list[object]:
+        """
+        deletes: Delete statements to execute in the same transaction,
+        before merging.
+        """
         new_items = []
         async with cls.session_factory() as session:
+            for statement in deletes:
+                await session.execute(statement)
             for item in items:
                 new_items.append(await session.merge(item))
             await session.commit()
         return new_items
 
+    @classmethod
+    async def add_rows(cls, items: list[object]):
+        """
+        Inserts new rows without merge's per-row lookup.
+        """
+        async with cls.session_factory() as session:
+            session.add_all(items)
+            await session.commit()
+
     @classmethod
     async def delete_where(cls, orm_class: orm_base, *args):
         async with cls.session_factory() as session:
@@ -194,12 +291,182 @@ class DBManager:
             await session.commit()
 
 
+class SessionDirectory:
+    """
+    In-memory copy of the team and game session tables, including each
+    team's players, VMs and secrets. Events aren't kept, since nothing reads
+    them on a hot path.
+
+    Reads are served from memory. Every function in this module that writes
+    those tables does so in an update block and updates the copy before the
+    block ends, so it never goes stale. Team and session writes re-read the
+    rows they touched. Player, VM and secret writes apply the merged rows
+    directly.
+
+    A write replaces the dicts it changes instead of modifying them, so a
+    returned dict keeps its contents. Returned dicts are shared and must not
+    be modified.
+    """
+
+    # Held while writing, so a refresh can't be overtaken by an older one.
+    _lock = asyncio.Lock()
+    _loaded = False
+    _teams: dict[str, Dict] = {}
+    # Session columns only. Teams are attached on read.
+    _sessions: dict[int, Dict] = {}
+
+    TEAM_EXCLUDE = ("event_log",)
+    SESSION_EXCLUDE = ("teams",)
+
+    @classmethod
+    def invalidate(cls):
+        cls._loaded = False
+        cls._teams = {}
+        cls._sessions = {}
+
+    @classmethod
+    async def _load(cls):
+        """
+        Lock is assumed to be held.
+        """
+        if cls._loaded:
+            return
+        cls._teams = {
+            team["id"]: team
+            for team in await DBManager.get_rows(
+                DBManager.TeamData, exclude=cls.TEAM_EXCLUDE
+            )
+        }
+        cls._sessions = {
+            session["id"]: session
+            for session in await DBManager.get_rows(
+                DBManager.GameSession, exclude=cls.SESSION_EXCLUDE
+            )
+        }
+        cls._loaded = True
+
+    @classmethod
+    async def _ensure_loaded(cls):
+        if cls._loaded:
+            return
+        async with cls._lock:
+            await cls._load()
+
+    @classmethod
+    @asynccontextmanager
+    async def update(cls):
+        async with cls._lock:
+            await cls._load()
+            yield
+
+    @classmethod
+    async def refresh_teams(cls, team_ids: list[str]):
+        """
+        Lock is assumed to be held.
+        """
+        team_ids = list(team_ids)
+        if not team_ids:
+            return
+        rows = await DBManager.get_rows(
+            DBManager.TeamData,
+            DBManager.TeamData.id.in_(team_ids),
+            exclude=cls.TEAM_EXCLUDE,
+        )
+        for team_id in team_ids:
+            cls._teams.pop(team_id, None)
+        for row in rows:
+            cls._teams[row["id"]] = row
+
+    @classmethod
+    def apply_team_rows(cls, relation: str, rows: list[object]):
+        """
+        Applies merged rows of one of the teams' relationships (players,
+        vm_data or secrets), the way the merge applied them to the database.
+        A row with an existing ID replaces it, even on another team.
+        Lock is assumed to be held.
+        """
+        rows = [DBManager._orm_obj_to_dict(row) for row in rows]
+        row_ids = {row["id"] for row in rows}
+        team_rows = defaultdict(list)
+        for row in rows:
+            team_rows[row["team_id"]].append(row)
+
+        for team_id, team in cls._teams.items():
+            kept = [row for row in team[relation] if row["id"] not in row_ids]
+            added = team_rows.get(team_id, [])
+            if added or len(kept) != len(team[relation]):
+                cls._teams[team_id] = team | {relation: kept + added}
+
+    @classmethod
+    async def refresh_session(cls, session_id: int):
+        """
+        Lock is assumed to be held.
+        """
+        rows = await DBManager.get_rows(
+            DBManager.GameSession,
+            DBManager.GameSession.id == session_id,
+            exclude=cls.SESSION_EXCLUDE,
+        )
+        cls._sessions.pop(session_id, None)
+        for row in rows:
+            cls._sessions[row["id"]] = row
+
+    @classmethod
+    def has_session(cls, session_id: int) -> bool:
+        return session_id in cls._sessions
+
+    @classmethod
+    def _with_teams(cls, session: Dict) -> Dict:
+        return session | {
+            "teams": [
+                team
+                for team in cls._teams.values()
+                if team["game_session_id"] == session["id"]
+            ]
+        }
+
+    @classmethod
+    async def get_team(cls, team_id: str) -> Dict | None:
+        await cls._ensure_loaded()
+        return cls._teams.get(team_id)
+
+    @classmethod
+    async def get_teams(cls, active: bool | None = None) -> list[Dict]:
+        await cls._ensure_loaded()
+        return [
+            team
+            for team in cls._teams.values()
+            if active is None or team["active"] == active
+        ]
+
+    @classmethod
+    async def get_sessions(cls, active: bool | None = None) -> list[Dict]:
+        await cls._ensure_loaded()
+        return [
+            cls._with_teams(session)
+            for session in cls._sessions.values()
+            if active is None or session["active"] == active
+        ]
+
+    @classmethod
+    async def get_team_session(cls, team_id: str) -> Dict | None:
+        await cls._ensure_loaded()
+        team = cls._teams.get(team_id)
+        if not team:
+            return None
+        session = cls._sessions.get(team["game_session_id"])
+        if not (session and session["active"]):
+            return None
+        return cls._with_teams(session)
+
+
 async def store_event(team_id: str, message: str):
     received_time = datetime.now(timezone.utc)
     event = [
         DBManager.Event(team_id=team_id, message=message,
                         received_time=received_time)
     ]
+    # Events aren't in the session directory.
     await DBManager.merge_rows(event)
     return received_time
 
@@ -221,7 +488,9 @@ async def store_virtual_machines(team_id: str, vms: List[Dict]):
         )
         for vm in vms
     ]
-    await DBManager.merge_rows(vm_data)
+    async with SessionDirectory.update():
+        merged_vm_data = await DBManager.merge_rows(vm_data)
+        SessionDirectory.apply_team_rows("vm_data", merged_vm_data)
 
 
 @dataclass
@@ -234,6 +503,16 @@ class PlayerInfo:
 async def store_players(
     players: list[PlayerInfo]
 ):
+    async with SessionDirectory.update():
+        await _store_players(players)
+
+
+async def _store_players(
+    players: list[PlayerInfo]
+):
+    """
+    Directory lock is assumed to be held.
+    """
     db_players = []
     for player in players:
         db_players.append(
@@ -244,7 +523,8 @@ async def store_players(
             )
         )
 
-    await DBManager.merge_rows(db_players)
+    merged_players = await DBManager.merge_rows(db_players)
+    SessionDirectory.apply_team_rows("players", merged_players)
 
 
 async def store_team(
@@ -271,7 +551,9 @@ async def store_team(
     if active is not None:
         kwargs["active"] = active
     team_data = DBManager.TeamData(id=team_id, **kwargs)
-    await DBManager.merge_rows([team_data])
+    async with SessionDirectory.update():
+        await DBManager.merge_rows([team_data])
+        await SessionDirectory.refresh_teams([team_id])
 
 
 async def store_game_session(
@@ -281,7 +563,10 @@ async def store_game_session(
     deployer_initial_time: datetime,
     game_id: str,
     players: list[PlayerInfo],
-):
+) -> int:
+    """
+    Returns the new session's ID.
+    """
     session_data = DBManager.GameSession(
         session_start=session_start,
         session_end=session_end,
@@ -289,51 +574,43 @@ async def store_game_session(
         game_id=game_id,
         active=True,
     )
-    merged_session_data = await DBManager.merge_rows([session_data])
-
-    for team_id in team_ids:
-        await store_team(
-            team_id,
-            game_session_id=merged_session_data[0].id,
-            active=True
+    async with SessionDirectory.update():
+        merged_session_data = await DBManager.merge_rows([session_data])
+        session_id = merged_session_data[0].id
+        await DBManager.merge_rows(
+            [
+                DBManager.TeamData(
+                    id=team_id, game_session_id=session_id, active=True
+                )
+                for team_id in team_ids
+            ]
         )
+        await SessionDirectory.refresh_session(session_id)
+        await SessionDirectory.refresh_teams(team_ids)
 
-    await store_players(players)
+        await _store_players(players)
+    return session_id
 
 
 async def get_team_game_session(team_id: str) -> dict:
-    team = await get_team(team_id)
-    if not team:
-        return None
-    try:
-        game_session = (
-            await DBManager.get_rows(
-                DBManager.GameSession,
-                DBManager.GameSession.id == team["game_session_id"],
-                DBManager.GameSession.active == True,
-            )
-        ).pop()
-        return game_session
-    except IndexError:
-        return None
+    return await SessionDirectory.get_team_session(team_id)
 
 
 async def get_active_game_sessions() -> list[dict]:
-    return await DBManager.get_rows(
-        DBManager.GameSession,
-        DBManager.GameSession.active == True,
-    )
+    return await SessionDirectory.get_sessions(active=True)
 
 
 async def get_all_sessions() -> list[dict]:
-    return await DBManager.get_rows(DBManager.GameSession)
+    return await SessionDirectory.get_sessions()
 
 
 async def get_active_teams() -> list[dict]:
-    return await DBManager.get_rows(
-        DBManager.TeamData,
-        DBManager.TeamData.active == True
-    )
+    return await SessionDirectory.get_teams(active=True)
+
+
+async def is_team_active(team_id: str) -> bool:
+    team = await SessionDirectory.get_team(team_id)
+    return bool(team and team["active"])
 
 
 async def deactivate_team(team_id: str):
@@ -347,40 +624,29 @@ async def deactivate_team(team_id: str):
         id=team_id,
         active=False,
     )
-    await DBManager.merge_rows([team_data])
+    async with SessionDirectory.update():
+        await DBManager.merge_rows([team_data])
+        await SessionDirectory.refresh_teams([team_id])
 
 
 async def deactivate_game_session(session_id: int):
-    # active_game = await get_team_game_session(session_id)
-    try:
-        session = (await DBManager.get_rows(
-            DBManager.GameSession,
-            DBManager.GameSession.id == session_id,
-        )
-        ).pop()
-    except IndexError:
-        return
-    if session:
+    async with SessionDirectory.update():
+        if not SessionDirectory.has_session(session_id):
+            return
         session = DBManager.GameSession(
-            id=session["id"],
+            id=session_id,
             active=False
         )
         await DBManager.merge_rows([session])
+        await SessionDirectory.refresh_session(session_id)
 
 
 async def get_team(team_id: str) -> Dict:
-    try:
-        return (
-            await DBManager.get_rows(
-                DBManager.TeamData, DBManager.TeamData.id == team_id
-            )
-        ).pop()
-    except IndexError:
-        return {}
+    return await SessionDirectory.get_team(team_id) or {}
 
 
 async def get_teams() -> List[Dict]:
-    return await DBManager.get_rows(DBManager.TeamData)
+    return await SessionDirectory.get_teams()
 
 
 async def get_vm(vm_id: str) -> Dict:
@@ -398,7 +664,9 @@ async def store_challenge_secrets(team_id: str, secrets: List[str]):
     objects = [
         DBManager.ChallengeSecret(id=secret, team_id=team_id) for secret in secrets
     ]
-    await DBManager.merge_rows(objects)
+    async with SessionDirectory.update():
+        merged_secrets = await DBManager.merge_rows(objects)
+        SessionDirectory.apply_team_rows("secrets", merged_secrets)
 
 
 async def store_media_assets(asset_map: Dict):
@@ -420,7 +688,140 @@ async def store_cache_snapshot(cache_snapshot: str):
     await DBManager.merge_rows([snapshot])
 
 
+def encode_compressed_snapshot(snapshot: str) -> bytes:
+    """
+    snapshot: JSON-formatted string
+    """
+    return (
+        COMPRESSED_SNAPSHOT_MAGIC
+        + bytes((COMPRESSED_SNAPSHOT_VERSION,))
+        + zlib.compress(snapshot.encode(), 6)
+    )
+
+
+def decode_compressed_snapshot(data: bytes) -> str:
+    """
+    Returns a JSON-formatted string.
+    """
+    header_length = len(COMPRESSED_SNAPSHOT_MAGIC) + 1
+    if (
+        len(data) < header_length
+        or not data.startswith(COMPRESSED_SNAPSHOT_MAGIC)
+    ):
+        raise ValueError("Data is not a compressed cache snapshot.")
+    version = data[header_length - 1]
+    if version != COMPRESSED_SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported compressed snapshot version {version}.")
+    return zlib.decompress(data[header_length:]).decode()
+
+
+async def store_cache_snapshot_changes(
+    global_snapshot: str | None,
+    team_snapshots: dict[str, str],
+    replace_teams: bool = False,
+    snapshot_format: SnapshotFormat = "json",
+    journal_checkpoints: dict[str, int] = None,
+    journal_obsolete_through: int | None = None,
+):
+    """
+    global_snapshot: JSON-formatted string of the cache without its team map,
+    or None if it hasn't changed
+    team_snapshots: team ID: JSON-formatted team data string pairs
+    replace_teams: Remove stored team data for teams not in team_snapshots.
+    This also removes any snapshot stored in the other format, which is how
+    a change of format takes effect.
+    journal_checkpoints: team ID: journal sequence number pairs. The team
+    snapshots include every journal entry for the team up to the sequence
+    number, so those entries are removed.
+    journal_obsolete_through: Remove every journal entry up to this sequence
+    number.
+    """
+    if snapshot_format == "compressed":
+        global_class = DBManager.CompressedCacheSnapshot
+        team_class = DBManager.CompressedTeamSnapshot
+        other_format_classes = (DBManager.CacheSnapshot, DBManager.TeamSnapshot)
+        encode = encode_compressed_snapshot
+    else:
+        global_class = DBManager.CacheSnapshot
+        team_class = DBManager.TeamSnapshot
+        other_format_classes = (
+            DBManager.CompressedCacheSnapshot,
+            DBManager.CompressedTeamSnapshot,
+        )
+
+        def encode(snapshot):
+            return snapshot
+
+    rows = [
+        team_class(id=team_id, snapshot=encode(team_snapshot))
+        for team_id, team_snapshot in team_snapshots.items()
+    ]
+    if global_snapshot is not None:
+        rows.append(global_class(id=0, snapshot=encode(global_snapshot)))
+    deletes = []
+    if replace_teams:
+        deletes.extend(
+            delete(orm_class)
+            for orm_class in (team_class, *other_format_classes)
+        )
+    if journal_obsolete_through is not None:
+        deletes.append(
+            delete(DBManager.JournalEntry).where(
+                DBManager.JournalEntry.seq <= journal_obsolete_through
+            )
+        )
+    for team_id, seq in (journal_checkpoints or {}).items():
+        deletes.append(
+            delete(DBManager.JournalEntry).where(
+                DBManager.JournalEntry.team_id == team_id,
+                DBManager.JournalEntry.seq <= seq,
+            )
+        )
+    await DBManager.merge_rows(rows, deletes)
+
+
+async def store_journal_entries(entries: list[Dict]):
+    """
+    entries: List of {"seq": int, "team_id": str, "action": str,
+    "args": str, "recorded_time": datetime} dicts
+    """
+    await DBManager.add_rows(
+        [DBManager.JournalEntry(**entry) for entry in entries]
+    )
+
+
+async def get_journal_entries() -> list[Dict]:
+    entries = await DBManager.get_rows(DBManager.JournalEntry)
+    return sorted(entries, key=lambda entry: entry["seq"])
+
+
+async def get_team_snapshots() -> dict[str, str]:
+    """
+    Returns team ID: JSON-formatted team data string pairs, in whichever
+    format they were stored.
+    """
+    if compressed_rows := await DBManager.get_rows(
+        DBManager.CompressedTeamSnapshot
+    ):
+        return {
+            row["id"]: decode_compressed_snapshot(row["snapshot"])
+            for row in compressed_rows
+        }
+    return {
+        row["id"]: row["snapshot"]
+        for row in await DBManager.get_rows(DBManager.TeamSnapshot)
+    }
+
+
 async def get_cache_snapshot() -> str | None:
+    """
+    Returns a JSON-formatted string, in whichever format it was stored.
+    """
+    if compressed_rows := await DBManager.get_rows(
+        DBManager.CompressedCacheSnapshot,
+        DBManager.CompressedCacheSnapshot.id == 0,
+    ):
+        return decode_compressed_snapshot(compressed_rows[0]["snapshot"])
     try:
         db_row = (
             await DBManager.get_rows(
@@ -442,14 +843,10 @@ async def get_assigned_headless_urls() -> dict[str, str]:
 
 
 async def get_teams_with_gamespace_ids() -> dict[str, str]:
-    # `is not` should be correct, but using it returns all teams
-    # in the DB instead of just the ones with gamespace IDs.
-    teams_with_gamespace_ids = await DBManager.get_rows(
-        DBManager.TeamData, DBManager.TeamData.ship_gamespace_id != None
-    )
-
     result = {
-        team["id"]: team["ship_gamespace_id"] for team in teams_with_gamespace_ids
+        team["id"]: team["ship_gamespace_id"]
+        for team in await get_teams()
+        if team["ship_gamespace_id"] is not None
     }
     formatted_result = json.dumps(result, indent=2)
     logging.debug(formatted_result)
@@ -37,6 +37,7 @@ from .gamedata.cache import (
     GamespaceStateOutput,
 )
 from .clients.topomojo import create_dispatch, poll_dispatch
+from .metrics import BackgroundCycle
 
 
 class GamespaceStatusTask:
@@ -181,37 +182,42 @@ class GamespaceStatusTask:
         else:
             logging.debug(f"Dispatch completed, without result: \n{result}")
 
+    @classmethod
+    async def _grader_body(cls):
+        teams = await db.get_teams_with_gamespace_ids()
+        logging.info(
+            f"Dispatch cycle is running. The current teams are active: {json.dumps(teams, indent=2)}"
+        )
+
+        for team_id, gamespace_id in teams.items():
+
+            team_dispatches = cls._existing_dispatches.get(
+                team_id,
+                cls.TeamDispatches(
+                    grading={},
+                    challenge_tasks={
+                        task: {} for task in cls.challenge_tasks_config
+                    },
+                ),
+            )
+
+            await cls._handle_grading_dispatch(
+                team_dispatches.grading, team_id, gamespace_id
+            )
+            for task, task_dispatch in team_dispatches.challenge_tasks.items():
+                await cls._handle_challenge_task_dispatch(
+                    task_dispatch, team_id, gamespace_id, task
+                )
+
+            cls._existing_dispatches[team_id] = team_dispatches
+
     @classmethod
     async def _grader_task(cls):
         while True:
             try:
                 await asyncio.sleep(30)
 
-                teams = await db.get_teams_with_gamespace_ids()
-                logging.info(
-                    f"Dispatch cycle is running. The current teams are active: {json.dumps(teams, indent=2)}"
-                )
-
-                for team_id, gamespace_id in teams.items():
-
-                    team_dispatches = cls._existing_dispatches.get(
-                        team_id,
-                        cls.TeamDispatches(
-                            grading={},
-                            challenge_tasks={
-                                task: {} for task in cls.challenge_tasks_config
-                            },
-                        ),
-                    )
-
-                    await cls._handle_grading_dispatch(
-                        team_dispatches.grading, team_id, gamespace_id
-                    )
-                    for task, task_dispatch in team_dispatches.challenge_tasks.items():
-                        await cls._handle_challenge_task_dispatch(
-                            task_dispatch, team_id, gamespace_id, task
-                        )
-
-                    cls._existing_dispatches[team_id] = team_dispatches
+                async with BackgroundCycle("grader"):
+                    await cls._grader_body()
             except Exception as e:
                 logging.exception(f"Dispatch exception: {str(e)}")
@@ -25,20 +25,26 @@
 import asyncio
 from enum import Enum
 from collections import defaultdict
-from dataclasses import dataclass
+from contextlib import AsyncExitStack
+from copy import deepcopy
+from dataclasses import dataclass, field
 import datetime
 from datetime import timezone
+import hashlib
 import json
 import logging
-from typing import Literal
+import secrets
+import time
+from typing import Any, Awaitable, Callable, Literal
 
 from httpx import AsyncClient
 from pydantic import BaseModel
 
 from ..admin.controllermodels import DeploymentSession
-from ..db import get_team, get_active_teams, get_team_game_session
+from ..db import get_team, get_active_teams
 from ..clients.gameboardmodels import (
     GameEngineQuestionView,
+    GameScoringConfigChallengeSpec,
     TeamGameScoreQueryResponse,
     GameEngineGameState
 )
@@ -76,17 +82,31 @@ from .model import (
     LocationUnlockResponse,
     GenericResponse,
     ScanResponse,
+    SessionDataTeamSpecific,
     VmURL,
+    team_data_to_internal,
+    team_data_to_snapshot,
 )
 from ..clients import gameboard, topomojo
+from .journal import ActionJournal, JournalEntry
+from .jsonresponse import dumps
+from ..metrics import (
+    BackgroundCycle,
+    Gauge,
+    InstrumentedLock,
+    LabelledLock,
+    MISSION_UPDATE_FAILURES,
+)
 
 CommID = str
 LocationID = str
 MissionID = str
 TaskID = str
 TeamID = str
+SessionID = int
 NPCShipID = str
 GamespaceID = str
+GameID = str
 
 JsonStr = str
 
@@ -99,6 +119,9 @@ ChallengeMap = dict[MissionID, GamespaceData]
 JUMP_TIME_DELTA = datetime.timedelta(minutes=10)
 SPAM_REDUCTION_FACTOR = 20
 EXPECTED_TEAM_COUNT = 5
+NETWORK_ACTION_ATTEMPTS = 3
+# How long a team's first GameData waits for its first scores, in seconds.
+FIRST_SCORES_TIMEOUT = 2.0
 
 
 class NonExistentTeam(Exception):
@@ -221,17 +244,20 @@ class TeamMap(BaseModel):
     def to_internal(self) -> "InternalTeamMap":
         internal_map = {}
         for team_id, team_data in self.__root__.items():
-            internal_map[team_id] = team_data.to_internal()
+            internal_map[team_id] = team_data_to_internal(team_data)
         return InternalTeamMap(__root__=internal_map)
 
 
-class InternalTeamMap(BaseModel):
+# Like the team data it holds, this is a plain dataclass so that pydantic
+# doesn't try to validate (and wrap) the internal team classes.
+@dataclass
+class InternalTeamMap:
     __root__: dict[TeamID, InternalTeamGameData]
 
     def to_snapshot(self) -> TeamMap:
         internal_map = {}
         for team_id, team_data in self.__root__.items():
-            internal_map[team_id] = team_data.to_snapshot()
+            internal_map[team_id] = team_data_to_snapshot(team_data)
 
         return TeamMap(__root__=internal_map)
 
@@ -263,15 +289,134 @@ class GameDataCacheSnapshot(GlobalData):
             mission_map=self.mission_map.to_internal(),
             task_map=self.task_map.to_internal(),
             team_map=self.team_map.to_internal(),
-            team_initial_state=self.team_initial_state.to_internal(),
-            npc_ships=self.npc_ships,
+            team_initial_state=team_data_to_internal(self.team_initial_state),
+            npc_ships=deepcopy(self.npc_ships),
             jump_cycle_number=self.jump_cycle_number,
-            challenges=self.challenges,
-            gamespace_to_mission=self.gamespace_to_mission,
+            challenges=deepcopy(self.challenges),
+            gamespace_to_mission=dict(self.gamespace_to_mission),
         )
 
 
-class InternalCache(BaseModel):
+def model_fields(model: type[BaseModel], data: Any) -> dict[str, Any]:
+    """
+    The values of data's fields that model also has, without converting
+    nested models to dicts. data can be a model or an internal dataclass.
+    """
+    return {
+        name: getattr(data, name)
+        for name in model.__fields__
+        if hasattr(data, name)
+    }
+
+
+def construct_full(model: type[BaseModel], *parts: dict[str, Any]):
+    """
+    Builds a response model from already-validated field values without
+    validating them again. Later parts take precedence.
+    """
+    values = {}
+    for part in parts:
+        values.update(part)
+    return model.construct(**values)
+
+
+@dataclass
+class GlobalDataIndex:
+    """
+    Reverse lookups over the global game data. The global data doesn't change
+    once the cache is loaded, so these are built once instead of scanning the
+    global maps on every player action.
+    """
+    comms_by_location: dict[LocationID, list[CommID]] = field(
+        default_factory=dict
+    )
+    tasks_by_comm: dict[CommID, list[TaskID]] = field(default_factory=dict)
+    task_order: dict[TaskID, int] = field(default_factory=dict)
+    # Tasks are kept in global task map order.
+    tasks_by_mission: dict[MissionID, list[TaskID]] = field(
+        default_factory=dict
+    )
+    # From the missions' task lists, which is what decides mission unlocks.
+    missions_by_task: dict[TaskID, list[MissionID]] = field(
+        default_factory=dict
+    )
+    # Lowercased. Codes should be unique, but keep every match so that
+    # duplicates can be reported.
+    locations_by_unlock_code: dict[str, list[LocationID]] = field(
+        default_factory=dict
+    )
+    # Tasks whose markCompleteWhen, cancelWhen or failWhen branch is
+    # triggered by an action type at a location, in global task map order.
+    tasks_by_trigger: dict[tuple[TaskBranchType, LocationID], list[TaskID]] = (
+        field(default_factory=dict)
+    )
+    # The global halves of the GameData response models, as field values
+    # ready to be combined with a team's fields.
+    location_fields: dict[LocationID, dict[str, Any]] = field(
+        default_factory=dict
+    )
+    mission_fields: dict[MissionID, dict[str, Any]] = field(
+        default_factory=dict
+    )
+    task_fields: dict[TaskID, dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        comm_map: "InternalCommMap",
+        location_map: "InternalLocationMap",
+        mission_map: "InternalMissionMap",
+        task_map: "InternalTaskMap",
+    ) -> "GlobalDataIndex":
+        index = cls()
+
+        for comm_event in comm_map.__root__.values():
+            index.comms_by_location.setdefault(
+                comm_event.locationID, []
+            ).append(comm_event.commID)
+
+        for order, task in enumerate(task_map.__root__.values()):
+            index.task_order[task.taskID] = order
+            index.tasks_by_comm.setdefault(task.commID, []).append(task.taskID)
+            index.tasks_by_mission.setdefault(
+                task.missionID, []
+            ).append(task.taskID)
+            index.task_fields[task.taskID] = model_fields(TaskDataFull, task)
+
+            triggers = {
+                (branch.type, branch.locationID)
+                for branch in (
+                    task.markCompleteWhen, task.cancelWhen, task.failWhen
+                )
+                if branch
+            }
+            for trigger in triggers:
+                index.tasks_by_trigger.setdefault(
+                    trigger, []
+                ).append(task.taskID)
+
+        for mission in mission_map.__root__.values():
+            index.mission_fields[mission.missionID] = model_fields(
+                MissionDataFull, mission
+            )
+            for task in mission.taskList:
+                index.missions_by_task.setdefault(
+                    task.taskID, []
+                ).append(mission.missionID)
+
+        for location in location_map.__root__.values():
+            index.locations_by_unlock_code.setdefault(
+                location.unlockCode.lower(), []
+            ).append(location.locationID)
+            index.location_fields[location.locationID] = model_fields(
+                LocationDataFull, location
+            )
+
+        return index
+
+
+@dataclass
+class InternalCache:
     comm_map: InternalCommMap
     location_map: InternalLocationMap
     mission_map: InternalMissionMap
@@ -280,17 +425,63 @@ class InternalCache(BaseModel):
     team_initial_state: InternalTeamGameData
     npc_ships: NPCShipMap
     jump_cycle_number: int = 0
-    challenges: dict[TeamID, ChallengeMap] = {}
-    gamespace_to_mission: dict[GamespaceID, MissionID] = {}
+    challenges: dict[TeamID, ChallengeMap] = field(default_factory=dict)
+    gamespace_to_mission: dict[GamespaceID, MissionID] = field(
+        default_factory=dict
+    )
+
+    _index: GlobalDataIndex = field(
+        default_factory=GlobalDataIndex, init=False, repr=False, compare=False
+    )
+
+    @property
+    def index(self) -> GlobalDataIndex:
+        return self._index
+
+    def build_index(self):
+        self._index = GlobalDataIndex.build(
+            self.comm_map,
+            self.location_map,
+            self.mission_map,
+            self.task_map,
+        )
 
     def to_snapshot(self) -> GameDataCacheSnapshot:
+        snapshot = self.to_global_snapshot()
+        snapshot.team_map = self.team_map.to_snapshot()
+        return snapshot
+
+    def copy_global(self) -> "InternalCache":
+        """
+        Copies everything but the team map, which is left empty, so that the
+        copy can be serialized without holding the cache lock. The comm,
+        location, mission and task maps don't change after the cache is
+        loaded, so they're shared instead of copied.
+        """
+        return InternalCache(
+            comm_map=self.comm_map,
+            location_map=self.location_map,
+            mission_map=self.mission_map,
+            task_map=self.task_map,
+            team_map=InternalTeamMap(__root__={}),
+            team_initial_state=self.team_initial_state.clone(),
+            npc_ships=deepcopy(self.npc_ships),
+            jump_cycle_number=self.jump_cycle_number,
+            challenges=deepcopy(self.challenges),
+            gamespace_to_mission=dict(self.gamespace_to_mission),
+        )
+
+    def to_global_snapshot(self) -> GameDataCacheSnapshot:
+        """
+        Everything but the team map, which is left empty.
+        """
         return GameDataCacheSnapshot(
             comm_map=self.comm_map.to_snapshot(),
             location_map=self.location_map.to_snapshot(),
             mission_map=self.mission_map.to_snapshot(),
             task_map=self.task_map.to_snapshot(),
-            team_map=self.team_map.to_snapshot(),
-            team_initial_state=self.team_initial_state.to_snapshot(),
+            team_map=TeamMap(__root__={}),
+            team_initial_state=team_data_to_snapshot(self.team_initial_state),
             npc_ships=self.npc_ships,
             jump_cycle_number=self.jump_cycle_number,
             challenges=self.challenges,
@@ -298,6 +489,101 @@ class InternalCache(BaseModel):
         )
 
 
+@dataclass
+class CacheSnapshotChanges:
+    """
+    The parts of the cache that changed since the last persisted snapshot,
+    serialized to JSON.
+    """
+    # None if the global data didn't change.
+    global_snapshot: JsonStr | None
+    team_snapshots: dict[TeamID, JsonStr]
+    # Set when the cache was replaced, so stored teams that are no longer in
+    # it need to be removed.
+    replace_teams: bool
+    global_version: int
+    team_versions: dict[TeamID, int]
+    generation: int
+    # The last journal entry each team snapshot includes.
+    journal_checkpoints: dict[TeamID, int]
+    # Journal entries up to this one are for a replaced cache.
+    journal_obsolete_through: int | None
+
+
+@dataclass(frozen=True)
+class VersionedGameData:
+    """
+    A GameData response, kept for as long as everything it was built from
+    stays the same. The session is left out of the serialized body because
+    its current time is updated on every request.
+    """
+    key: tuple
+    # Hash of the key. The ETag adds the session to it.
+    key_digest: str
+    response: GameDataResponse
+    body_without_session: JsonStr
+
+    def etag(self, session: SessionDataTeamSpecific) -> str:
+        """
+        The ETag of the body with the given session.
+        """
+        session_digest = hashlib.blake2b(
+            dumps(session), digest_size=8
+        ).hexdigest()
+        return f'W/"{self.key_digest}-{session_digest}"'
+
+    def json(self, session: SessionDataTeamSpecific) -> JsonStr:
+        return (
+            f'{self.body_without_session[:-1]},'
+            f'"session":{dumps(session).decode()}}}'
+        )
+
+
+# What the game logic looks at in a challenge state.
+ChallengeFingerprint = tuple
+
+
+def challenge_fingerprint(
+    challenge: GameEngineGameState,
+) -> ChallengeFingerprint:
+    """
+    The answers are included because PC4 failed audits are told apart by the
+    time in the answer.
+    """
+    return (
+        challenge.isActive,
+        challenge.endTime,
+        tuple(
+            (question.text, question.isCorrect, question.answer)
+            for question in challenge.challenge.questions or ()
+        ),
+    )
+
+
+@dataclass
+class MissionPollState:
+    """
+    A team's mission update schedule. Times are from time.monotonic().
+    """
+    interval: float
+    next_poll: float
+    # The challenge fingerprints from the last successful poll, by ID.
+    last_fingerprints: dict[str, ChallengeFingerprint] | None = None
+    # Bumped when the team should be polled soon, so that a poll that was in
+    # flight at the time doesn't push its next poll back.
+    resets: int = 0
+
+
+@dataclass(frozen=True)
+class TeamScores:
+    """
+    A team's score data from Gameboard, already mapped to missions.
+    """
+    mission_map: dict[MissionID, MissionScoreData]
+    # time.monotonic() when it was fetched.
+    fetched_at: float
+
+
 # I wasn't sure if the output models should really be here,
 # but there wasn't really any other obvious place to put them.
 SuccessOrFail = Literal["success", "fail"]
@@ -318,19 +604,124 @@ class GamespaceStateOutput(BaseModel):
 
 
 class GameStateManager:
-    _lock = asyncio.Lock()
+    # Team-scoped operations only hold their team's lock. _lock is for the
+    # few operations that span teams (init, challenge init, snapshots).
+    # Team network locks serialize the TopoMojo changes of antenna and jump
+    # actions, and are held across the network requests so that the team
+    # lock itself never is.
+    # Lock order: team network lock -> _lock -> team lock -> _session_lock.
+    # Never acquire _lock while holding a team lock.
+    _lock = InstrumentedLock("global")
+    _session_lock = asyncio.Lock()
+    _team_locks: dict[TeamID, asyncio.Lock] = {}
+    _team_network_locks: dict[TeamID, asyncio.Lock] = {}
+    # Bumped on every change to a team's state. Used to revalidate after
+    # awaiting outbound requests without the team lock held.
+    _team_versions: dict[TeamID, int] = {}
+    # Each team's unlocked tasks that complete on a comm event, by the
+    # location of the comm event. Tasks are added as they're unlocked and
+    # pruned when they're found to be done during lookups, so this can hold
+    # tasks that are no longer relevant. Built on first use for each team.
+    _pending_comm_tasks: dict[TeamID, dict[LocationID, set[TaskID]]] = {}
+    # Bumped on every change to the non-team part of the cache.
+    _global_version = 0
+    # What the last persisted snapshot contains. The generation is bumped
+    # when the whole cache is replaced, so that a snapshot taken before that
+    # doesn't get recorded as persisted afterwards.
+    _snapshot_generation = 0
+    _persisted_global_version: int | None = None
+    _persisted_team_versions: dict[TeamID, int] = {}
+    _replace_stored_teams = True
     _cache: InternalCache
 
     _settings: "SettingsModel"
     _active_game_timer_task: asyncio.Task = None
     _active_dispatch_timer_task: asyncio.Task = None
     _active_mission_timer_task: asyncio.Task = None
+    # Each team's mission update schedule. Teams are added when they're first
+    # polled.
+    _mission_polls: dict[TeamID, MissionPollState] = {}
+    # Set to wake the mission timer when a team should be polled soon.
+    _mission_poll_wakeup: asyncio.Event | None = None
+    # The fingerprints of each team's challenges that the mission timer has
+    # handled, by challenge ID. A challenge isn't settled while a task it
+    # completes hasn't been unlocked, since it needs to be handled again once
+    # it is.
+    _settled_challenges: dict[TeamID, dict[str, ChallengeFingerprint]] = {}
+    # Each team's latest score data. GameData is built from these, so that
+    # it only waits on Gameboard for a team's first scores.
+    _team_scores: dict[TeamID, TeamScores] = {}
+    _first_score_fetches: dict[TeamID, asyncio.Task] = {}
+    # Teams whose scores should be refreshed before the next full refresh.
+    _score_refresh_requests: set[TeamID] = set()
+    _score_refresh_wakeup: asyncio.Event | None = None
+    _active_score_refresh_task: asyncio.Task = None
+    # Bumped whenever a task can't be completed because the team hasn't
+    # unlocked it or its prerequisites yet.
+    _deferred_task_completions = 0
 
     _next_npc_ship_jump: datetime.datetime = None
     _next_video_refresh: datetime.datetime = None
 
     _spam_reduction_tracker: int = 0
 
+    # Active game sessions and how many of their teams completed each
+    # mission. Registered on deploy and at startup. Guarded by _session_lock.
+    _session_teams: dict[SessionID, tuple[TeamID, ...]] = {}
+    _team_session_ids: dict[TeamID, SessionID] = {}
+    # The Gameboard game each session is for, if it's known.
+    _session_game_ids: dict[SessionID, GameID | None] = {}
+    _session_completions: dict[SessionID, dict[MissionID, int]] = {}
+    # Changed whenever a session's completion counts change, since they're
+    # part of the GameData of every team in the session. Versions are taken
+    # from one counter, so a re-registered session doesn't reuse one.
+    _session_completion_versions: dict[SessionID, int] = {}
+    _last_completion_version = 0
+    # The last GameData response built for each team. None is the initial
+    # state.
+    _team_data_responses: dict[TeamID | None, VersionedGameData] = {}
+    # Versions start over when the server restarts, so ETags include a
+    # per-process value to keep them from matching an old response.
+    _etag_salt = secrets.token_hex(8)
+
+    @classmethod
+    def _team_lock(cls, team_id: TeamID, method: str) -> LabelledLock:
+        """
+        Get the lock guarding a single team's state, creating it if needed.
+        method labels the lock's metrics.
+        """
+        lock = cls._team_locks.get(team_id)
+        if lock is None:
+            lock = InstrumentedLock("team")
+            cls._team_locks[team_id] = lock
+        return lock.labelled(method)
+
+    @classmethod
+    def _team_network_lock(cls, team_id: TeamID) -> asyncio.Lock:
+        lock = cls._team_network_locks.get(team_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            cls._team_network_locks[team_id] = lock
+        return lock
+
+    @classmethod
+    def _team_version(cls, team_id: TeamID) -> int:
+        return cls._team_versions.get(team_id, 0)
+
+    @classmethod
+    def _touch_team(cls, team_id: TeamID):
+        """
+        Team lock is assumed to be held.
+        """
+        cls._team_versions[team_id] = cls._team_version(team_id) + 1
+
+    @classmethod
+    def _touch_global(cls):
+        """
+        Global lock is assumed to be held.
+        """
+        cls._global_version += 1
+
     @staticmethod
     def _log_completion(
         task_id: TaskID,
@@ -401,7 +792,7 @@ class GameStateManager:
     @classmethod
     async def video_freshness_task(cls):
         video_urls = []
-        async with cls._lock:
+        async with cls._lock.labelled("video_freshness_task"):
             for comm_event in cls._cache.comm_map.__root__.values():
                 if "http" in comm_event.videoURL:
                     video_urls.append(comm_event.videoURL)
@@ -412,7 +803,7 @@ class GameStateManager:
         if next_refresh <= now:
             logging.info("Starting Video URL refresh...")
 
-            async with cls._lock:
+            async with cls._lock.labelled("video_freshness_task"):
                 cls._next_video_refresh = now + datetime.timedelta(days=7)
                 logging.info(f"Next refresh set to {cls._next_video_refresh}")
 
@@ -474,11 +865,13 @@ class GameStateManager:
                 taskID=global_task.taskID, visible=True, complete=False
             )
             team_data.tasks[global_task.taskID] = team_task
+            cls._add_pending_comm_task(team_id, team_data, global_task)
             team_data.missions[global_task.missionID].tasks.append(
                 global_task.taskID)
             logging.info(f"Team {team_id} unlocked task {global_task.taskID}.")
         else:
             team_task.visible = True
+        cls._touch_team(team_id)
         cls._find_comm_event_to_activate(team_id, team_data)
 
     @classmethod
@@ -525,6 +918,7 @@ class GameStateManager:
                 f"Team {team_id} tried to complete task {global_task.taskID}, but the team has not "
                 "unlocked it yet."
             )
+            cls._deferred_task_completions += 1
             return False
 
         if (
@@ -545,6 +939,7 @@ class GameStateManager:
                         f"Team {team_id} tried to complete task {global_task.taskID}, but the team has not "
                         f"{reason} its prerequisite task {task_id} yet."
                     )
+                    cls._deferred_task_completions += 1
                     return False
 
         team_task.complete = True
@@ -572,13 +967,7 @@ class GameStateManager:
             team_id, team_data, first_task)
 
         mission_task_ids = list(
-            map(
-                lambda t: t.taskID,
-                filter(
-                    lambda t: t.missionID == global_mission.missionID,
-                    cls._cache.task_map.__root__.values(),
-                ),
-            )
+            cls._cache.index.tasks_by_mission.get(global_mission.missionID, ())
         )
         task_list = [
             InternalTeamTaskData(taskID=task_id)
@@ -610,36 +999,85 @@ class GameStateManager:
             team_data.missions[global_mission.missionID] = unlocked_mission
 
     @classmethod
-    async def _get_mission_completion_in_team_session(
+    async def register_session(
         cls,
-        team_id: TeamID,
-        global_mission: InternalGlobalMissionData,
-    ) -> int:
-        session = await get_team_game_session(team_id)
-        if not session:
-            logging.error(
-                f"Team {team_id} is not associated with any session."
-            )
-            return 0
-        session_teams = [team["id"] for team in session["teams"]]
-        total_completions = 0
+        session_id: SessionID,
+        team_ids: list[TeamID],
+        game_id: GameID | None = None,
+    ):
+        async with cls._session_lock:
+            cls._session_teams[session_id] = tuple(team_ids)
+            cls._session_game_ids[session_id] = game_id
+            for team_id in team_ids:
+                cls._team_session_ids[team_id] = session_id
+            cls._count_session_completions(session_id)
+
+    @classmethod
+    async def unregister_session(cls, session_id: SessionID):
+        async with cls._session_lock:
+            for team_id in cls._session_teams.pop(session_id, ()):
+                if cls._team_session_ids.get(team_id) == session_id:
+                    del cls._team_session_ids[team_id]
+            cls._session_game_ids.pop(session_id, None)
+            cls._session_completions.pop(session_id, None)
+            cls._session_completion_versions.pop(session_id, None)
 
-        for team_id in session_teams:
+    @classmethod
+    def _count_session_completions(cls, session_id: SessionID):
+        """
+        Session lock is assumed to be held.
+        """
+        completions = defaultdict(int)
+        for team_id in cls._session_teams[session_id]:
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 logging.error(
-                    f"Session {session['id']} had a team {team_id} that is "
+                    f"Session {session_id} had a team {team_id} that is "
                     "not being tracked in GameStateManager."
                 )
                 continue
+            for team_mission in team_data.missions.values():
+                completions[team_mission.missionID] += int(team_mission.complete)
+        cls._session_completions[session_id] = dict(completions)
+        cls._touch_session_completions(session_id)
 
-            team_mission = team_data.missions.get(global_mission.missionID)
-            if not team_mission:
-                # This team has not even unlocked the mission, so move on.
-                continue
-            total_completions += int(team_mission.complete)
+    @classmethod
+    def _touch_session_completions(cls, session_id: SessionID):
+        """
+        Session lock is assumed to be held.
+        """
+        cls._last_completion_version += 1
+        cls._session_completion_versions[session_id] = (
+            cls._last_completion_version
+        )
+
+    @classmethod
+    def _team_game_id(cls, team_id: TeamID) -> GameID | None:
+        session_id = cls._team_session_ids.get(team_id)
+        if session_id is None:
+            return None
+        return cls._session_game_ids.get(session_id)
 
-        return total_completions
+    @classmethod
+    def _session_team_ids(cls, team_id: TeamID) -> tuple[TeamID, ...]:
+        session_id = cls._team_session_ids.get(team_id)
+        if session_id is None:
+            return ()
+        return cls._session_teams[session_id]
+
+    @classmethod
+    def _get_mission_completion_in_team_session(
+        cls,
+        team_id: TeamID,
+        mission_id: MissionID,
+    ) -> int:
+        session_id = cls._team_session_ids.get(team_id)
+        if session_id is None:
+            logging.error(
+                f"Team {team_id} is not associated with any session."
+            )
+            return 0
+        return cls._session_completions[session_id].get(mission_id, 0)
 
     @classmethod
     async def _complete_mission_and_unlock_next(
@@ -649,9 +1087,36 @@ class GameStateManager:
         team_mission: InternalTeamMissionData,
         global_mission: InternalGlobalMissionData,
     ):
+        # Completion counts are read across every team in the session, so
+        # marking the mission complete and counting has to happen atomically
+        # with respect to the other teams.
+        async with cls._session_lock:
+            await cls._complete_mission_and_unlock_next_body(
+                team_id, team_data, team_mission, global_mission
+            )
+
+    @classmethod
+    async def _complete_mission_and_unlock_next_body(
+        cls,
+        team_id: TeamID,
+        team_data: InternalTeamGameData,
+        team_mission: InternalTeamMissionData,
+        global_mission: InternalGlobalMissionData,
+    ):
+        """
+        Session lock is assumed to be held.
+        """
         logging.info(
             f"Marking mission {team_mission.missionID} complete for team {team_id}."
         )
+        if not team_mission.complete:
+            session_id = cls._team_session_ids.get(team_id)
+            if session_id is not None:
+                completions = cls._session_completions[session_id]
+                completions[team_mission.missionID] = (
+                    completions.get(team_mission.missionID, 0) + 1
+                )
+                cls._touch_session_completions(session_id)
         team_mission.complete = True
         team_data.session.teamCodexCount = sum((
             1 if team_mission.complete and not global_mission.isSpecial else 0
@@ -665,8 +1130,8 @@ class GameStateManager:
             )
             return
 
-        times_completed = await cls._get_mission_completion_in_team_session(
-            team_id, global_mission
+        times_completed = cls._get_mission_completion_in_team_session(
+            team_id, global_mission.missionID
         )
 
         idx = (
@@ -706,10 +1171,13 @@ class GameStateManager:
                 f"Team {team_id} tried to complete task {global_task.taskID}, but the team has not "
                 "unlocked it yet."
             )
+            cls._deferred_task_completions += 1
             return False
 
         completion_criteria = global_task.markCompleteWhen
 
+        if not team_task.complete:
+            cls._touch_team(team_id)
         team_task.complete = True
         if completion_criteria:
             if completion_criteria.alsoComplete:
@@ -776,20 +1244,23 @@ class GameStateManager:
         """
         cache lock is assumed to be held
         """
+        current_location = team_data.currentStatus.currentLocation
+        candidate_task_ids = cls._cache.index.tasks_by_trigger.get(
+            (task_type, current_location), ()
+        )
         # Make a separate list so I can modify the team task map (for unlocking).
-        for task in list(team_data.tasks.values()):
+        # Only the team's tasks that could react to this action are checked.
+        candidate_tasks = [
+            team_data.tasks[task_id]
+            for task_id in candidate_task_ids
+            if task_id in team_data.tasks
+        ]
+        for task in candidate_tasks:
             if task.complete:
                 continue
-            global_task = cls._cache.task_map.__root__.get(task.taskID)
-            if not global_task:
-                logging.error(
-                    f"Team {team_id} had a task in its "
-                    "task list that was not in the global task map: {task}."
-                )
-                continue
+            global_task = cls._cache.task_map.__root__[task.taskID]
 
             # TODO: Eventually this should have a big refactor, but for now it just needs to work.
-            current_location = team_data.currentStatus.currentLocation
             if (
                 global_task.markCompleteWhen
                 and global_task.markCompleteWhen.locationID == current_location
@@ -925,7 +1396,7 @@ class GameStateManager:
             # Sleep before the operation so the task will sleep after continue.
             await asyncio.sleep(2)
 
-            async with cls._lock:
+            async with cls._lock.labelled("_game_timer_task"):
                 if datetime.datetime.now() < cls._next_npc_ship_jump:
                     continue
 
@@ -936,6 +1407,7 @@ class GameStateManager:
 
                 cls._next_npc_ship_jump += JUMP_TIME_DELTA
                 cls._cache.jump_cycle_number += 1
+                cls._touch_global()
 
     @classmethod
     async def _dispatch_timer_task(cls):
@@ -949,7 +1421,7 @@ class GameStateManager:
         DispatchStatusMap = dict[DispatchID, DispatchStatus]
         dispatches: dict[GamespaceID, DispatchStatusMap] = {}
 
-        async with cls._lock:
+        async with cls._lock.labelled("_dispatch_timer_task"):
             for _, challenge_map in cls._cache.challenges.items():
                 for _, gamespace_data in challenge_map.items():
                     gs_id = gamespace_data.gamespaceID
@@ -1061,6 +1533,7 @@ class GameStateManager:
                         if team_data.pc4_handling_cllctn6 < last_failed_audit:
                             send_cllctn6_failure = True
                         team_data.pc4_handling_cllctn6 = datetime.datetime.now()
+                        cls._touch_team(team_id)
                 continue
             elif task_id in cllctn6_completions:
                 cllctn6_completions[task_id] = True
@@ -1150,60 +1623,388 @@ class GameStateManager:
         )
 
     @classmethod
-    async def _mission_timer_body(cls):
-        for team_id, _ in cls._cache.challenges.items():
-            team_data = cls._cache.team_map.__root__.get(team_id)
-            if team_data is None:
-                logging.error(
-                    f"Team {team_id} is in the challenge map, "
-                    "but not the team map."
+    def poll_mission_updates_soon(cls, team_id: TeamID):
+        """
+        Puts a team back on the shortest mission update interval, and polls
+        it in the next mission timer cycle.
+        """
+        state = cls._mission_polls.get(team_id)
+        if state is not None:
+            state.interval = (
+                cls._settings.game.mission_update_polling.team_min_interval
+            )
+            state.next_poll = 0.0
+            state.resets += 1
+        if cls._mission_poll_wakeup is not None:
+            cls._mission_poll_wakeup.set()
+
+    @classmethod
+    def _due_mission_polls(cls, now: float) -> list[TeamID]:
+        polling = cls._settings.game.mission_update_polling
+        due = []
+        for team_id in cls._cache.challenges:
+            state = cls._mission_polls.get(team_id)
+            if state is None:
+                state = cls._mission_polls[team_id] = MissionPollState(
+                    polling.team_min_interval, now
                 )
-                continue
+            if state.next_poll <= now:
+                due.append(team_id)
+        return due
 
-            try:
-                ignore_ids = [team_data.ship.gamespaceData.gamespaceID]
-                if team_data.ship.gamespaceData.isPC4Workspace:
-                    ignore_ids = None
-                team_challenges = await gameboard.mission_update(
-                    team_id,
-                    ignore_ids,
+    @classmethod
+    def _schedule_mission_poll(
+        cls,
+        team_id: TeamID,
+        team_challenges: list[GameEngineGameState] | Exception | None,
+        resets: int,
+    ):
+        """
+        Backs off when the team's challenge states are unchanged, and goes
+        back to the shortest interval when they change. Failed polls are
+        retried at the same interval.
+        """
+        state = cls._mission_polls.get(team_id)
+        if state is None or state.resets != resets:
+            # The team was removed, or should be polled again soon.
+            return
+        polling = cls._settings.game.mission_update_polling
+        if team_challenges is not None and not isinstance(
+            team_challenges, Exception
+        ):
+            fingerprints = {
+                challenge.id: challenge_fingerprint(challenge)
+                for challenge in team_challenges
+            }
+            if fingerprints == state.last_fingerprints:
+                state.interval = min(
+                    state.interval * polling.backoff_factor,
+                    polling.team_max_interval,
                 )
-            except TypeError:
+            else:
+                if state.last_fingerprints is not None:
+                    # A challenge was submitted or finished.
+                    cls.refresh_scores_soon(team_id)
+                state.interval = polling.team_min_interval
+                state.last_fingerprints = fingerprints
+        state.next_poll = time.monotonic() + state.interval
+
+    @classmethod
+    async def _mission_timer_body(cls, due_only: bool = True):
+        """
+        Fetches the mission updates of every team that's due (or every team)
+        concurrently, without any lock held, then applies them one team at a
+        time under the team lock.
+        """
+        if cls._mission_poll_wakeup is not None:
+            cls._mission_poll_wakeup.clear()
+        start = time.monotonic()
+        # The challenge map can change while the updates are in progress.
+        team_ids = cls._due_mission_polls(start)
+        if not due_only:
+            team_ids = list(cls._cache.challenges.keys())
+        resets = {
+            team_id: cls._mission_polls[team_id].resets for team_id in team_ids
+        }
+        semaphore = asyncio.Semaphore(
+            cls._settings.game.mission_update_concurrency
+        )
+
+        async def fetch(team_id: TeamID):
+            async with semaphore:
+                return await cls._fetch_team_mission_update(team_id)
+
+        results = await asyncio.gather(
+            *(fetch(team_id) for team_id in team_ids), return_exceptions=True
+        )
+
+        failures = 0
+        for team_id, team_challenges in zip(team_ids, results):
+            cls._schedule_mission_poll(
+                team_id, team_challenges, resets[team_id]
+            )
+            if isinstance(team_challenges, Exception):
+                failures += 1
+                MISSION_UPDATE_FAILURES.inc()
                 logging.error(
-                    "Attempted to get a mission update for team "
-                    f"{team_id}, but Gameboard could not find that team."
+                    f"Mission update for team {team_id} failed: "
+                    f"{team_challenges!r}"
                 )
                 continue
-            else:
-                logging.info(
-                    "Got mission update for team "
-                    f"{team_id}. Team challenges length: "
-                    f"{len(team_challenges)}"
-                )
-
             if not team_challenges:
                 # It's already being logged.
                 continue
 
-            for challenge in team_challenges:
-                await cls._mission_timer_challenge_handling(
-                    team_id,
-                    team_data,
-                    challenge
+            try:
+                async with cls._team_lock(team_id, "_mission_timer_body"):
+                    await cls._mission_timer_team_body(
+                        team_id, team_challenges, skip_settled=True
+                    )
+            except Exception as e:
+                logging.exception(
+                    f"Could not apply the mission update for team {team_id}: "
+                    f"{e}"
+                )
+
+        logging.debug(
+            f"Mission timer cycle for {len(team_ids)} teams took "
+            f"{time.monotonic() - start:.3f} seconds with {failures} "
+            "failed fetches."
+        )
+
+    @classmethod
+    async def _fetch_team_mission_update(
+        cls, team_id: TeamID
+    ) -> list[GameEngineGameState] | None:
+        """
+        Gameboard requests are made without the team lock held. Reading the
+        team's gamespace ID doesn't need it, since nothing is awaited before
+        the request is made.
+        """
+        team_data = cls._cache.team_map.__root__.get(team_id)
+        if team_data is None:
+            logging.error(
+                f"Team {team_id} is in the challenge map, "
+                "but not the team map."
+            )
+            return None
+
+        try:
+            ignore_ids = [team_data.ship.gamespaceData.gamespaceID]
+            if team_data.ship.gamespaceData.isPC4Workspace:
+                ignore_ids = None
+            team_challenges = await gameboard.mission_update(
+                team_id,
+                ignore_ids,
+            )
+        except TypeError:
+            MISSION_UPDATE_FAILURES.inc()
+            logging.error(
+                "Attempted to get a mission update for team "
+                f"{team_id}, but Gameboard could not find that team."
+            )
+            return None
+        else:
+            logging.info(
+                "Got mission update for team "
+                f"{team_id}. Team challenges length: "
+                f"{len(team_challenges)}"
+            )
+
+        return team_challenges
+
+    @classmethod
+    async def _mission_timer_team_body(
+        cls,
+        team_id: TeamID,
+        team_challenges: list[GameEngineGameState],
+        skip_settled: bool = False,
+    ):
+        """
+        Team lock is assumed to be held.
+
+        With skip_settled, challenges that are unchanged since they were last
+        handled are skipped, unless a task they complete wasn't unlocked yet
+        at the time.
+        """
+        # The team may have been cleaned up during the Gameboard request.
+        team_data = cls._cache.team_map.__root__.get(team_id)
+        if team_data is None:
+            return
+
+        settled = {}
+        if skip_settled:
+            settled = cls._settled_challenges.get(team_id, {})
+        now_settled = {}
+        for challenge in team_challenges:
+            fingerprint = challenge_fingerprint(challenge)
+            if settled.get(challenge.id) == fingerprint:
+                now_settled[challenge.id] = fingerprint
+                continue
+
+            version = cls._team_version(team_id)
+            deferred = cls._deferred_task_completions
+            await cls._mission_timer_challenge_handling(
+                team_id,
+                team_data,
+                challenge
+            )
+            if cls._team_version(team_id) != version:
+                ActionJournal.record(
+                    team_id, "mission_update", challenge=challenge
                 )
+            if cls._deferred_task_completions == deferred:
+                now_settled[challenge.id] = fingerprint
+        if skip_settled:
+            cls._settled_challenges[team_id] = now_settled
+
+    @classmethod
+    async def _mission_timer_sleep(cls):
+        """
+        Sleeps until the next team's mission update is due, or a team should
+        be polled soon, within the global interval bounds.
+        """
+        polling = cls._settings.game.mission_update_polling
+        await asyncio.sleep(polling.global_min_interval)
+        if cls._mission_poll_wakeup.is_set():
+            return
+        now = time.monotonic()
+        next_poll = float("inf")
+        for team_id in cls._cache.challenges:
+            state = cls._mission_polls.get(team_id)
+            # Teams that haven't been polled yet are due now.
+            next_poll = min(next_poll, state.next_poll if state else now)
+        timeout = min(
+            next_poll - now,
+            polling.global_max_interval - polling.global_min_interval,
+        )
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(cls._mission_poll_wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
 
     @classmethod
     async def _mission_timer_task(cls):
         while True:
             # Sleep before the operation so the task will sleep after continue.
-            await asyncio.sleep(2)
+            await cls._mission_timer_sleep()
 
             try:
-                async with cls._lock:
+                async with BackgroundCycle("mission_timer"):
                     await cls._mission_timer_body()
             except Exception as e:
                 logging.error(f"Mission timer task exception: {e}")
 
+    @classmethod
+    def refresh_scores_soon(cls, team_id: TeamID):
+        """
+        Refreshes the team's scores without waiting for the next full
+        refresh.
+        """
+        cls._score_refresh_requests.add(team_id)
+        if cls._score_refresh_wakeup is not None:
+            cls._score_refresh_wakeup.set()
+
+    @classmethod
+    async def _refresh_team_scores(
+        cls,
+        team_id: TeamID,
+        max_age: float | None,
+        spec_maps: dict[int, dict],
+    ):
+        team_data = cls._cache.team_map.__root__.get(team_id)
+        if team_data is None:
+            return
+        ship_gamespace_id = team_data.ship.gamespaceData.gamespaceID
+        team_score_data = await gameboard.team_score(
+            team_id, cls._team_game_id(team_id), max_age
+        )
+        if team_score_data is None:
+            # Keep the last scores. Their age shows in the metrics.
+            return
+        # Teams in the same game share the game info when their scores came
+        # from one request, so its spec map is only built once.
+        game_info = team_score_data.gameInfo
+        spec_map = spec_maps.get(id(game_info))
+        if spec_map is None:
+            spec_map = spec_maps[id(game_info)] = {
+                spec.id: spec for spec in game_info.specs
+            }
+        cls._team_scores[team_id] = TeamScores(
+            cls._map_team_score_data(
+                team_score_data, [ship_gamespace_id], spec_map
+            ),
+            time.monotonic(),
+        )
+
+    @classmethod
+    async def _wait_for_first_scores(cls, team_id: TeamID):
+        """
+        Fetches the team's scores if they haven't been yet, and waits up to
+        FIRST_SCORES_TIMEOUT for them. Only the first fetch is waited on.
+        After that, the scores are left to the refresh task.
+        """
+        if team_id in cls._team_scores:
+            return
+        fetch = cls._first_score_fetches.get(team_id)
+        if fetch is None:
+            fetch = asyncio.create_task(
+                cls._refresh_team_scores(team_id, 0.0, {})
+            )
+            fetch.add_done_callback(cls._handle_task_result)
+            cls._first_score_fetches[team_id] = fetch
+        elif fetch.done():
+            return
+
+        try:
+            # The fetch still stores the scores if this times out.
+            await asyncio.wait_for(asyncio.shield(fetch), FIRST_SCORES_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.warning(
+                f"Team {team_id}'s scores were not fetched within "
+                f"{FIRST_SCORES_TIMEOUT} seconds."
+            )
+        except Exception:
+            # Logged by _handle_task_result.
+            pass
+
+    @classmethod
+    async def _score_refresh_body(
+        cls, team_ids: list[TeamID] | None = None
+    ):
+        """
+        Refreshes the given teams' scores, or every active team's. Requested
+        refreshes skip the Gameboard client's batch window, since they're
+        made because the scores just changed.
+        """
+        max_age = 0.0
+        if team_ids is None:
+            team_ids = list(cls._cache.challenges.keys())
+            max_age = None
+        spec_maps = {}
+        results = await asyncio.gather(
+            *(
+                cls._refresh_team_scores(team_id, max_age, spec_maps)
+                for team_id in team_ids
+            ),
+            return_exceptions=True,
+        )
+        for team_id, result in zip(team_ids, results):
+            if isinstance(result, Exception):
+                logging.error(
+                    f"Could not refresh the scores for team {team_id}: "
+                    f"{result!r}"
+                )
+
+    @classmethod
+    async def _score_refresh_task(cls):
+        last_full_refresh = float("-inf")
+        while True:
+            interval = cls._settings.game.score_refresh_interval
+            timeout = last_full_refresh + interval - time.monotonic()
+            if timeout > 0 and not cls._score_refresh_requests:
+                try:
+                    await asyncio.wait_for(
+                        cls._score_refresh_wakeup.wait(), timeout
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            cls._score_refresh_wakeup.clear()
+            team_ids = None
+            if time.monotonic() < last_full_refresh + interval:
+                team_ids = list(cls._score_refresh_requests)
+            else:
+                last_full_refresh = time.monotonic()
+            cls._score_refresh_requests = set()
+
+            try:
+                async with BackgroundCycle("score_refresh"):
+                    await cls._score_refresh_body(team_ids)
+            except Exception as e:
+                logging.error(f"Score refresh task exception: {e}")
+
     @staticmethod
     def _handle_task_result(task: asyncio.Task) -> None:
         try:
@@ -1215,7 +2016,7 @@ class GameStateManager:
 
     @classmethod
     async def start_game_timers(cls):
-        async with cls._lock:
+        async with cls._lock.labelled("start_game_timers"):
             # cls._active_game_timer_task = asyncio.create_task(
             #     cls._game_timer_task())
             # cls._active_game_timer_task.add_done_callback(
@@ -1227,12 +2028,20 @@ class GameStateManager:
             # cls._active_dispatch_timer_task.add_done_callback(
             #     cls._handle_task_result)
 
+            cls._mission_poll_wakeup = asyncio.Event()
             cls._active_mission_timer_task = asyncio.create_task(
                 cls._mission_timer_task()
             )
             cls._active_mission_timer_task.add_done_callback(
                 cls._handle_task_result)
 
+            cls._score_refresh_wakeup = asyncio.Event()
+            cls._active_score_refresh_task = asyncio.create_task(
+                cls._score_refresh_task()
+            )
+            cls._active_score_refresh_task.add_done_callback(
+                cls._handle_task_result)
+
     # @classmethod
     # async def stop_game_timers(cls):
     #     async with cls._lock:
@@ -1252,35 +2061,252 @@ class GameStateManager:
 
     @classmethod
     async def get_total_points(cls) -> int:
-        async with cls._lock:
+        async with cls._lock.labelled("get_total_points"):
             return sum(
                 map(lambda m: m.points, cls._cache.mission_map.__root__.values())
             )
 
     @classmethod
     async def snapshot_data(cls) -> JsonStr:
-        async with cls._lock:
-            return cls._cache.to_snapshot().json()
+        async with (
+            cls._lock.labelled("snapshot_data"),
+            AsyncExitStack() as team_locks,
+        ):
+            pause_start = time.perf_counter()
+            # Team locks are only ever nested under the global lock here,
+            # so acquiring them in a fixed order can't deadlock.
+            for team_id in sorted(cls._cache.team_map.__root__):
+                await team_locks.enter_async_context(
+                    cls._team_lock(team_id, "snapshot_data")
+                )
+            cache_copy = cls._cache.copy_global()
+            cache_copy.team_map.__root__ = {
+                team_id: team_data.clone()
+                for team_id, team_data in cls._cache.team_map.__root__.items()
+            }
+            pause = time.perf_counter() - pause_start
 
-    @classmethod
-    async def init(
-        cls, initial_state: GameDataCacheSnapshot, settings: "SettingsModel"
-    ):
-        async with cls._lock:
-            cls._basic_validation(initial_state)
-            cls._cache = initial_state.to_internal()
-            cls._settings = settings
-            cls._next_video_refresh = datetime.datetime.now(timezone.utc)
+        def serialize() -> JsonStr:
+            return cache_copy.to_snapshot().json()
 
-    class VmIdResponseFailure(Exception):
-        ...
+        serialize_start = time.perf_counter()
+        snapshot = await asyncio.to_thread(serialize)
+        cls._log_snapshot_timing(
+            "Full", pause, time.perf_counter() - serialize_start
+        )
+        return snapshot
 
     @classmethod
-    async def _change_gamespace_gateway_network(
-        cls,
-        current_location: LocationID,
-        target_network: str,
-        gamespace_data: GamespaceData,
+    async def snapshot_changes(cls) -> CacheSnapshotChanges | None:
+        """
+        Serializes the global data if it changed, and each team whose state
+        changed, since the last snapshot passed to mark_snapshot_persisted.
+        Returns None if nothing changed.
+
+        Only copying the changed data holds the locks. Serialization happens
+        in a worker thread.
+        """
+        async with cls._lock.labelled("snapshot_changes"):
+            pause_start = time.perf_counter()
+            replace_teams = cls._replace_stored_teams
+            global_version = cls._global_version
+            global_changed = cls.global_data_changed()
+
+            dirty_team_ids = [
+                team_id
+                for team_id in cls._cache.team_map.__root__
+                if cls._team_version(team_id)
+                != cls._persisted_team_versions.get(team_id)
+            ]
+            if not global_changed and not dirty_team_ids:
+                return None
+
+            cache_copy = cls._cache.copy_global()
+            team_versions = {}
+            journal_checkpoints = {}
+            for team_id in dirty_team_ids:
+                async with cls._team_lock(team_id, "snapshot_changes"):
+                    team_data = cls._cache.team_map.__root__[team_id]
+                    team_versions[team_id] = cls._team_version(team_id)
+                    if (seq := ActionJournal.team_seq(team_id)) is not None:
+                        journal_checkpoints[team_id] = seq
+                    cache_copy.team_map.__root__[team_id] = team_data.clone()
+            generation = cls._snapshot_generation
+            journal_obsolete_through = (
+                ActionJournal.obsolete_through() if replace_teams else None
+            )
+            pause = time.perf_counter() - pause_start
+
+        def serialize() -> tuple[JsonStr | None, dict[TeamID, JsonStr]]:
+            if global_changed:
+                global_snapshot = cache_copy.to_global_snapshot().json()
+            else:
+                global_snapshot = None
+            team_snapshots = {
+                team_id: team_data_to_snapshot(team_data).json()
+                for team_id, team_data in cache_copy.team_map.__root__.items()
+            }
+            return global_snapshot, team_snapshots
+
+        serialize_start = time.perf_counter()
+        global_snapshot, team_snapshots = await asyncio.to_thread(serialize)
+        cls._log_snapshot_timing(
+            "Incremental", pause, time.perf_counter() - serialize_start
+        )
+
+        return CacheSnapshotChanges(
+            global_snapshot=global_snapshot,
+            team_snapshots=team_snapshots,
+            replace_teams=replace_teams,
+            global_version=global_version,
+            team_versions=team_versions,
+            generation=generation,
+            journal_checkpoints=journal_checkpoints,
+            journal_obsolete_through=journal_obsolete_through,
+        )
+
+    @staticmethod
+    def _log_snapshot_timing(kind: str, pause: float, serialization: float):
+        logging.debug(
+            f"{kind} cache snapshot held the cache lock for "
+            f"{pause * 1000:.2f}ms. Serializing took "
+            f"{serialization * 1000:.2f}ms in a worker thread."
+        )
+
+    @classmethod
+    def global_data_changed(cls) -> bool:
+        """
+        Whether the global data changed since the last persisted snapshot.
+        """
+        return (
+            cls._replace_stored_teams
+            or cls._global_version != cls._persisted_global_version
+        )
+
+    @classmethod
+    def mark_snapshot_persisted(cls, changes: CacheSnapshotChanges):
+        if changes.generation != cls._snapshot_generation:
+            return
+        if changes.global_snapshot is not None:
+            cls._persisted_global_version = changes.global_version
+        cls._persisted_team_versions.update(changes.team_versions)
+        if changes.replace_teams:
+            cls._replace_stored_teams = False
+
+    @classmethod
+    async def init(
+        cls, initial_state: GameDataCacheSnapshot, settings: "SettingsModel"
+    ):
+        async with cls._lock.labelled("init"):
+            cls._basic_validation(initial_state)
+            cls._cache = initial_state.to_internal()
+            cls._cache.build_index()
+            cls._pending_comm_tasks = {}
+            cls._team_data_responses = {}
+            cls._mission_polls = {}
+            cls._settled_challenges = {}
+            cls._team_scores = {}
+            cls._first_score_fetches = {}
+            cls._score_refresh_requests = set()
+            async with cls._session_lock:
+                for session_id in cls._session_teams:
+                    cls._count_session_completions(session_id)
+            cls._touch_global()
+            cls._snapshot_generation += 1
+            cls._persisted_team_versions = {}
+            cls._replace_stored_teams = True
+            ActionJournal.reset()
+            cls._settings = settings
+            cls._next_video_refresh = datetime.datetime.now(timezone.utc)
+
+    @classmethod
+    async def replay_journal(cls, entries: list[JournalEntry]):
+        """
+        Reapplies journaled actions on top of the snapshot the cache was
+        initialized from. Network changes aren't made again - the gamespaces
+        already have them.
+        """
+        for entry in entries:
+            try:
+                await cls._replay_journal_entry(entry)
+            except Exception as e:
+                logging.error(
+                    f"Could not replay journal entry {entry.seq} "
+                    f"({entry.action}) for team {entry.team_id}: {e}"
+                )
+        if entries:
+            logging.info(f"Replayed {len(entries)} journal entries.")
+
+    @classmethod
+    async def _replay_journal_entry(cls, entry: JournalEntry):
+        team_id = entry.team_id
+        args = entry.args
+        match entry.action:
+            case "new_team":
+                await cls.new_team(
+                    team_id,
+                    DeploymentSession(**args["deployment_session"]),
+                    GamespaceData(**args["ship_gamespace_info"]),
+                )
+            case "scan":
+                await cls.scan(team_id)
+            case "set_power_mode":
+                await cls.set_power_mode(team_id, args["new_mode"])
+            case "unlock_location":
+                await cls.unlock_location(team_id, args["unlock_code"])
+            case "complete_comm_event":
+                await cls.complete_comm_event(team_id)
+            case "challenge_task_complete":
+                await cls.dispatch_challenge_task_complete(
+                    team_id, args["task_id"]
+                )
+            case "challenge_task_failed":
+                await cls.dispatch_challenge_task_failed(
+                    team_id, args["task_id"]
+                )
+            case "grading_task_update":
+                await cls.dispatch_grading_task_update(
+                    team_id,
+                    GamespaceStateOutput(**args["gamespace_state_output"]),
+                )
+            case "pc4_update_team_urls":
+                await cls.pc4_update_team_urls(team_id, args["pc4_urls"])
+            case "mission_update":
+                async with cls._team_lock(team_id, "_replay_journal_entry"):
+                    await cls._mission_timer_team_body(
+                        team_id, [GameEngineGameState(**args["challenge"])]
+                    )
+            case "jump" | "extend_antenna" | "retract_antenna":
+                async with cls._team_lock(team_id, "_replay_journal_entry"):
+                    team_data = cls._cache.team_map.__root__.get(team_id)
+                    if not team_data:
+                        raise NonExistentTeam()
+                    cls._touch_team(team_id)
+                    if entry.action == "jump":
+                        await cls._apply_jump(
+                            team_id, team_data, args["location_id"]
+                        )
+                    elif entry.action == "extend_antenna":
+                        await cls._apply_antenna_extended(
+                            team_id, team_data, args["network_name"]
+                        )
+                    else:
+                        await cls._apply_antenna_retracted(team_id, team_data)
+            case _:
+                logging.error(
+                    f"Journal entry {entry.seq} has unknown action "
+                    f"{entry.action}."
+                )
+
+    class VmIdResponseFailure(Exception):
+        ...
+
+    @classmethod
+    async def _change_gamespace_gateway_network(
+        cls,
+        current_location: LocationID,
+        target_network: str,
+        gamespace_data: GamespaceData,
         force_target_network: bool = False,
         target_gamespace_id: GamespaceID = None,
     ):
@@ -1387,9 +2413,15 @@ class GameStateManager:
 
             return global_task_data.missionID
 
-        async with cls._lock:
+        # Look the teams up before taking the lock.
+        db_teams = {
+            team_id: await get_team(team_id) for team_id in team_gamespaces
+        }
+
+        async with cls._lock.labelled("init_challenges"):
+            cls._touch_global()
             for team_id, gamespace_info in team_gamespaces.items():
-                team_data = await get_team(team_id)
+                team_data = db_teams[team_id]
                 if not team_data:
                     logging.error(
                         f"Tried to look up team {team_id} "
@@ -1433,6 +2465,11 @@ class GameStateManager:
 
     @classmethod
     async def _uninit_body(cls, team_id: TeamID):
+        cls._touch_global()
+        cls._mission_polls.pop(team_id, None)
+        cls._settled_challenges.pop(team_id, None)
+        cls._team_scores.pop(team_id, None)
+        cls._first_score_fetches.pop(team_id, None)
         try:
             del cls._cache.challenges[team_id]
         except KeyError:
@@ -1443,7 +2480,7 @@ class GameStateManager:
 
     @classmethod
     async def uninit_challenges(cls, teams: list[str] = None):
-        async with cls._lock:
+        async with cls._lock.labelled("uninit_challenges"):
             if teams is None:
                 # Don't delete from an iterating dict.
                 teams = list(cls._cache.challenges.keys())
@@ -1452,7 +2489,7 @@ class GameStateManager:
 
     @classmethod
     async def uninit_team(cls, team_id: TeamID):
-        async with cls._lock:
+        async with cls._lock.labelled("uninit_team"):
             await cls._uninit_body(team_id)
 
     @classmethod
@@ -1462,10 +2499,11 @@ class GameStateManager:
         deployment_session: DeploymentSession,
         ship_gamespace_info: GamespaceData,
     ):
-        async with cls._lock:
-            new_team_state = InternalTeamGameData(
-                **cls._cache.team_initial_state.dict()
-            )
+        async with (
+            cls._lock.labelled("new_team"),
+            cls._team_lock(team_id, "new_team"),
+        ):
+            new_team_state = cls._cache.team_initial_state.clone()
             new_team_state.session.teamInfoName = team_id
             new_team_state.session.gameStartTime = deployment_session.sessionBegin
             new_team_state.session.gameEndTime = deployment_session.sessionEnd
@@ -1479,20 +2517,34 @@ class GameStateManager:
             new_team_state.ship.gamespaceData = ship_gamespace_info
 
             cls._cache.team_map.__root__[team_id] = new_team_state
+            cls._pending_comm_tasks.pop(team_id, None)
+            cls._settled_challenges.pop(team_id, None)
+            cls.poll_mission_updates_soon(team_id)
+            cls._touch_team(team_id)
+            ActionJournal.record(
+                team_id,
+                "new_team",
+                deployment_session=deployment_session,
+                ship_gamespace_info=ship_gamespace_info,
+            )
 
+            # Formatted lazily, since this is skipped at the usual log level
+            # and a whole deployment creates teams back to back.
             logging.info(
-                f"Team {team_id} created with missions {new_team_state.missions} "
-                f"and session {json.dumps(new_team_state.session, indent=2, default=str)}"
+                "Team %s created with missions %s and session %s",
+                team_id,
+                new_team_state.missions,
+                new_team_state.session,
             )
 
     @classmethod
     async def check_team_exists(cls, team_id: TeamID) -> bool:
-        async with cls._lock:
+        async with cls._team_lock(team_id, "check_team_exists"):
             return team_id in cls._cache.team_map.__root__
 
     @classmethod
     async def get_team_codex_status(cls, team_id: TeamID) -> dict[MissionID, bool]:
-        async with cls._lock:
+        async with cls._team_lock(team_id, "get_team_codex_status"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 raise NonExistentTeam()
@@ -1512,9 +2564,10 @@ class GameStateManager:
         cls,
         team_score_data: TeamGameScoreQueryResponse,
         gs_ignore_ids: list[str] = None,
+        spec_map: dict[str, GameScoringConfigChallengeSpec] = None,
     ) -> {MissionID, MissionScoreData}:
         """
-        Assumes that the class lock is held.
+        spec_map is the game info's specs by ID, if it was already built.
         """
         if not team_score_data:
             return {}
@@ -1523,10 +2576,11 @@ class GameStateManager:
             gs_ignore_ids = []
         gs_ignore_ids = set(gs_ignore_ids)
 
-        spec_map = {
-            spec.id: spec
-            for spec in team_score_data.gameInfo.specs
-        }
+        if spec_map is None:
+            spec_map = {
+                spec.id: spec
+                for spec in team_score_data.gameInfo.specs
+            }
 
         mission_map = {}
         for team_challenge_score in team_score_data.score.challenges:
@@ -1564,10 +2618,13 @@ class GameStateManager:
     ) -> list[LocationDataFull]:
         full_loc_data = []
 
+        location_fields = cls._cache.index.location_fields
         for location_id, location in team_data.locations.items():
-            loc_global = cls._cache.location_map.__root__[location_id]
-            loc_full = LocationDataFull(
-                **loc_global.dict() | location.dict())
+            loc_full = construct_full(
+                LocationDataFull,
+                location_fields[location_id],
+                model_fields(LocationDataFull, location),
+            )
             full_loc_data.append(loc_full)
 
         return full_loc_data
@@ -1600,27 +2657,33 @@ class GameStateManager:
                 continue
 
             mission_task_data.append(
-                TaskDataFull(**global_task.dict() | team_task.dict())
+                construct_full(
+                    TaskDataFull,
+                    cls._cache.index.task_fields[task_id],
+                    model_fields(TaskDataFull, team_task),
+                )
             )
 
         return mission_task_data
 
     @classmethod
-    async def _get_team_unlocked_missions(
+    def _get_team_unlocked_missions(
         cls,
         team_id: str,
         team_data: InternalTeamGameData,
-        mission_map: dict[MissionID, MissionScoreData]
+        mission_map: dict[MissionID, MissionScoreData],
     ) -> list[MissionDataFull]:
         full_mission_data = {}
         associated_challenges = {}
         mission_unlock_codes = {}
 
-        team_session = await get_team_game_session(team_id)
-        if team_session:
-            total_teams = len(team_session['teams'])
+        session_id = cls._team_session_ids.get(team_id)
+        if session_id is not None:
+            total_teams = len(cls._session_teams[session_id])
+            session_completions = cls._session_completions[session_id]
         else:
             total_teams = 0
+            session_completions = {}
 
         for mission in team_data.missions.values():
             if not mission.unlocked:
@@ -1697,25 +2760,19 @@ class GameStateManager:
                         f"mission {mission.missionID}"
                     )
 
-            if team_id:
-                teams_solved = await cls._get_mission_completion_in_team_session(
-                    team_id,
-                    mission_global
-                )
-            else:
-                teams_solved = 0
             completion_data = {
-                "solveTeams": teams_solved,
+                "solveTeams": session_completions.get(mission.missionID, 0),
                 "totalTeams": total_teams,
             }
 
-            mission_full = MissionDataFull(
-                **mission_global.dict()
-                | mission.dict()
-                | {"taskList": mission_task_data}
-                | position_data
-                | score_data
-                | completion_data
+            mission_full = construct_full(
+                MissionDataFull,
+                cls._cache.index.mission_fields[mission.missionID],
+                model_fields(MissionDataFull, mission),
+                {"taskList": mission_task_data},
+                position_data,
+                score_data,
+                completion_data,
             )
             full_mission_data[mission_full.missionID] = mission_full
 
@@ -1777,22 +2834,49 @@ class GameStateManager:
 
     @classmethod
     async def get_team_data(cls, team_id: TeamID | None) -> GameDataResponse | None:
-        async with cls._lock:
+        game_data, session = await cls.get_versioned_team_data(team_id)
+        return game_data.response.copy(update={"session": session})
+
+    @classmethod
+    async def get_versioned_team_data(
+        cls, team_id: TeamID | None
+    ) -> tuple[VersionedGameData, SessionDataTeamSpecific]:
+        """
+        Returns the team's GameData along with its current session data.
+        The GameData is only rebuilt when something it depends on changed.
+        """
+        if team_id is not None:
+            await cls._wait_for_first_scores(team_id)
+
+        # The initial state is shared, so it's guarded by the global lock.
+        if team_id is None:
+            lock = cls._lock.labelled("get_versioned_team_data")
+        else:
+            lock = cls._team_lock(team_id, "get_versioned_team_data")
+        async with lock:
             mission_map = {}
 
             if team_id is None:
                 team_data = cls._cache.team_initial_state
             else:
                 team_data = cls._cache.team_map.__root__.get(team_id)
+                # The team may have been cleaned up.
+                if not team_data:
+                    raise NonExistentTeam()
 
-                gamebrain_time = datetime.datetime.now(timezone.utc)
+                # Whole seconds, so that responses within the same second
+                # have the same ETag.
+                gamebrain_time = datetime.datetime.now(timezone.utc).replace(
+                    microsecond=0
+                )
                 team_data.session.gameCurrentTime = gamebrain_time
 
-                team_score_data = await gameboard.team_score(team_id)
-                mission_map = cls._map_team_score_data(
-                    team_score_data,
-                    [team_data.ship.gamespaceData.gamespaceID]
-                )
+                team_scores = cls._team_scores.get(team_id)
+                if team_scores is None:
+                    # The first fetch failed or is still in flight.
+                    cls.refresh_scores_soon(team_id)
+                else:
+                    mission_map = team_scores.mission_map
                 if cls._spam_reduction_tracker >= SPAM_REDUCTION_FACTOR:
                     logging.info(
                         f"Got score data for team {team_id}: "
@@ -1805,57 +2889,118 @@ class GameStateManager:
             if not team_data:
                 raise NonExistentTeam()
 
-            # Implemented for cancelled feature - leaving for possible future use.
-            if cls._next_npc_ship_jump:
-                team_data.ship.nextJumpTime = cls._next_npc_ship_jump.isoformat()
-            else:
-                team_data.ship.nextJumpTime = datetime.datetime.max.isoformat()
+            session = team_data.session.copy()
 
-            if team_data.currentStatus.antennaExtended:
-                antenna_state = cls.ExtendOrRetract.extend
-            else:
-                antenna_state = cls.ExtendOrRetract.retract
+            key = cls._team_data_key(team_id, mission_map)
+            game_data = cls._team_data_responses.get(team_id)
+            if game_data is None or game_data.key != key:
+                game_data = await cls._build_team_data(
+                    team_id, team_data, mission_map, key
+                )
+                cls._team_data_responses[team_id] = game_data
 
-            if team_id:
-                await cls._update_team_urls_body(team_id, antenna_state)
+            # This value is not used in PC5.
+            if team_data.ship.gamespaceData and \
+                    not team_data.ship.gamespaceData.isPC4Workspace:
+                team_data.session.teamCodexCount = 0
 
-            full_loc_data = cls._get_team_unlocked_locations(team_data)
+            return game_data, session
 
-            full_mission_data = await cls._get_team_unlocked_missions(
-                team_id,
-                team_data,
-                mission_map
-            )
+    @classmethod
+    def _team_data_key(
+        cls,
+        team_id: TeamID | None,
+        mission_map: dict[MissionID, MissionScoreData],
+    ) -> tuple:
+        """
+        Everything a team's GameData is built from, aside from the session.
+        Lock for the team is assumed to be held.
+        """
+        session_team_ids = cls._session_team_ids(team_id)
+        session_id = cls._team_session_ids.get(team_id)
+        scores = tuple(
+            (mission_id, tuple(score_data.dict().values()))
+            for mission_id, score_data in sorted(mission_map.items())
+        )
+        return (
+            cls._team_version(team_id) if team_id is not None else None,
+            cls._global_version,
+            cls._session_completion_versions.get(session_id),
+            session_team_ids,
+            scores,
+        )
 
-            full_team_data = GameDataResponse(
-                currentStatus=team_data.currentStatus,
-                session=team_data.session,
-                ship=team_data.ship,
-                locations=full_loc_data,
-                missions=full_mission_data,
-            )
+    @classmethod
+    async def _build_team_data(
+        cls,
+        team_id: TeamID | None,
+        team_data: InternalTeamGameData,
+        mission_map: dict[MissionID, MissionScoreData],
+        key: tuple,
+    ) -> VersionedGameData:
+        """
+        Lock for the team is assumed to be held.
+        """
+        # Implemented for cancelled feature - leaving for possible future use.
+        if cls._next_npc_ship_jump:
+            team_data.ship.nextJumpTime = cls._next_npc_ship_jump.isoformat()
+        else:
+            team_data.ship.nextJumpTime = datetime.datetime.max.isoformat()
 
-            await cls._handle_show_incomplete_when_away(full_team_data)
+        if team_data.currentStatus.antennaExtended:
+            antenna_state = cls.ExtendOrRetract.extend
+        else:
+            antenna_state = cls.ExtendOrRetract.retract
 
-            if cls._spam_reduction_tracker >= SPAM_REDUCTION_FACTOR:
-                logging.info(
-                    "Full team data response:"
-                    f"{json.dumps(full_team_data.dict(), default=str)}"
-                )
-                cls._spam_reduction_tracker = 0
-            else:
-                cls._spam_reduction_tracker += 1
+        if team_id:
+            cls._update_team_urls_body(team_id, antenna_state)
 
-            # This value is not used in PC5.
-            if team_data.ship.gamespaceData and \
-                    not team_data.ship.gamespaceData.isPC4Workspace:
-                team_data.session.teamCodexCount = 0
+        full_loc_data = cls._get_team_unlocked_locations(team_data)
 
-            return full_team_data
+        full_mission_data = cls._get_team_unlocked_missions(
+            team_id,
+            team_data,
+            mission_map,
+        )
+
+        full_team_data = GameDataResponse(
+            currentStatus=team_data.currentStatus,
+            session=team_data.session,
+            ship=team_data.ship,
+            locations=full_loc_data,
+            missions=full_mission_data,
+        )
+
+        await cls._handle_show_incomplete_when_away(full_team_data)
+
+        if cls._spam_reduction_tracker >= SPAM_REDUCTION_FACTOR:
+            logging.info(
+                "Full team data response:"
+                f"{json.dumps(full_team_data.dict(), default=str)}"
+            )
+            cls._spam_reduction_tracker = 0
+        else:
+            cls._spam_reduction_tracker += 1
+
+        digest = hashlib.blake2b(
+            repr((cls._etag_salt, team_id, key)).encode(), digest_size=16
+        ).hexdigest()
+        return VersionedGameData(
+            key=key,
+            key_digest=digest,
+            response=full_team_data,
+            body_without_session=dumps(
+                {
+                    name: value
+                    for name, value in full_team_data
+                    if name != "session"
+                }
+            ).decode(),
+        )
 
     @classmethod
     async def dispatch_challenge_task_complete(cls, team_id: TeamID, task_id: str):
-        async with cls._lock:
+        async with cls._team_lock(team_id, "dispatch_challenge_task_complete"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 logging.error(
@@ -1880,13 +3025,25 @@ class GameStateManager:
                 )
                 return
 
+            version = cls._team_version(team_id)
             await cls._complete_task_and_unlock_next(
                 team_id, team_data, global_task_data)
+            if cls._team_version(team_id) != version:
+                ActionJournal.record(
+                    team_id, "challenge_task_complete", task_id=task_id
+                )
+                cls.poll_mission_updates_soon(team_id)
 
     @classmethod
     async def dispatch_challenge_task_failed(cls, team_id: TeamID, task_id: str):
-        async with cls._lock:
+        async with cls._team_lock(team_id, "dispatch_challenge_task_failed"):
+            version = cls._team_version(team_id)
             await cls._dispatch_challenge_task_failed(team_id, task_id)
+            if cls._team_version(team_id) != version:
+                ActionJournal.record(
+                    team_id, "challenge_task_failed", task_id=task_id
+                )
+                cls.poll_mission_updates_soon(team_id)
 
     @classmethod
     async def _dispatch_challenge_task_failed(cls, team_id: TeamID, task_id: str):
@@ -1936,10 +3093,16 @@ class GameStateManager:
     async def dispatch_grading_task_update(
         cls, team_id: TeamID, gamespace_state_output: GamespaceStateOutput
     ):
-        async with cls._lock:
+        async with cls._team_lock(team_id, "dispatch_grading_task_update"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 raise NonExistentTeam()
+            cls._touch_team(team_id)
+            ActionJournal.record(
+                team_id,
+                "grading_task_update",
+                gamespace_state_output=gamespace_state_output,
+            )
 
             # TODO: Generalize this.
             task_mapping = {
@@ -1989,10 +3152,12 @@ class GameStateManager:
         team_id: TeamID,
         pc4_urls: dict[VmName, VmUrlStr],
     ):
-        async with cls._lock:
+        async with cls._team_lock(team_id, "pc4_update_team_urls"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 raise NonExistentTeam()
+            cls._touch_team(team_id)
+            ActionJournal.record(team_id, "pc4_update_team_urls", pc4_urls=pc4_urls)
 
             team_data.ship.workstation1URL = pc4_urls.get(
                 "operator-terminal-1", "")
@@ -2016,7 +3181,7 @@ class GameStateManager:
         retract = 1
 
     @classmethod
-    async def _update_team_urls_body(
+    def _update_team_urls_body(
         cls,
         team_id: TeamID,
         extend_or_retract: ExtendOrRetract = ExtendOrRetract.retract,
@@ -2096,66 +3261,131 @@ class GameStateManager:
         team_id: TeamID,
         extend_or_retract: ExtendOrRetract = ExtendOrRetract.retract,
     ):
-        async with cls._lock:
-            await cls._update_team_urls_body(team_id, extend_or_retract)
+        async with cls._team_lock(team_id, "update_team_urls"):
+            cls._update_team_urls_body(team_id, extend_or_retract)
 
     @classmethod
     async def update_all_active_team_urls(
         cls,
         extend_or_retract: ExtendOrRetract = ExtendOrRetract.retract,
     ):
-        async with cls._lock:
-            active_teams = await get_active_teams()
-            for team in active_teams:
-                team_id = team["id"]
-                await cls._update_team_urls_body(team_id, extend_or_retract)
+        active_teams = await get_active_teams()
+        for team in active_teams:
+            team_id = team["id"]
+            async with cls._team_lock(team_id, "update_all_active_team_urls"):
+                cls._update_team_urls_body(team_id, extend_or_retract)
+
+    @dataclass(frozen=True)
+    class NetworkChange:
+        """
+        The inputs to a team's TopoMojo network changes, captured under the
+        team lock so that the requests themselves can be made without it.
+        """
+        extend_or_retract: "GameStateManager.ExtendOrRetract"
+        current_location: LocationID
+        network_name: str
+        ship_gamespace: GamespaceData
+        challenge_gamespaces: tuple[GamespaceData, ...]
 
     @classmethod
-    async def _pc4_network_change_team_gamespace(
+    def _capture_network_change(
         cls,
+        team_id: TeamID,
         team_data: InternalTeamGameData,
         extend_or_retract: ExtendOrRetract,
-    ) -> str:
-        if extend_or_retract == cls.ExtendOrRetract.extend:
-            location_id = team_data.currentStatus.currentLocation
-            location_data = cls._cache.location_map.__root__[location_id]
-            network_name = location_data.networkName
+        current_location: LocationID | None = None,
+    ) -> NetworkChange:
+        """
+        Team lock is assumed to be held.
+        """
+        if current_location is None:
+            current_location = team_data.currentStatus.currentLocation
+        ship_gamespace = team_data.ship.gamespaceData
+
+        if ship_gamespace.isPC4Workspace:
+            if extend_or_retract == cls.ExtendOrRetract.extend:
+                location_data = cls._cache.location_map.__root__[
+                    current_location
+                ]
+                network_name = location_data.networkName
+            else:
+                network_name = cls._settings.game.antenna_retracted_network
+            challenge_gamespaces = ()
+        else:
+            network_name = ship_gamespace.gatewayWanNetworkName
+            if not network_name:
+                logging.warning(
+                    f"Gamespace {ship_gamespace.gamespaceID} does not have "
+                    "'gatewayWanNetworkName' specified. Defaulting to 'ship'"
+                )
+                network_name = "ship"
+            challenge_gamespaces = tuple(
+                gamespace_data.copy()
+                for gamespace_data in cls._cache.challenges[team_id].values()
+            )
+
+        return cls.NetworkChange(
+            extend_or_retract=extend_or_retract,
+            current_location=current_location,
+            network_name=network_name,
+            ship_gamespace=ship_gamespace.copy(),
+            challenge_gamespaces=challenge_gamespaces,
+        )
+
+    @classmethod
+    async def _send_network_change(
+        cls,
+        team_id: TeamID,
+        network_change: NetworkChange,
+    ):
+        """
+        Does not touch the cache, so no lock needs to be held.
+        """
+        if network_change.ship_gamespace.isPC4Workspace:
+            await cls._pc4_network_change_team_gamespace(network_change)
+        else:
+            await cls._bulk_network_change_team_gamespaces(
+                team_id, network_change
+            )
+
+    @classmethod
+    async def _pc4_network_change_team_gamespace(
+        cls,
+        network_change: NetworkChange,
+    ):
+        if network_change.extend_or_retract == cls.ExtendOrRetract.extend:
+            location_id = network_change.current_location
         else:
             location_id = None
-            network_name = cls._settings.game.antenna_retracted_network
 
         await cls._change_gamespace_gateway_network(
             location_id,
-            network_name,
-            team_data.ship.gamespaceData,
+            network_change.network_name,
+            network_change.ship_gamespace,
             force_target_network=True,
-            target_gamespace_id=team_data.ship.gamespaceData.gamespaceID,
+            target_gamespace_id=network_change.ship_gamespace.gamespaceID,
         )
 
-        return network_name
-
     @classmethod
     async def _bulk_network_change_team_gamespaces(
         cls,
         team_id: TeamID,
-        team_data: InternalTeamGameData,
-        target_network_name: str,
-        extend_or_retract: ExtendOrRetract,
-        target_gamespace_id: GamespaceID = None,
+        network_change: NetworkChange,
     ):
-        if extend_or_retract == cls.ExtendOrRetract.extend:
-            location = team_data.currentStatus.currentLocation
-            network = target_network_name
+        if network_change.extend_or_retract == cls.ExtendOrRetract.extend:
+            location = network_change.current_location
+            network = network_change.network_name
         else:
             location = ""
             network = ""
+        target_gamespace_id = network_change.ship_gamespace.gamespaceID
 
         # Make sure the ship gateway is on the right VLAN.
         tasks = [
             cls._change_gamespace_gateway_network(
-                team_data.currentStatus.currentLocation,
-                target_network_name,
-                team_data.ship.gamespaceData,
+                network_change.current_location,
+                network_change.network_name,
+                network_change.ship_gamespace,
                 force_target_network=True,
                 target_gamespace_id=target_gamespace_id,
             )
@@ -2163,7 +3393,7 @@ class GameStateManager:
         # Then make sure all the challenges are either on the same VLAN,
         # or set to their own "deepspace" network, unreachable from
         # the ship.
-        for _, gamespace_data in cls._cache.challenges[team_id].items():
+        for gamespace_data in network_change.challenge_gamespaces:
             tasks.append(cls._change_gamespace_gateway_network(
                 location,
                 network,
@@ -2178,91 +3408,169 @@ class GameStateManager:
                     f"Team {team_id} got a VM ID Response failure."
                 )
 
-        await cls._update_team_urls_body(team_id, extend_or_retract)
+    @classmethod
+    def _current_network_change(
+        cls, team_id: TeamID, team_data: InternalTeamGameData
+    ) -> NetworkChange:
+        """
+        The network change that matches the team's current antenna state.
+        Team lock is assumed to be held.
+        """
+        if team_data.currentStatus.antennaExtended:
+            extend_or_retract = cls.ExtendOrRetract.extend
+        else:
+            extend_or_retract = cls.ExtendOrRetract.retract
+        return cls._capture_network_change(
+            team_id, team_data, extend_or_retract
+        )
 
     @classmethod
-    async def extend_antenna(cls, team_id: TeamID) -> GenericResponse:
-        async with cls._lock:
-            team_data = cls._cache.team_map.__root__.get(team_id)
-            if not team_data:
-                raise NonExistentTeam()
+    async def _run_team_network_action(
+        cls,
+        team_id: TeamID,
+        method: str,
+        prepare: Callable[[InternalTeamGameData], Any],
+        apply: Callable[[InternalTeamGameData, Any], Awaitable[GenericResponse]],
+        network_change: Callable[[Any], NetworkChange] = lambda plan: plan,
+        dispatch: Callable[[Any], Awaitable[GenericResponse | None]] = None,
+    ) -> GenericResponse:
+        """
+        Runs a team action that changes the team's networks without holding
+        the team lock during the requests. method is the action's name.
+
+        prepare validates the team's state and returns a plan for the action,
+        or a GenericResponse to reject it. network_change gives the plan's
+        network change. dispatch makes any other requests the action needs,
+        once, and may also reject the action. apply updates the team's state.
+        prepare and apply are run under the team lock.
+
+        Once the networks have been changed, the action is always applied,
+        or the networks are changed back. If the team's state changed while
+        the requests were in flight, prepare is run again and the current
+        plan's network change is sent. If that keeps happening, the last
+        attempt holds the team lock throughout.
+        """
+        async with cls._team_network_lock(team_id):
+            async with cls._team_lock(team_id, method):
+                team_data = cls._cache.team_map.__root__.get(team_id)
+                if not team_data:
+                    raise NonExistentTeam()
+                version = cls._team_version(team_id)
+                plan = prepare(team_data)
+            if isinstance(plan, GenericResponse):
+                return plan
+
+            if dispatch is not None:
+                rejection = await dispatch(plan)
+                if rejection:
+                    return rejection
+
+            for _ in range(NETWORK_ACTION_ATTEMPTS - 1):
+                await cls._send_network_change(team_id, network_change(plan))
+
+                async with cls._team_lock(team_id, method):
+                    team_data = cls._cache.team_map.__root__.get(team_id)
+                    if not team_data:
+                        raise NonExistentTeam()
+                    if cls._team_version(team_id) != version:
+                        current_plan = prepare(team_data)
+                        if current_plan != plan:
+                            version = cls._team_version(team_id)
+                            plan = current_plan
+                            if isinstance(plan, GenericResponse):
+                                break
+                            logging.info(
+                                f"Team {team_id}'s state changed during "
+                                f"{method}. Retrying."
+                            )
+                            continue
+                    response = await apply(team_data, plan)
+                    cls._touch_team(team_id)
+                    return response
 
+            logging.warning(
+                f"Team {team_id}'s state changed during {method}. "
+                "Finishing it under the team lock."
+            )
+            async with cls._team_lock(team_id, method):
+                team_data = cls._cache.team_map.__root__.get(team_id)
+                if not team_data:
+                    raise NonExistentTeam()
+                plan = prepare(team_data)
+                if isinstance(plan, GenericResponse):
+                    # Put the networks back the way the team's state has them.
+                    await cls._send_network_change(
+                        team_id, cls._current_network_change(team_id, team_data)
+                    )
+                    return plan
+                await cls._send_network_change(team_id, network_change(plan))
+                response = await apply(team_data, plan)
+                cls._touch_team(team_id)
+                return response
+
+    @classmethod
+    async def extend_antenna(cls, team_id: TeamID) -> GenericResponse:
+        def prepare(team_data: InternalTeamGameData):
             if not team_data.currentStatus.firstContactComplete:
                 return GenericResponse(
                     success=False, message="First Contact Event Incomplete"
                 )
+            return cls._capture_network_change(
+                team_id, team_data, cls.ExtendOrRetract.extend
+            )
 
-            if team_data.ship.gamespaceData.isPC4Workspace:
-                network_name = await cls._pc4_network_change_team_gamespace(
-                    team_data,
-                    cls.ExtendOrRetract.extend,
-                )
-            else:
-                network_name = team_data.ship.gamespaceData.gatewayWanNetworkName
-                ship_gamespace_id = team_data.ship.gamespaceData.gamespaceID
-                if not network_name:
-                    logging.warning(
-                        f"Gamespace {ship_gamespace_id} does not have "
-                        "'gatewayWanNetworkName' specified. Defaulting to 'ship'"
-                    )
-                    network_name = "ship"
-
-                await cls._bulk_network_change_team_gamespaces(
-                    team_id,
-                    team_data,
-                    network_name,
-                    cls.ExtendOrRetract.extend,
-                    target_gamespace_id=ship_gamespace_id
-                )
-
-            team_data.currentStatus.antennaExtended = True
-            team_data.currentStatus.networkConnected = True
-            team_data.currentStatus.networkName = network_name
-
-            await cls._mark_task_complete_if_unlocked(
-                team_id,
-                team_data,
-                "antennaExtended"
+        async def apply(
+            team_data: InternalTeamGameData,
+            network_change: cls.NetworkChange,
+        ) -> GenericResponse:
+            network_name = network_change.network_name
+            await cls._apply_antenna_extended(team_id, team_data, network_name)
+            ActionJournal.record(
+                team_id, "extend_antenna", network_name=network_name
             )
 
             return GenericResponse(
                 success=True, message=f"Team {team_id} extended their antenna."
             )
 
-    @classmethod
-    async def _retract_antenna_body(cls, team_id: TeamID) -> GenericResponse:
-        team_data = cls._cache.team_map.__root__.get(team_id)
-        if not team_data:
-            raise NonExistentTeam()
+        return await cls._run_team_network_action(
+            team_id, "extend_antenna", prepare, apply
+        )
 
-        if team_data.ship.gamespaceData.isPC4Workspace:
-            await cls._pc4_network_change_team_gamespace(
-                team_data,
-                cls.ExtendOrRetract.retract,
-            )
-        else:
-            network_name = team_data.ship.gamespaceData.gatewayWanNetworkName
-            ship_gamespace_id = team_data.ship.gamespaceData.gamespaceID
-            if not network_name:
-                logging.warning(
-                    f"Gamespace {ship_gamespace_id} does not have "
-                    "'gatewayWanNetworkName' specified. Defaulting to 'ship'"
-                )
-                network_name = "ship"
+    @classmethod
+    async def _apply_antenna_extended(
+        cls,
+        team_id: TeamID,
+        team_data: InternalTeamGameData,
+        network_name: str,
+    ):
+        """
+        Team lock is assumed to be held.
+        """
+        team_data.currentStatus.antennaExtended = True
+        team_data.currentStatus.networkConnected = True
+        team_data.currentStatus.networkName = network_name
+        cls._update_team_urls_body(team_id, cls.ExtendOrRetract.extend)
 
-            await cls._bulk_network_change_team_gamespaces(
-                team_id,
-                team_data,
-                network_name,
-                cls.ExtendOrRetract.retract,
-                target_gamespace_id=ship_gamespace_id,
-            )
+        await cls._mark_task_complete_if_unlocked(
+            team_id,
+            team_data,
+            "antennaExtended"
+        )
 
+    @classmethod
+    async def _apply_antenna_retracted(
+        cls, team_id: TeamID, team_data: InternalTeamGameData
+    ):
+        """
+        Team lock is assumed to be held.
+        """
         team_data.currentStatus.antennaExtended = False
         team_data.currentStatus.networkConnected = False
         team_data.currentStatus.networkName = (
             cls._settings.game.antenna_retracted_network
         )
+        cls._update_team_urls_body(team_id, cls.ExtendOrRetract.retract)
 
         await cls._mark_task_complete_if_unlocked(
             team_id,
@@ -2270,15 +3578,27 @@ class GameStateManager:
             "antennaRetracted"
         )
 
-        return GenericResponse(
-            success=True,
-            message=f"Team {team_id} retracted their antenna."
-        )
-
     @classmethod
     async def retract_antenna(cls, team_id: TeamID) -> GenericResponse:
-        async with cls._lock:
-            return await cls._retract_antenna_body(team_id)
+        def prepare(team_data: InternalTeamGameData):
+            return cls._capture_network_change(
+                team_id, team_data, cls.ExtendOrRetract.retract
+            )
+
+        async def apply(
+            team_data: InternalTeamGameData,
+            _: cls.NetworkChange,
+        ) -> GenericResponse:
+            await cls._apply_antenna_retracted(team_id, team_data)
+            ActionJournal.record(team_id, "retract_antenna")
+            return GenericResponse(
+                success=True,
+                message=f"Team {team_id} retracted their antenna."
+            )
+
+        return await cls._run_team_network_action(
+            team_id, "retract_antenna", prepare, apply
+        )
 
     @classmethod
     async def unlock_location(
@@ -2291,16 +3611,13 @@ class GameStateManager:
                 enteredCoordinates=unlock_code,
             )
 
-        async with cls._lock:
+        async with cls._team_lock(team_id, "unlock_location"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 raise NonExistentTeam()
 
-            code_match = list(
-                filter(
-                    lambda loc: loc.unlockCode.lower() == unlock_code.lower(),
-                    cls._cache.location_map.__root__.values(),
-                )
+            code_match = cls._cache.index.locations_by_unlock_code.get(
+                unlock_code.lower()
             )
             if not code_match:
                 return response("invalid")
@@ -2308,15 +3625,18 @@ class GameStateManager:
             if len(code_match) > 1:
                 logging.warning(
                     f"Team {team_id} used unlock code {unlock_code}, "
-                    f"which matched multiple locations: {json.dumps(code_match, indent=2)}"
+                    f"which matched multiple locations: {code_match}"
                 )
 
-            location = code_match.pop()
-            location_id = location.locationID
+            location_id = code_match[-1]
             if location_id in team_data.locations:
                 return response("alreadyunlocked")
 
             cls._unlock_location_for_team(team_id, team_data, location_id)
+            cls._touch_team(team_id)
+            ActionJournal.record(
+                team_id, "unlock_location", unlock_code=unlock_code
+            )
 
             return response("success", location_id)
 
@@ -2340,37 +3660,23 @@ class GameStateManager:
             scanned=scanned_and_visited,
         )
 
+        index = cls._cache.index
         # Each Comm Event has a LocationID, so gather the ones associated with the new location.
         unlocked_comm_event_ids = set(
-            map(
-                lambda c: c.commID,
-                filter(
-                    lambda c: c.locationID == location_id,
-                    cls._cache.comm_map.__root__.values(),
-                ),
-            )
+            index.comms_by_location.get(location_id, ())
         )
         # Next gather the tasks that are associated with a Comm Event in the previous set.
-        unlocked_task_ids = set(
-            map(
-                lambda t: t.taskID,
-                filter(
-                    lambda t: t.commID in unlocked_comm_event_ids,
-                    cls._cache.task_map.__root__.values(),
-                ),
-            )
-        )
+        unlocked_task_ids = {
+            task_id
+            for comm_id in unlocked_comm_event_ids
+            for task_id in index.tasks_by_comm.get(comm_id, ())
+        }
         # Finally gather the missions associated with the previous set of tasks.
-        unlocked_mission_ids = set(
-            map(
-                lambda m: m.missionID,
-                filter(
-                    lambda m: set(map(lambda t: t.taskID, m.taskList))
-                    & unlocked_task_ids,
-                    cls._cache.mission_map.__root__.values(),
-                ),
-            )
-        )
+        unlocked_mission_ids = {
+            mission_id
+            for task_id in unlocked_task_ids
+            for mission_id in index.missions_by_task.get(task_id, ())
+        }
 
         # Construct all the team task data objects first...
         mission_tasks = defaultdict(list)
@@ -2405,13 +3711,15 @@ class GameStateManager:
                 continue
             team_data.missions[mission_id] = mission
 
+    @dataclass(frozen=True)
+    class JumpPlan:
+        location_id: LocationID
+        network_change: "GameStateManager.NetworkChange"
+        final_destination: bool
+
     @classmethod
     async def jump(cls, team_id: TeamID, location_id: LocationID) -> GenericResponse:
-        async with cls._lock:
-            team_data = cls._cache.team_map.__root__.get(team_id)
-            if not team_data:
-                raise NonExistentTeam()
-
+        def prepare(team_data: InternalTeamGameData):
             if team_data.currentStatus.currentLocation == location_id:
                 logging.info(
                     f"Team {team_id} tried to jump to {location_id}, but they were already at the location."
@@ -2440,61 +3748,107 @@ class GameStateManager:
                     message=f"Location {location_id} is not yet unlocked.",
                 )
 
-            if location_id == cls._settings.game.final_destination_name:
-                if team_data.session.teamCodexCount < 3:
-                    logging.info(
+            final_destination = (
+                location_id == cls._settings.game.final_destination_name
+            )
+            if final_destination and team_data.session.teamCodexCount < 3:
+                logging.info(
+                    f"Team {team_id} tried to unlock the final destination, "
+                    "but they do not have enough codices unlocked."
+                )
+                return GenericResponse(
+                    success=False, message="Not enough codices unlocked."
+                )
+
+            # Jumping always retracts the antenna at the new location.
+            return cls.JumpPlan(
+                location_id=location_id,
+                network_change=cls._capture_network_change(
+                    team_id,
+                    team_data,
+                    cls.ExtendOrRetract.retract,
+                    current_location=location_id,
+                ),
+                final_destination=final_destination,
+            )
+
+        async def dispatch(plan: cls.JumpPlan) -> GenericResponse | None:
+            if plan.final_destination:
+                team_db_data = await get_team(team_id)
+                gamespace_id = team_db_data.get("ship_gamespace_id")
+
+                if not gamespace_id:
+                    logging.error(
                         f"Team {team_id} tried to unlock the final destination, "
-                        "but they do not have enough codices unlocked."
+                        "but they do not appear to have a gamespace."
                     )
                     return GenericResponse(
-                        success=False, message="Not enough codices unlocked."
+                        success=False, message=f"No Gamespace for Team {team_id}"
                     )
-                else:
-                    team_db_data = await get_team(team_id)
-                    gamespace_id = team_db_data.get("ship_gamespace_id")
 
-                    if not gamespace_id:
-                        logging.error(
-                            f"Team {team_id} tried to unlock the final destination, "
-                            "but they do not appear to have a gamespace."
-                        )
-                        return GenericResponse(
-                            success=False, message=f"No Gamespace for Team {team_id}"
-                        )
+                await topomojo.create_dispatch(
+                    gamespace_id,
+                    cls._settings.game.grading_vm_name,
+                    f"touch {cls._settings.game.final_destination_file_path}",
+                )
+                logging.info(
+                    f"Created final destination dispatch for team {team_id}."
+                )
 
-                    await topomojo.create_dispatch(
-                        gamespace_id,
-                        cls._settings.game.grading_vm_name,
-                        f"touch {cls._settings.game.final_destination_file_path}",
-                    )
-                    logging.info(
-                        f"Created final destination dispatch for team {team_id}."
-                    )
+        async def apply(
+            team_data: InternalTeamGameData,
+            plan: cls.JumpPlan,
+        ) -> GenericResponse:
+            await cls._apply_jump(team_id, team_data, location_id)
+            ActionJournal.record(team_id, "jump", location_id=location_id)
 
-            new_status = CurrentLocationGameplayDataTeamSpecific(
-                currentLocation=location_id,
-                currentLocationScanned=team_location.scanned,
-                currentLocationSurroundings=global_location.surroundings,
-                networkName=global_location.networkName,
-                firstContactComplete=team_location.visited,
-                powerStatus=team_data.currentStatus.powerStatus,
-            )
-            team_data.currentStatus = new_status
-            await cls._retract_antenna_body(team_id)
+            return GenericResponse(success=True, message=location_id)
 
-            await cls._mark_task_complete_if_unlocked(team_id, team_data, "jump")
+        return await cls._run_team_network_action(
+            team_id,
+            "jump",
+            prepare,
+            apply,
+            network_change=lambda plan: plan.network_change,
+            dispatch=dispatch,
+        )
+
+    @classmethod
+    async def _apply_jump(
+        cls,
+        team_id: TeamID,
+        team_data: InternalTeamGameData,
+        location_id: LocationID,
+    ):
+        """
+        Team lock is assumed to be held.
+        """
+        global_location = cls._cache.location_map.__root__[location_id]
+        team_location = team_data.locations[location_id]
+
+        new_status = CurrentLocationGameplayDataTeamSpecific(
+            currentLocation=location_id,
+            currentLocationScanned=team_location.scanned,
+            currentLocationSurroundings=global_location.surroundings,
+            networkName=global_location.networkName,
+            firstContactComplete=team_location.visited,
+            powerStatus=team_data.currentStatus.powerStatus,
+        )
+        team_data.currentStatus = new_status
+        await cls._apply_antenna_retracted(team_id, team_data)
 
-            if team_location.visited:
-                cls._find_comm_event_to_activate(team_id, team_data)
+        await cls._mark_task_complete_if_unlocked(team_id, team_data, "jump")
 
-            return GenericResponse(success=True, message=location_id)
+        if team_location.visited:
+            cls._find_comm_event_to_activate(team_id, team_data)
 
     @classmethod
     async def scan(cls, team_id: TeamID) -> ScanResponse:
-        async with cls._lock:
+        async with cls._team_lock(team_id, "scan"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 raise NonExistentTeam()
+            cls._touch_team(team_id)
 
             location_data = cls._cache.location_map.__root__[
                 team_data.currentStatus.currentLocation
@@ -2527,6 +3881,7 @@ class GameStateManager:
                 first_contact_event = {}
 
             await cls._mark_task_complete_if_unlocked(team_id, team_data, "scan")
+            ActionJournal.record(team_id, "scan")
 
             return ScanResponse(
                 success=True,
@@ -2539,57 +3894,91 @@ class GameStateManager:
     async def set_power_mode(
         cls, team_id: TeamID, new_mode: PowerMode
     ) -> GenericResponse:
-        async with cls._lock:
+        async with cls._team_lock(team_id, "set_power_mode"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 raise NonExistentTeam()
+            cls._touch_team(team_id)
 
             team_data.currentStatus.powerStatus = new_mode
 
             await cls._mark_task_complete_if_unlocked(team_id, team_data, new_mode)
+            ActionJournal.record(team_id, "set_power_mode", new_mode=new_mode)
 
             return GenericResponse(success=True, message=new_mode)
 
+    @classmethod
+    def _team_pending_comm_tasks(
+        cls, team_id: TeamID, team_data: InternalTeamGameData
+    ) -> dict[LocationID, set[TaskID]]:
+        pending = cls._pending_comm_tasks.get(team_id)
+        if pending is None:
+            pending = {}
+            cls._pending_comm_tasks[team_id] = pending
+            for task_id in team_data.tasks:
+                global_task = cls._cache.task_map.__root__.get(task_id)
+                if global_task:
+                    cls._add_pending_comm_task(team_id, team_data, global_task)
+        return pending
+
+    @classmethod
+    def _add_pending_comm_task(
+        cls,
+        team_id: TeamID,
+        team_data: InternalTeamGameData,
+        global_task: InternalGlobalTaskData,
+    ):
+        completion_criteria = global_task.markCompleteWhen
+        if not completion_criteria or completion_criteria.type != "comm":
+            return
+        pending = cls._team_pending_comm_tasks(team_id, team_data)
+        pending.setdefault(
+            completion_criteria.locationID, set()
+        ).add(global_task.taskID)
+
     @classmethod
     def _find_comm_event_to_activate(
         cls, team_id: TeamID, team_data: InternalTeamGameData
     ):
-        def is_relevant_task(global_task: InternalGlobalTaskData) -> bool:
-            # Check if the associated mission is even unlocked.
+        current_location = team_data.currentStatus.currentLocation
+        pending = cls._team_pending_comm_tasks(team_id, team_data).get(
+            current_location, set()
+        )
+
+        relevant_tasks = []
+        # Copy the set so finished tasks can be pruned while iterating.
+        for task_id in list(pending):
+            global_task = cls._cache.task_map.__root__[task_id]
+
+            team_task = team_data.tasks.get(task_id)
             team_mission = team_data.missions.get(global_task.missionID)
+            if (
+                not team_task
+                or team_task.complete
+                or (team_mission and team_mission.complete)
+            ):
+                # None of these are undone, short of the task being
+                # unlocked again, which adds it back.
+                pending.discard(task_id)
+                continue
+
+            # Check if the associated mission is even unlocked.
             if not team_mission:
-                return False
+                continue
             if not team_mission.unlocked:
-                return False
-            if team_mission.complete:
-                return False
-
-            team_task = team_data.tasks.get(global_task.taskID)
-            if not team_task:
-                return False
+                continue
             if not team_task.visible:
-                return False
-            if team_task.complete:
-                return False
-
-            completion_criteria = global_task.markCompleteWhen
-            if not completion_criteria:
-                return False
-            if completion_criteria.type != "comm":
-                return False
-            if (
-                completion_criteria.locationID
-                != team_data.currentStatus.currentLocation
-            ):
-                return False
+                continue
+
             logging.info(
                 f"{global_task.taskID} is considered "
                 "a relevant comm event task."
             )
-            return True
+            relevant_tasks.append(global_task)
 
-        relevant_tasks = list(
-            filter(is_relevant_task, cls._cache.task_map.__root__.values())
+        # Tasks later in the global task map take precedence.
+        relevant_tasks.sort(
+            key=lambda t: cls._cache.index.task_order[t.taskID]
         )
         try:
             task = relevant_tasks.pop()
@@ -2601,7 +3990,7 @@ class GameStateManager:
 
     @classmethod
     async def complete_comm_event(cls, team_id: TeamID) -> GenericResponse:
-        async with cls._lock:
+        async with cls._team_lock(team_id, "complete_comm_event"):
             team_data = cls._cache.team_map.__root__.get(team_id)
             if not team_data:
                 raise NonExistentTeam()
@@ -2617,6 +4006,7 @@ class GameStateManager:
                     message=f"Team {team_id} did not have "
                     "an active comm event to complete.",
                 )
+            cls._touch_team(team_id)
 
             if current_comm_event and current_comm_event.firstContact:
                 current_location_id = team_data.currentStatus.currentLocation
@@ -2640,6 +4030,7 @@ class GameStateManager:
             await cls._mark_task_complete_if_unlocked(team_id, team_data, "comm")
 
             cls._find_comm_event_to_activate(team_id, team_data)
+            ActionJournal.record(team_id, "complete_comm_event")
 
             logging.info(
                 f"Team {team_id} completed comm event {current_comm_event.commID}."
@@ -2647,3 +4038,22 @@ class GameStateManager:
             return GenericResponse(
                 success=True, message="Incoming comm event completed."
             )
+
+
+def _team_score_max_age() -> dict[tuple[str, ...], float]:
+    fetch_times = [
+        team_scores.fetched_at
+        for team_scores in GameStateManager._team_scores.values()
+    ]
+    if not fetch_times:
+        return {(): 0.0}
+    return {(): time.monotonic() - min(fetch_times)}
+
+
+TEAM_SCORE_MAX_AGE = Gauge(
+    "gamebrain_team_score_max_age_seconds",
+    "Seconds since the stalest cached team scores were fetched from "
+    "Gameboard.",
+    (),
+    _team_score_max_age,
+)
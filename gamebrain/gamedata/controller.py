@@ -22,14 +22,22 @@
 
 # DM23-0100
 
-import json
 import logging
 
-from fastapi import APIRouter, Security, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    Response,
+    Security,
+    HTTPException,
+)
 from pydantic import constr
 
 from ..auth import gamestate_jwt_dependency
 from .cache import GameStateManager, NonExistentTeam, TeamID, LocationID
+from .jsonresponse import GameStateJSONResponse
+from ..metrics import TimedRoute
 from .model import (
     GameDataResponse,
     GenericResponse,
@@ -43,98 +51,142 @@ Coordinates = constr(to_lower=True, regex=r"[0-9A-Za-z]{6}")
 gamestate_router = APIRouter(
     prefix="/GameData",
     dependencies=(Security(gamestate_jwt_dependency),),
+    default_response_class=GameStateJSONResponse,
+    route_class=TimedRoute,
 )
 
 
+async def player_action(team_id: TeamID):
+    """
+    Player actions often lead to challenge changes, so the team's mission
+    updates are polled sooner after one.
+    """
+    GameStateManager.poll_mission_updates_soon(team_id)
+
+
+PLAYER_ACTION = (Depends(player_action),)
+
+
 @gamestate_router.get("/")
 @gamestate_router.get("/{team_id}")
 async def get_gamedata(
     team_id: TeamID | None = None,
+    if_none_match: str | None = Header(default=None),
 ) -> GameDataResponse:
     try:
-        game_data = await GameStateManager.get_team_data(team_id)
-        logging.debug(
-            f"Team {team_id} GameData: \n{json.dumps(game_data.dict(), indent=2, default=str)}"
+        game_data, session = await GameStateManager.get_versioned_team_data(
+            team_id
         )
-        return game_data
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
 
+    etag = game_data.etag(session)
+    headers = {"ETag": etag}
+    if if_none_match and _etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    body = game_data.json(session)
+    logging.debug(f"Team {team_id} GameData: \n{body}")
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    # If-None-Match uses weak comparison, so the W/ prefix doesn't matter.
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
 
-@gamestate_router.get("/LocationUnlock/{coordinates}/{team_id}")
+
+@gamestate_router.get(
+    "/LocationUnlock/{coordinates}/{team_id}", dependencies=PLAYER_ACTION
+)
 async def get_locationunlock(
     coordinates: Coordinates,
     team_id: TeamID,
 ) -> LocationUnlockResponse:
     try:
-        return await GameStateManager.unlock_location(team_id, coordinates)
+        return GameStateJSONResponse(
+            await GameStateManager.unlock_location(team_id, coordinates)
+        )
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
 
 
-@gamestate_router.get("/Jump/{location_id}/{team_id}")
+@gamestate_router.get(
+    "/Jump/{location_id}/{team_id}", dependencies=PLAYER_ACTION
+)
 async def get_jump(
     location_id: LocationID,
     team_id: TeamID,
 ) -> GenericResponse:
     try:
-        return await GameStateManager.jump(team_id, location_id)
+        return GameStateJSONResponse(
+            await GameStateManager.jump(team_id, location_id)
+        )
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
 
 
-@gamestate_router.get("/ExtendAntenna/{team_id}")
+@gamestate_router.get("/ExtendAntenna/{team_id}", dependencies=PLAYER_ACTION)
 async def get_extendantenna(
     team_id: TeamID,
 ) -> GenericResponse:
     try:
         result = await GameStateManager.extend_antenna(team_id)
         logging.info(f"{result.json(indent=2)}")
-        return result
+        return GameStateJSONResponse(result)
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
 
 
-@gamestate_router.get("/RetractAntenna/{team_id}")
+@gamestate_router.get("/RetractAntenna/{team_id}", dependencies=PLAYER_ACTION)
 async def get_retractantenna(
     team_id: TeamID,
 ) -> GenericResponse:
     try:
         result = await GameStateManager.retract_antenna(team_id)
         logging.info(f"{result.json(indent=2)}")
-        return result
+        return GameStateJSONResponse(result)
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
 
 
-@gamestate_router.get("/ScanLocation/{team_id}")
+@gamestate_router.get("/ScanLocation/{team_id}", dependencies=PLAYER_ACTION)
 async def get_scanlocation(
     team_id: TeamID,
 ) -> ScanResponse:
     try:
-        return await GameStateManager.scan(team_id)
+        return GameStateJSONResponse(await GameStateManager.scan(team_id))
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
 
 
-@gamestate_router.get("/PowerMode/{status}/{team_id}")
+@gamestate_router.get(
+    "/PowerMode/{status}/{team_id}", dependencies=PLAYER_ACTION
+)
 async def get_powermode(
     status: PowerMode,
     team_id: TeamID,
 ) -> GenericResponse:
     try:
-        return await GameStateManager.set_power_mode(team_id, status)
+        return GameStateJSONResponse(
+            await GameStateManager.set_power_mode(team_id, status)
+        )
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
 
 
-@gamestate_router.get("/CommEventCompleted/{team_id}")
+@gamestate_router.get(
+    "/CommEventCompleted/{team_id}", dependencies=PLAYER_ACTION
+)
 async def get_commeventcompleted(
     team_id: TeamID,
 ) -> GenericResponse:
     try:
         result = await GameStateManager.complete_comm_event(team_id)
         logging.info(f"{result}")
-        return result
+        return GameStateJSONResponse(result)
     except NonExistentTeam:
         raise HTTPException(status_code=404, detail="Team not found.")
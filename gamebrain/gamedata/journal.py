@@ -0,0 +1,214 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import datetime
+from datetime import timezone
+import json
+import logging
+from typing import Any, Literal
+
+from pydantic.json import pydantic_encoder
+
+from .. import db
+
+JournalAction = Literal[
+    "new_team",
+    "jump",
+    "extend_antenna",
+    "retract_antenna",
+    "scan",
+    "set_power_mode",
+    "unlock_location",
+    "complete_comm_event",
+    "challenge_task_complete",
+    "challenge_task_failed",
+    "grading_task_update",
+    "pc4_update_team_urls",
+    "mission_update",
+]
+
+
+@dataclass
+class JournalEntry:
+    seq: int
+    team_id: str
+    action: JournalAction
+    args: dict[str, Any]
+    recorded_time: datetime.datetime
+
+
+class ActionJournal:
+    """
+    Write-ahead journal of the actions that change a team's state.
+
+    Entries are recorded in memory as actions are applied, and a background
+    task writes them to the database in batches. Cache snapshots serve as
+    checkpoints: storing a team's snapshot removes the journal entries it
+    includes. On startup, entries left over from after the last checkpoint
+    are replayed on top of the stored snapshot.
+    """
+
+    _enabled = False
+    _flush_interval: float = 1.0
+    _flush_task: asyncio.Task = None
+    # Held while writing to the database, so that a checkpoint never removes
+    # entries that are still on their way there.
+    _write_lock = asyncio.Lock()
+
+    _seq = 0
+    _pending: list[JournalEntry] = []
+    # The sequence number of the last entry recorded for each team.
+    _team_seqs: dict[str, int] = {}
+    # Entries up to this sequence number belong to a cache that has since
+    # been replaced.
+    _obsolete_through: int | None = None
+
+    @classmethod
+    async def load(cls) -> list[JournalEntry]:
+        """
+        Returns the stored entries to replay, in order. Journaling stays off
+        until start is called, so replaying them doesn't journal them again.
+        """
+        entries = [
+            JournalEntry(
+                seq=row["seq"],
+                team_id=row["team_id"],
+                action=row["action"],
+                args=json.loads(row["args"]),
+                recorded_time=row["recorded_time"],
+            )
+            for row in await db.get_journal_entries()
+        ]
+        for entry in entries:
+            cls._seq = max(cls._seq, entry.seq)
+            cls._team_seqs[entry.team_id] = entry.seq
+        return entries
+
+    @classmethod
+    def start(cls, flush_interval: float):
+        cls._flush_interval = flush_interval
+        cls._enabled = True
+        cls._flush_task = asyncio.create_task(cls._flush_loop())
+        cls._flush_task.add_done_callback(cls._handle_task_result)
+
+    @classmethod
+    def record(cls, team_id: str, action: JournalAction, **args):
+        """
+        Team lock is assumed to be held. Arguments need to be serializable by
+        pydantic's JSON encoder.
+        """
+        if not cls._enabled:
+            return
+        cls._seq += 1
+        cls._team_seqs[team_id] = cls._seq
+        cls._pending.append(
+            JournalEntry(
+                seq=cls._seq,
+                team_id=team_id,
+                action=action,
+                args=json.loads(json.dumps(args, default=pydantic_encoder)),
+                recorded_time=datetime.datetime.now(timezone.utc),
+            )
+        )
+
+    @classmethod
+    def team_seq(cls, team_id: str) -> int | None:
+        return cls._team_seqs.get(team_id)
+
+    @classmethod
+    def obsolete_through(cls) -> int | None:
+        return cls._obsolete_through
+
+    @classmethod
+    def reset(cls):
+        """
+        Called when the whole cache is replaced. Nothing journaled so far
+        applies to the new cache.
+        """
+        cls._pending = []
+        cls._team_seqs = {}
+        cls._obsolete_through = cls._seq
+
+    @classmethod
+    async def _flush_body(cls):
+        """
+        Write lock is assumed to be held.
+        """
+        if not cls._pending:
+            return
+        entries, cls._pending = cls._pending, []
+        try:
+            await db.store_journal_entries(
+                [
+                    {
+                        "seq": entry.seq,
+                        "team_id": entry.team_id,
+                        "action": entry.action,
+                        "args": json.dumps(entry.args),
+                        "recorded_time": entry.recorded_time,
+                    }
+                    for entry in entries
+                ]
+            )
+        except Exception:
+            # Keep them for the next attempt.
+            cls._pending = entries + cls._pending
+            raise
+
+    @classmethod
+    async def flush(cls):
+        async with cls._write_lock:
+            await cls._flush_body()
+
+    @classmethod
+    @asynccontextmanager
+    async def checkpoint(cls):
+        """
+        Flushes the journal and holds off further flushes while a checkpoint
+        is stored, so the checkpoint can remove the entries it includes.
+        """
+        async with cls._write_lock:
+            await cls._flush_body()
+            yield
+
+    @classmethod
+    async def _flush_loop(cls):
+        while True:
+            await asyncio.sleep(cls._flush_interval)
+            try:
+                await cls.flush()
+            except Exception as e:
+                logging.exception(e)
+
+    @staticmethod
+    def _handle_task_result(task: asyncio.Task) -> None:
+        try:
+            task.result()
+        except asyncio.CancelledError:
+            pass  # Task cancellation should not be logged as an error.
+        except Exception:  # pylint: disable=broad-except
+            logging.exception("Exception raised by task = %r", task)
@@ -0,0 +1,90 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+from datetime import date, datetime, time
+import enum
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# orjson is in requirements.txt. Installs without it encode responses with
+# the standard library, which produces the same JSON more slowly.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    # Models are handed back field by field instead of through .dict(), so
+    # nested models aren't converted to dicts just to be encoded.
+    if isinstance(obj, BaseModel):
+        return dict(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable"
+    )
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encodes content, which may contain pydantic models, as compact JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_default, option=orjson.OPT_NON_STR_KEYS
+        )
+    return _json_dumps(content)
+
+
+def _json_dumps(content: Any) -> bytes:
+    """
+    The standard library fallback for dumps.
+    """
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class GameStateJSONResponse(JSONResponse):
+    """
+    Encodes models directly, instead of going through FastAPI's
+    jsonable_encoder first. Routes need to return the response themselves to
+    skip jsonable_encoder, since FastAPI runs it on anything else they return.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
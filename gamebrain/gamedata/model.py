@@ -23,6 +23,7 @@
 # DM23-0100
 
 from ..commonmodels import ConsoleUrl
+from dataclasses import dataclass, field
 from datetime import datetime
 import enum
 from typing import Literal
@@ -376,41 +377,6 @@ class GameDataTeamSpecific(BaseModel):
 
     pc4_handling_cllctn6: datetime = datetime.now()
 
-    def to_internal(self) -> "InternalTeamGameData":
-        locations = {
-            location.locationID: location.dict() for location in self.locations
-        }
-        missions = {}
-        tasks = {}
-        for mission_data in self.missions:
-            try:
-                # Get the first task that is not marked complete for this mission.
-                current_task = next(
-                    filter(lambda t: t.complete is False,
-                           mission_data.taskList)
-                ).taskID
-            except StopIteration:
-                current_task = None
-            missions[mission_data.missionID] = mission_data.dict() | {
-                "current_task": current_task,
-                "tasks": [],
-            }
-
-            for task_data in mission_data.taskList:
-                task_model = InternalTeamTaskData(**task_data.dict())
-                tasks[task_data.taskID] = task_model
-                missions[mission_data.missionID]["tasks"].append(
-                    task_data.taskID)
-
-        return InternalTeamGameData(
-            currentStatus=self.currentStatus,
-            session=self.session,
-            ship=self.ship,
-            locations=locations,
-            missions=missions,
-            tasks=tasks,
-        )
-
 
 class GameDataResponse(GameDataTeamSpecific):
     locations: list[LocationDataFull]
@@ -444,28 +410,70 @@ class InternalGlobalLocationData(LocationData):
     ...
 
 
-class InternalTeamLocationData(LocationDataTeamSpecific):
-    ...
-
-
 class InternalGlobalTaskData(TaskData):
     ...
 
 
-class InternalTeamTaskData(TaskDataTeamSpecific):
-    ...
-
-
 class InternalGlobalMissionData(MissionData):
     first_task: TaskID
     last_task: TaskID
 
 
-class InternalTeamMissionData(MissionDataTeamSpecific):
+# Team state is mutated on every action, so it's kept in plain slotted
+# dataclasses instead of models. Pydantic is only used when converting to and
+# from snapshots and responses.
+@dataclass(slots=True)
+class InternalTeamLocationData:
+    locationID: LocationID
+    unlocked: bool = True
+    visited: bool = False
+    scanned: bool = False
+    networkEstablished: bool = False
+
+    def clone(self) -> "InternalTeamLocationData":
+        return InternalTeamLocationData(
+            self.locationID,
+            self.unlocked,
+            self.visited,
+            self.scanned,
+            self.networkEstablished,
+        )
+
+
+@dataclass(slots=True)
+class InternalTeamTaskData:
+    taskID: TaskID
+    visible: bool = False
+    complete: bool = False
+
+    def clone(self) -> "InternalTeamTaskData":
+        return InternalTeamTaskData(self.taskID, self.visible, self.complete)
+
+
+@dataclass(slots=True, kw_only=True)
+class InternalTeamMissionData:
+    missionID: MissionID
+    unlocked: bool = True
+    visible: bool = True
+    complete: bool = False
+    taskList: list[InternalTeamTaskData] = field(default_factory=list)
+    gamespaceID: str = None
     tasks: list[TaskID]
 
+    def clone(self) -> "InternalTeamMissionData":
+        return InternalTeamMissionData(
+            missionID=self.missionID,
+            unlocked=self.unlocked,
+            visible=self.visible,
+            complete=self.complete,
+            taskList=[task.clone() for task in self.taskList],
+            gamespaceID=self.gamespaceID,
+            tasks=list(self.tasks),
+        )
 
-class InternalTeamGameData(BaseModel):
+
+@dataclass(slots=True, kw_only=True)
+class InternalTeamGameData:
     currentStatus: CurrentLocationGameplayDataTeamSpecific
     session: SessionDataTeamSpecific
     ship: ShipDataTeamSpecific
@@ -476,21 +484,112 @@ class InternalTeamGameData(BaseModel):
     # This is special handling for PC4 games.
     pc4_handling_cllctn6: datetime = datetime.now()
 
-    def to_snapshot(self) -> GameDataTeamSpecific:
-        locations = [location.dict() for location in self.locations.values()]
-        missions = []
-        for mission in self.missions.values():
-            task_list = []
-            for task in mission.tasks:
-                task_data = self.tasks[task]
-                task_list.append(TaskDataTeamSpecific(**task_data.dict()))
-            mission_data = mission.dict() | {"taskList": task_list}
-            missions.append(mission_data)
-
-        return GameDataTeamSpecific(
-            currentStatus=self.currentStatus,
-            session=self.session,
-            ship=self.ship,
-            locations=locations,
-            missions=missions,
+    def clone(self) -> "InternalTeamGameData":
+        """
+        A copy that can be changed independently of this one, much cheaper
+        than deepcopy. The status, session and ship models are only ever
+        changed by assigning to their fields, so shallow copies of them are
+        enough.
+        """
+        return InternalTeamGameData(
+            currentStatus=self.currentStatus.copy(),
+            session=self.session.copy(),
+            ship=self.ship.copy(),
+            locations={
+                location_id: location.clone()
+                for location_id, location in self.locations.items()
+            },
+            missions={
+                mission_id: mission.clone()
+                for mission_id, mission in self.missions.items()
+            },
+            tasks={task_id: task.clone() for task_id, task in self.tasks.items()},
+            pc4_handling_cllctn6=self.pc4_handling_cllctn6,
         )
+
+
+def team_data_to_internal(team_data: GameDataTeamSpecific) -> InternalTeamGameData:
+    locations = {
+        location.locationID: InternalTeamLocationData(
+            locationID=location.locationID,
+            unlocked=location.unlocked,
+            visited=location.visited,
+            scanned=location.scanned,
+            networkEstablished=location.networkEstablished,
+        )
+        for location in team_data.locations
+    }
+    missions = {}
+    tasks = {}
+    for mission_data in team_data.missions:
+        task_list = [
+            InternalTeamTaskData(
+                taskID=task_data.taskID,
+                visible=task_data.visible,
+                complete=task_data.complete,
+            )
+            for task_data in mission_data.taskList
+        ]
+        missions[mission_data.missionID] = InternalTeamMissionData(
+            missionID=mission_data.missionID,
+            unlocked=mission_data.unlocked,
+            visible=mission_data.visible,
+            complete=mission_data.complete,
+            taskList=task_list,
+            gamespaceID=mission_data.gamespaceID,
+            tasks=[task.taskID for task in task_list],
+        )
+        for task in task_list:
+            tasks[task.taskID] = task
+
+    return InternalTeamGameData(
+        currentStatus=team_data.currentStatus.copy(),
+        session=team_data.session.copy(),
+        ship=team_data.ship.copy(),
+        locations=locations,
+        missions=missions,
+        tasks=tasks,
+    )
+
+
+def team_data_to_snapshot(team_data: InternalTeamGameData) -> GameDataTeamSpecific:
+    locations = [
+        LocationDataTeamSpecific.construct(
+            locationID=location.locationID,
+            unlocked=location.unlocked,
+            visited=location.visited,
+            scanned=location.scanned,
+            networkEstablished=location.networkEstablished,
+        )
+        for location in team_data.locations.values()
+    ]
+    missions = []
+    for mission in team_data.missions.values():
+        task_list = []
+        for task_id in mission.tasks:
+            task = team_data.tasks[task_id]
+            task_list.append(
+                TaskDataTeamSpecific.construct(
+                    taskID=task.taskID,
+                    visible=task.visible,
+                    complete=task.complete,
+                )
+            )
+        missions.append(
+            MissionDataTeamSpecific.construct(
+                missionID=mission.missionID,
+                unlocked=mission.unlocked,
+                visible=mission.visible,
+                complete=mission.complete,
+                taskList=task_list,
+                gamespaceID=mission.gamespaceID,
+            )
+        )
+
+    return GameDataTeamSpecific(
+        currentStatus=team_data.currentStatus,
+        session=team_data.session,
+        ship=team_data.ship,
+        locations=locations,
+        missions=missions,
+    )
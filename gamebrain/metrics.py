@@ -0,0 +1,356 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+"""
+Metrics in the Prometheus text format, served at /metrics.
+
+Observing a value only does a dict lookup, a bisect and a few additions, so
+that instrumenting the hot paths stays cheap. Everything else happens when
+the metrics are rendered.
+"""
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Callable
+import time
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+# Prometheus' default buckets, in seconds.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5,
+    10.0,
+)
+# Most lock waits and holds are well under a millisecond.
+LOCK_BUCKETS = (
+    0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0,
+)
+BACKGROUND_BUCKETS = (0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type_name = ""
+
+    def __init__(self, name: str, description: str, label_names: Labels = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        REGISTRY.append(self)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, label_names: Labels = ()):
+        super().__init__(name, description, label_names)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """
+    Read from the given function when the metrics are rendered. The function
+    returns the gauge's value for each set of labels.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Labels,
+        read: Callable[[], dict[Labels, float]],
+    ):
+        super().__init__(name, description, label_names)
+        self._read = read
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in self._read().items()
+        ]
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, label_names)
+        self.buckets = buckets
+        # Per set of labels: the count in each bucket (not cumulative, with
+        # one more for +Inf), then the sum.
+        self._series: dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> list[str]:
+        lines = []
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(self.label_names, labels, le)} "
+                    f"{cumulative}"
+                )
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+REGISTRY: list[Metric] = []
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+ROUTE_DURATION = Histogram(
+    "gamebrain_route_duration_seconds",
+    "Time to handle a request, by route.",
+    ("method", "route", "status"),
+)
+LOCK_WAIT = Histogram(
+    "gamebrain_lock_wait_seconds",
+    "Time spent waiting for a lock, by the method that acquired it.",
+    ("lock", "method"),
+    LOCK_BUCKETS,
+)
+LOCK_HOLD = Histogram(
+    "gamebrain_lock_hold_seconds",
+    "Time a lock was held, by the method that acquired it.",
+    ("lock", "method"),
+    LOCK_BUCKETS,
+)
+OUTBOUND_DURATION = Histogram(
+    "gamebrain_outbound_request_duration_seconds",
+    "Duration of Gameboard and TopoMojo requests, by endpoint.",
+    ("service", "method", "endpoint"),
+)
+OUTBOUND_ERRORS = Counter(
+    "gamebrain_outbound_request_errors_total",
+    "Gameboard and TopoMojo requests that failed or got an error status.",
+    ("service", "method", "endpoint"),
+)
+MISSION_UPDATE_FAILURES = Counter(
+    "gamebrain_mission_update_failures_total",
+    "Failed fetches of a team's challenge states by the mission timer. "
+    "The failed teams are in the error log.",
+)
+BACKGROUND_CYCLE = Histogram(
+    "gamebrain_background_cycle_duration_seconds",
+    "Duration of one cycle of a background loop, excluding its sleep.",
+    ("loop",),
+    BACKGROUND_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    "gamebrain_db_query_duration_seconds",
+    "Database statement execution time, by statement type.",
+    ("statement",),
+)
+
+
+class TimedRoute(APIRoute):
+    """
+    Records each request's duration under the route's path template.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def timed_handler(request: Request) -> Response:
+            start = time.perf_counter()
+            status = "500"
+            try:
+                response = await handler(request)
+                status = str(response.status_code)
+                return response
+            except Exception as e:
+                status = str(getattr(e, "status_code", 500))
+                raise
+            finally:
+                ROUTE_DURATION.observe(
+                    time.perf_counter() - start, request.method, route, status
+                )
+
+        return timed_handler
+
+
+class InstrumentedLock(asyncio.Lock):
+    """
+    An asyncio.Lock that records how long each acquirer waited for it and
+    held it. Acquire it through labelled() to record them by method:
+
+        async with lock.labelled("jump"):
+            ...
+
+    Using it directly records them as "unlabelled".
+    """
+
+    def __init__(self, name: str):
+        super().__init__()
+        self._name = name
+        self._holder = ""
+        self._acquired_at = 0.0
+
+    def labelled(self, method: str) -> "LabelledLock":
+        return LabelledLock(self, method)
+
+    async def _acquire_for(self, method: str):
+        start = time.perf_counter()
+        await self.acquire()
+        self._acquired_at = time.perf_counter()
+        self._holder = method
+        LOCK_WAIT.observe(self._acquired_at - start, self._name, method)
+
+    def _release_for(self):
+        LOCK_HOLD.observe(
+            time.perf_counter() - self._acquired_at, self._name, self._holder
+        )
+        self.release()
+
+    async def __aenter__(self):
+        await self._acquire_for("unlabelled")
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._release_for()
+
+
+class LabelledLock:
+    """
+    An InstrumentedLock acquired on behalf of a method.
+    """
+
+    __slots__ = ("lock", "method")
+
+    def __init__(self, lock: InstrumentedLock, method: str):
+        self.lock = lock
+        self.method = method
+
+    async def __aenter__(self):
+        await self.lock._acquire_for(self.method)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.lock._release_for()
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """
+    Replaces the IDs in an endpoint's path with {id}, so that requests to
+    the same endpoint are counted together.
+    """
+    return "/".join(
+        "{id}" if any(c.isdigit() for c in segment) else segment
+        for segment in endpoint.split("/")
+    )
+
+
+class BackgroundCycle:
+    """
+    Times one cycle of a background loop:
+
+        async with BackgroundCycle("cleanup"):
+            ...
+    """
+
+    __slots__ = ("_loop", "_start")
+
+    def __init__(self, loop: str):
+        self._loop = loop
+        self._start = 0.0
+
+    async def __aenter__(self):
+        self._start = time.perf_counter()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        BACKGROUND_CYCLE.observe(time.perf_counter() - self._start, self._loop)
@@ -24,6 +24,8 @@
 
 import asyncio
 
+from .metrics import Gauge
+
 
 class Subscriber:
     _internal_queue: asyncio.Queue
@@ -81,3 +83,28 @@ class PubSub:
     async def unregister_subscriber(cls, subscriber: Subscriber):
         async with cls._subscribers_lock:
             cls._subscribers.remove(subscriber)
+
+
+def _queue_depths() -> dict[tuple[str, ...], float]:
+    return {
+        ("publish",): PubSub._pub_queue.qsize(),
+        ("subscriber_max",): max(
+            (sub._internal_queue.qsize() for sub in PubSub._subscribers),
+            default=0,
+        ),
+    }
+
+
+PUBSUB_QUEUE_DEPTH = Gauge(
+    "gamebrain_pubsub_queue_depth",
+    "Messages waiting in the publish queue, and in the fullest subscriber "
+    "queue.",
+    ("queue",),
+    _queue_depths,
+)
+PUBSUB_SUBSCRIBERS = Gauge(
+    "gamebrain_pubsub_subscribers",
+    "Number of PubSub subscribers.",
+    (),
+    lambda: {(): len(PubSub._subscribers)},
+)
@@ -0,0 +1,127 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+import asyncio
+
+import pytest
+import yaml
+
+from ..benchmarks import hotpaths, loadtest
+from ..benchmarks.standins import FakeTopoMojo
+from ..gamedata.cache import GameDataCacheSnapshot
+import synthetic_initial_state
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_hotpath_benchmarks_run(event_loop):
+    results = await hotpaths.run(
+        hotpaths.BenchmarkConfig(teams=2, iterations=2, concurrency=2)
+    )
+    summaries = {
+        operation: result.summary() for operation, result in results.items()
+    }
+
+    assert set(summaries) == {
+        *hotpaths.team_operations(),
+        *hotpaths.global_operations(),
+    }
+    for operation in hotpaths.team_operations():
+        # Two calls for each of the two teams.
+        assert len(results[operation].latencies) == 4
+    assert "team_lock_max_ms" in summaries["scan"]
+    assert "global_lock_max_ms" in summaries["snapshot_data"]
+    assert hotpaths.find_regressions(summaries, summaries, 0.0) == []
+
+
+def test_find_regressions():
+    baseline = {"scan": {"ops_per_sec": 100.0, "p50_ms": 1.0, "p99_ms": 2.0}}
+    current = {"scan": {"ops_per_sec": 70.0, "p50_ms": 1.1, "p99_ms": 3.0}}
+
+    regressions = hotpaths.find_regressions(current, baseline, 0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("scan: 70.0 ops/sec")
+    assert regressions[1].startswith("scan: p99_ms")
+
+
+@pytest.mark.asyncio
+async def test_synthetic_initial_state(event_loop, tmp_path):
+    config = synthetic_initial_state.GeneratorConfig(
+        locations=20, missions=10, tasks_per_mission=6, teams=3, initial_missions=2
+    )
+    initial_state = synthetic_initial_state.generate(config)
+
+    assert initial_state.json() == synthetic_initial_state.generate(config).json()
+    assert len(initial_state.task_map.__root__) == 60
+    assert len(initial_state.team_map.__root__) == 3
+    assert GameDataCacheSnapshot.parse_raw(initial_state.json()) == initial_state
+
+    initial_state_path = tmp_path / "initial_state.json"
+    initial_state_path.write_text(initial_state.json())
+    results = await hotpaths.run(
+        hotpaths.BenchmarkConfig(
+            teams=2,
+            iterations=2,
+            concurrency=2,
+            initial_state=str(initial_state_path),
+        )
+    )
+    assert len(results["jump"].latencies) == 4
+
+
+@pytest.mark.asyncio
+async def test_standin_asgi_app_injects_errors(event_loop):
+    fake_topomojo = FakeTopoMojo("gateway", error_rate=0.5, seed=1)
+    fake_topomojo.add_gamespace("gamespace", {"taskID": "task"})
+
+    async with fake_topomojo.asgi_client("http://topomojo.test/api/") as client:
+        responses = [await client.get("gamespace/gamespace") for _ in range(20)]
+
+    statuses = [response.status_code for response in responses]
+    assert set(statuses) == {200, 503}
+    assert fake_topomojo.errors == statuses.count(503)
+    document = responses[statuses.index(200)].json()["markdown"]
+    assert yaml.safe_load(document) == {"taskID": "task"}
+
+
+def test_route_result_summary():
+    result = loadtest.RouteResult(
+        "GET /GameData/{team_id}", [0.001, 0.002, 0.004], errors=1, elapsed=2.0
+    )
+
+    assert result.summary() == {
+        "requests": 3,
+        "errors": 1,
+        "requests_per_sec": 1.5,
+        "p50_ms": 2.0,
+        "p99_ms": 4.0,
+    }
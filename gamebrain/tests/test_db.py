@@ -0,0 +1,222 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+
+import pytest
+import pytest_asyncio
+
+from gamebrain import db
+from gamebrain.db import (
+    COMPRESSED_SNAPSHOT_MAGIC,
+    DBManager,
+    PlayerInfo,
+    SessionDirectory,
+    decode_compressed_snapshot,
+    encode_compressed_snapshot,
+)
+
+TEST_DB = "sqlite+aiosqlite://"
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture
+async def test_db():
+    await DBManager.init_db(TEST_DB, drop_first=True)
+    yield
+    await DBManager.engine.dispose()
+    DBManager.engine = None
+    SessionDirectory.invalidate()
+
+
+def _sorted_team(team: dict) -> dict:
+    return team | {
+        relation: sorted(team[relation], key=lambda row: row["id"])
+        for relation in ("players", "vm_data", "secrets")
+    }
+
+
+async def _assert_directory_matches_db():
+    teams = await DBManager.get_rows(
+        DBManager.TeamData, exclude=SessionDirectory.TEAM_EXCLUDE
+    )
+    assert sorted(
+        map(_sorted_team, await db.get_teams()), key=lambda team: team["id"]
+    ) == sorted(map(_sorted_team, teams), key=lambda team: team["id"])
+
+    sessions = await DBManager.get_rows(
+        DBManager.GameSession, exclude=SessionDirectory.SESSION_EXCLUDE
+    )
+    directory_sessions = {
+        session["id"]: session for session in await db.get_all_sessions()
+    }
+    assert directory_sessions.keys() == {session["id"] for session in sessions}
+    for session in sessions:
+        directory_session = directory_sessions[session["id"]]
+        assert {
+            key: value
+            for key, value in directory_session.items()
+            if key != "teams"
+        } == session
+        assert sorted(
+            team["id"] for team in directory_session["teams"]
+        ) == sorted(
+            team["id"]
+            for team in teams
+            if team["game_session_id"] == session["id"]
+        )
+
+
+async def _store_test_session(team_ids: list[str]) -> int:
+    now = datetime.now(timezone.utc)
+    return await db.store_game_session(
+        team_ids,
+        now,
+        now + timedelta(hours=1),
+        now,
+        "game",
+        [
+            PlayerInfo(team_id, f"{team_id}_player", f"{team_id}_user")
+            for team_id in team_ids
+        ],
+    )
+
+
+def test_compressed_snapshot_round_trip():
+    with open("initial_state.json") as f:
+        snapshot = json.dumps(json.load(f))
+
+    encoded = encode_compressed_snapshot(snapshot)
+
+    assert encoded.startswith(COMPRESSED_SNAPSHOT_MAGIC)
+    assert len(encoded) < len(snapshot)
+    assert decode_compressed_snapshot(encoded) == snapshot
+
+
+def test_compressed_snapshot_rejects_unknown_data():
+    encoded = encode_compressed_snapshot("{}")
+    future_version = (
+        COMPRESSED_SNAPSHOT_MAGIC
+        + bytes((255,))
+        + encoded[len(COMPRESSED_SNAPSHOT_MAGIC) + 1:]
+    )
+
+    with pytest.raises(ValueError):
+        decode_compressed_snapshot(b'"{}"')
+    with pytest.raises(ValueError):
+        decode_compressed_snapshot(future_version)
+
+
+@pytest.mark.asyncio
+async def test_directory_writes_match_database(event_loop, test_db):
+    # Load the directory before the writes, so they update it.
+    assert await db.get_teams() == []
+
+    session_id = await _store_test_session(["team_a", "team_b"])
+    await _assert_directory_matches_db()
+
+    await db.store_team(
+        "team_a", ship_gamespace_id="ship_a", team_name="Team A"
+    )
+    await _assert_directory_matches_db()
+
+    await db.store_virtual_machines(
+        "team_a",
+        [
+            {"id": "vm_1", "url": "https://vm/1", "name": "vm 1"},
+            {"id": "vm_2", "url": "https://vm/2", "name": "vm 2"},
+        ],
+    )
+    await _assert_directory_matches_db()
+    # Merging an existing VM replaces it.
+    await db.store_virtual_machines(
+        "team_a", [{"id": "vm_1", "url": "https://vm/new", "name": "vm 1"}]
+    )
+    await _assert_directory_matches_db()
+
+    await db.store_challenge_secrets("team_b", ["secret_1", "secret_2"])
+    await _assert_directory_matches_db()
+
+    # A player that moves is removed from the old team.
+    await db.store_players(
+        [
+            PlayerInfo("team_b", "team_a_player", "team_a_user"),
+            PlayerInfo("team_b", "new_player", "new_user"),
+        ]
+    )
+    await _assert_directory_matches_db()
+    assert (await db.get_team("team_a"))["players"] == []
+
+    await db.store_event("team_a", "message")
+    await _assert_directory_matches_db()
+    assert [event["message"] for event in await db.get_events("team_a")] == [
+        "message"
+    ]
+
+    await db.deactivate_team("team_b")
+    await _assert_directory_matches_db()
+    assert not await db.is_team_active("team_b")
+
+    await db.deactivate_game_session(session_id)
+    await _assert_directory_matches_db()
+    assert await db.get_active_game_sessions() == []
+
+
+@pytest.mark.asyncio
+async def test_directory_is_invalidated_on_init(event_loop, test_db):
+    await _store_test_session(["team_a"])
+    assert await db.get_team("team_a")
+
+    # A new in-memory database starts out empty.
+    old_engine = DBManager.engine
+    await DBManager.init_db(TEST_DB, drop_first=True)
+    # Its connection thread would otherwise keep the process from exiting.
+    await old_engine.dispose()
+
+    assert await db.get_team("team_a") == {}
+    await _assert_directory_matches_db()
+
+
+@pytest.mark.asyncio
+async def test_returned_sessions_are_unchanged_by_writes(event_loop, test_db):
+    await _store_test_session(["team_a", "team_b"])
+
+    # Walk the teams while deactivating them, as session cleanup does.
+    session = (await db.get_active_game_sessions())[0]
+    deactivated = []
+    for team in session["teams"]:
+        await db.deactivate_team(team["id"])
+        deactivated.append(team["id"])
+
+    assert sorted(deactivated) == ["team_a", "team_b"]
+    assert all(team["active"] for team in session["teams"])
+    assert await db.get_active_teams() == []
@@ -0,0 +1,112 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+import asyncio
+
+import pytest
+
+from ..benchmarks.standins import FakeGameboard
+from ..clients import gameboard
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def fake_gameboard(monkeypatch) -> FakeGameboard:
+    fake = FakeGameboard(latency=0.01)
+    for team_number in range(5):
+        fake.add_team(f"team_{team_number}", {f"gs_{team_number}": "mission"})
+    monkeypatch.setattr(
+        gameboard, "GAMEBOARD_CLIENT", fake.client("http://gameboard.test/api/")
+    )
+    # Start with no shared requests.
+    gameboard.RequestBatcher.reset()
+    yield fake
+    gameboard.RequestBatcher.reset()
+
+
+@pytest.mark.asyncio
+async def test_team_scores_share_a_game_request(event_loop, fake_gameboard):
+    scores = await asyncio.gather(
+        *(gameboard.team_score(f"team_{n}", "game") for n in range(5))
+    )
+
+    assert fake_gameboard.requests == 1
+    assert [score.score.team.id for score in scores] == [
+        f"team_{n}" for n in range(5)
+    ]
+    assert scores[0].score.challenges[0].id == "gs_0"
+
+    # Within the batch window, the game's scores are reused.
+    await gameboard.team_score("team_0", "game")
+    assert fake_gameboard.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_team_scores_fall_back_to_team_requests(
+    event_loop, fake_gameboard, monkeypatch
+):
+    route = fake_gameboard.route
+
+    def no_game_scores(method, path, request):
+        if path[0] == "game":
+            return None
+        return route(method, path, request)
+
+    monkeypatch.setattr(fake_gameboard, "route", no_game_scores)
+
+    scores = await asyncio.gather(
+        *(gameboard.team_score(f"team_{n}", "game") for n in range(5))
+    )
+
+    assert [score.score.team.id for score in scores] == [
+        f"team_{n}" for n in range(5)
+    ]
+    assert not gameboard.RequestBatcher.game_scores_supported
+    # One failed game request, then one request for each team.
+    assert fake_gameboard.requests == 6
+
+
+@pytest.mark.asyncio
+async def test_mission_updates_are_shared_while_in_flight(
+    event_loop, fake_gameboard
+):
+    updates = await asyncio.gather(
+        gameboard.mission_update("team_0"),
+        gameboard.mission_update("team_0", ["gs_0"]),
+    )
+
+    assert fake_gameboard.requests == 1
+    assert [state.id for state in updates[0]] == ["gs_0"]
+    assert updates[1] == []
+
+    # Challenge states aren't reused once the request is done.
+    await gameboard.mission_update("team_0")
+    assert fake_gameboard.requests == 2
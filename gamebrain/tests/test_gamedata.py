@@ -22,11 +22,24 @@
 
 # DM23-0100
 
+import asyncio
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+import json
+import time
+
 import pytest
 import pytest_asyncio
+import yaml
 
+from ..admin.controllermodels import DeploymentSession
+from ..benchmarks.standins import FakeGameboard
+from ..clients.gameboardmodels import TeamGameScoreQueryResponse
+from ..config import SettingsModel
 from ..gamedata import cache as gd_cache
-from ..config import get_settings
+from ..gamedata import journal as gd_journal
+from ..gamedata import jsonresponse as gd_jsonresponse
+from ..gamedata.model import GamespaceData, team_data_to_snapshot
 
 
 @pytest.fixture(scope="module")
@@ -36,11 +49,33 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(scope="module")
+def test_settings() -> SettingsModel:
+    with open("example.settings.yaml") as f:
+        settings = yaml.safe_load(f)
+    # The example CA certificate path won't exist here.
+    settings.pop("ca_cert_path")
+    return SettingsModel(**settings)
+
+
 @pytest_asyncio.fixture
-async def fixture_load_testdata() -> gd_cache.GameStateManager:
+async def fixture_load_testdata(test_settings) -> gd_cache.GameStateManager:
     with open("initial_state.json") as f:
         initial_cache = gd_cache.GameDataCacheSnapshot(**json.load(f))
-    await gd_cache.GameStateManager.init(initial_cache, get_settings())
+    await gd_cache.GameStateManager.init(initial_cache, test_settings)
+
+
+async def _new_test_team(team_id: str):
+    now = datetime.now(timezone.utc)
+    await gd_cache.GameStateManager.new_team(
+        team_id,
+        DeploymentSession(
+            sessionBegin=now, sessionEnd=now + timedelta(hours=1), now=now
+        ),
+        GamespaceData(
+            gamespaceID=f"{team_id}_ship", consoleURLs=[], isPC4Workspace=True
+        ),
+    )
 
 
 @pytest.mark.asyncio
@@ -69,15 +104,699 @@ async def test_cache_modified_inequality(event_loop, fixture_load_testdata):
 async def test_new_team(event_loop, fixture_load_testdata):
     assert not await gd_cache.GameStateManager.check_team_exists("test_team")
 
-    await gd_cache.GameStateManager.new_team("test_team")
+    await _new_test_team("test_team")
 
     assert await gd_cache.GameStateManager.check_team_exists("test_team")
 
 
 @pytest.mark.asyncio
 async def test_codexes_start_incomplete(event_loop, fixture_load_testdata):
-    await gd_cache.GameStateManager.new_team("test_team")
+    await _new_test_team("test_team")
 
     codexes = await gd_cache.GameStateManager.get_team_codex_status("test_team")
 
     assert not any(codexes.values())
+
+
+@pytest.mark.asyncio
+async def test_team_lock_does_not_block_other_teams(
+    event_loop, fixture_load_testdata
+):
+    await _new_test_team("team_a")
+    await _new_test_team("team_b")
+
+    async with gd_cache.GameStateManager._team_lock("team_a", "test"):
+        response = await asyncio.wait_for(
+            gd_cache.GameStateManager.set_power_mode(
+                "team_b", "explorationMode"
+            ),
+            timeout=1.0,
+        )
+        assert response.success
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                gd_cache.GameStateManager.set_power_mode(
+                    "team_a", "explorationMode"
+                ),
+                timeout=0.1,
+            )
+
+
+@pytest.mark.asyncio
+async def test_network_requests_do_not_hold_team_lock(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    await _new_test_team("team_a")
+
+    lock_held = []
+
+    async def change_network(*_, **__):
+        lock_held.append(
+            gd_cache.GameStateManager._team_locks["team_a"].locked()
+        )
+        # Change the team's state while the request is in flight.
+        await asyncio.wait_for(
+            gd_cache.GameStateManager.set_power_mode(
+                "team_a", "explorationMode"
+            ),
+            timeout=1.0,
+        )
+
+    monkeypatch.setattr(
+        gd_cache.GameStateManager,
+        "_change_gamespace_gateway_network",
+        change_network,
+    )
+
+    response = await gd_cache.GameStateManager.retract_antenna("team_a")
+
+    assert response.success
+    assert lock_held == [False]
+    team_data = gd_cache.GameStateManager._cache.team_map.__root__["team_a"]
+    assert not team_data.currentStatus.antennaExtended
+    assert team_data.currentStatus.powerStatus == "explorationMode"
+
+
+@pytest.mark.asyncio
+async def test_network_actions_follow_state_changes(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+    await _new_test_team("team_a")
+    team_data = manager._cache.team_map.__root__["team_a"]
+
+    calls = []
+
+    async def change_network(location_id, network_name, gamespace, **_):
+        calls.append(
+            (
+                gamespace.gatewayVmName,
+                manager._team_locks["team_a"].locked(),
+            )
+        )
+        # The network change depends on the ship, so it's out of date once
+        # this returns.
+        team_data.ship.gamespaceData.gatewayVmName = f"gateway_{len(calls)}"
+        manager._touch_team("team_a")
+
+    monkeypatch.setattr(
+        manager, "_change_gamespace_gateway_network", change_network
+    )
+
+    response = await manager.retract_antenna("team_a")
+
+    # Each attempt sends the latest change. The last one holds the team
+    # lock, so it's applied.
+    assert response.success
+    assert calls == [
+        (None, False),
+        ("gateway_1", False),
+        ("gateway_2", True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rejected_network_action_restores_networks(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+    await _new_test_team("team_a")
+    team_data = manager._cache.team_map.__root__["team_a"]
+    team_data.currentStatus.firstContactComplete = True
+
+    locations = []
+
+    async def change_network(location_id, *_, **__):
+        locations.append(location_id)
+        if len(locations) == 1:
+            # Extending is no longer allowed once the request is made.
+            team_data.currentStatus.firstContactComplete = False
+            manager._touch_team("team_a")
+
+    monkeypatch.setattr(
+        manager, "_change_gamespace_gateway_network", change_network
+    )
+
+    response = await manager.extend_antenna("team_a")
+
+    assert not response.success
+    assert not team_data.currentStatus.antennaExtended
+    # The extension is undone by sending the retracted network again.
+    assert locations == [team_data.currentStatus.currentLocation, None]
+
+
+@pytest.mark.asyncio
+async def test_mission_timer_fetches_concurrently(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+    team_ids = ["team_a", "team_b", "team_c", "team_d"]
+    for team_id in team_ids:
+        await _new_test_team(team_id)
+        monkeypatch.setitem(manager._cache.challenges, team_id, {})
+    monkeypatch.setattr(manager._settings.game, "mission_update_concurrency", 2)
+
+    in_flight = []
+    max_in_flight = []
+    locks_held = []
+
+    async def mission_update(team_id, *_, **__):
+        in_flight.append(team_id)
+        max_in_flight.append(len(in_flight))
+        locks_held.append(
+            manager._lock.locked() or manager._team_locks[team_id].locked()
+        )
+        await asyncio.sleep(0.01)
+        in_flight.remove(team_id)
+        if team_id == "team_c":
+            raise gd_cache.gameboard.RequestFailure("Unavailable.", 503)
+        return []
+
+    monkeypatch.setattr(gd_cache.gameboard, "mission_update", mission_update)
+    failures = gd_cache.MISSION_UPDATE_FAILURES.value()
+
+    await manager._mission_timer_body()
+
+    assert max(max_in_flight) == 2
+    assert len(max_in_flight) == len(team_ids)
+    assert not any(locks_held)
+    assert gd_cache.MISSION_UPDATE_FAILURES.value() == failures + 1
+
+
+@pytest.mark.asyncio
+async def test_mission_polls_back_off_until_an_action(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+    polling = manager._settings.game.mission_update_polling
+    await _new_test_team("team_a")
+    monkeypatch.setitem(manager._cache.challenges, "team_a", {})
+
+    polls = []
+
+    async def mission_update(team_id, *_, **__):
+        polls.append(team_id)
+        return []
+
+    monkeypatch.setattr(gd_cache.gameboard, "mission_update", mission_update)
+
+    intervals = []
+    for _ in range(8):
+        await manager._mission_timer_body()
+        intervals.append(manager._mission_polls["team_a"].interval)
+        # Make the team due again without resetting its interval.
+        manager._mission_polls["team_a"].next_poll = 0.0
+
+    # The first poll is a change from nothing.
+    assert intervals[:3] == [
+        polling.team_min_interval,
+        polling.team_min_interval * polling.backoff_factor,
+        polling.team_min_interval * polling.backoff_factor ** 2,
+    ]
+    assert intervals[-1] == polling.team_max_interval
+
+    # The team isn't due again until its interval has passed.
+    manager._mission_polls["team_a"].next_poll = time.monotonic() + 60
+    await manager._mission_timer_body()
+    assert len(polls) == 8
+
+    manager.poll_mission_updates_soon("team_a")
+    assert manager._mission_polls["team_a"].interval == (
+        polling.team_min_interval
+    )
+    await manager._mission_timer_body()
+    assert len(polls) == 9
+
+
+def _challenge_state(gamespace_id: str, correct: bool):
+    now = datetime.now(timezone.utc)
+    return gd_cache.GameEngineGameState(
+        id=gamespace_id,
+        isActive=False,
+        hasDeployedGamespace=True,
+        players=None,
+        vms=None,
+        challenge={
+            "maxPoints": 100,
+            "maxAttempts": 3,
+            "attempts": 1,
+            "score": 100 if correct else 0,
+            "sectionCount": 1,
+            "sectionIndex": 0,
+            "sectionScore": 0,
+            "lastScoreTime": now,
+            "questions": [
+                {
+                    "answer": "answer",
+                    "isCorrect": correct,
+                    "isGraded": True,
+                    "text": "question",
+                    "weight": 1,
+                }
+            ],
+        },
+        whenCreated=now,
+        startTime=now,
+        endTime=now,
+        expirationTime=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_mission_timer_skips_settled_challenges(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+    await _new_test_team("team_a")
+    monkeypatch.setitem(manager._cache.challenges, "team_a", {})
+
+    challenges = [
+        _challenge_state("gs_a", False),
+        _challenge_state("gs_b", True),
+    ]
+    deferring = {"gs_b"}
+    handled = []
+
+    async def mission_update(*_, **__):
+        return challenges
+
+    async def handle_challenge(team_id, team_data, challenge):
+        handled.append(challenge.id)
+        if challenge.id in deferring:
+            # As if the challenge's task wasn't unlocked yet.
+            manager._deferred_task_completions += 1
+
+    monkeypatch.setattr(gd_cache.gameboard, "mission_update", mission_update)
+    monkeypatch.setattr(
+        manager, "_mission_timer_challenge_handling", handle_challenge
+    )
+
+    async def cycle():
+        handled.clear()
+        await manager._mission_timer_body(due_only=False)
+        return sorted(handled)
+
+    assert await cycle() == ["gs_a", "gs_b"]
+    # Deferred challenges are handled again until they settle.
+    assert await cycle() == ["gs_b"]
+    deferring.clear()
+    assert await cycle() == ["gs_b"]
+    assert await cycle() == []
+    assert not manager._score_refresh_requests
+
+    challenges[0] = _challenge_state("gs_a", True)
+    assert await cycle() == ["gs_a"]
+    # The team's scores are refreshed as soon as a challenge changes.
+    assert manager._score_refresh_requests == {"team_a"}
+
+
+@pytest.mark.asyncio
+async def test_global_data_index_matches_global_data(
+    event_loop, fixture_load_testdata
+):
+    cache = gd_cache.GameStateManager._cache
+    index = cache.index
+
+    for location in cache.location_map.__root__.values():
+        assert location.locationID in index.locations_by_unlock_code[
+            location.unlockCode.lower()
+        ]
+        assert set(index.comms_by_location.get(location.locationID, ())) == {
+            comm.commID
+            for comm in cache.comm_map.__root__.values()
+            if comm.locationID == location.locationID
+        }
+
+    for mission_id in cache.mission_map.__root__:
+        assert index.tasks_by_mission.get(mission_id, []) == [
+            task.taskID
+            for task in cache.task_map.__root__.values()
+            if task.missionID == mission_id
+        ]
+
+
+@pytest.mark.asyncio
+async def test_task_trigger_index_covers_task_branches(
+    event_loop, fixture_load_testdata
+):
+    cache = gd_cache.GameStateManager._cache
+
+    for task in cache.task_map.__root__.values():
+        for branch in (task.markCompleteWhen, task.cancelWhen, task.failWhen):
+            if not branch:
+                continue
+            assert task.taskID in cache.index.tasks_by_trigger[
+                (branch.type, branch.locationID)
+            ]
+
+
+@pytest.mark.asyncio
+async def test_comm_event_activation_matches_full_scan(
+    event_loop, fixture_load_testdata
+):
+    await _new_test_team("test_team")
+    cache = gd_cache.GameStateManager._cache
+    team_data = cache.team_map.__root__["test_team"]
+    # Completes on a comm event at plto.
+    gd_cache.GameStateManager._unlock_specific_task(
+        "test_team", team_data, cache.task_map.__root__["demotask4"]
+    )
+
+    for location_id in cache.location_map.__root__:
+        team_data.currentStatus.currentLocation = location_id
+        expected = [
+            task.commID
+            for task in cache.task_map.__root__.values()
+            if task.markCompleteWhen
+            and task.markCompleteWhen.type == "comm"
+            and task.markCompleteWhen.locationID == location_id
+            and task.missionID in team_data.missions
+            and team_data.missions[task.missionID].unlocked
+            and not team_data.missions[task.missionID].complete
+            and task.taskID in team_data.tasks
+            and team_data.tasks[task.taskID].visible
+            and not team_data.tasks[task.taskID].complete
+        ]
+
+        gd_cache.GameStateManager._find_comm_event_to_activate(
+            "test_team", team_data
+        )
+
+        status = team_data.currentStatus
+        if expected:
+            assert status.incomingTransmission
+            assert status.incomingTransmissionObject.commID == expected[-1]
+        else:
+            assert not status.incomingTransmission
+
+
+@pytest.mark.asyncio
+async def test_snapshot_changes_only_include_changed_teams(
+    event_loop, fixture_load_testdata
+):
+    manager = gd_cache.GameStateManager
+    await _new_test_team("team_a")
+    await _new_test_team("team_b")
+
+    changes = await manager.snapshot_changes()
+    assert changes.global_snapshot is not None
+    assert changes.replace_teams
+    assert {"team_a", "team_b"} <= changes.team_snapshots.keys()
+
+    # The stored parts put back together make the full snapshot.
+    stored = json.loads(changes.global_snapshot)
+    for team_id, team_snapshot in changes.team_snapshots.items():
+        stored["team_map"][team_id] = json.loads(team_snapshot)
+    assert gd_cache.GameDataCacheSnapshot(**stored) == (
+        manager._cache.to_snapshot()
+    )
+
+    manager.mark_snapshot_persisted(changes)
+    assert await manager.snapshot_changes() is None
+
+    await manager.set_power_mode("team_b", "explorationMode")
+    changes = await manager.snapshot_changes()
+    assert changes.global_snapshot is None
+    assert not changes.replace_teams
+    assert changes.team_snapshots.keys() == {"team_b"}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_data_matches_cache(event_loop, fixture_load_testdata):
+    manager = gd_cache.GameStateManager
+    await _new_test_team("test_team")
+
+    snapshot = await manager.snapshot_data()
+
+    assert gd_cache.GameDataCacheSnapshot(**json.loads(snapshot)) == (
+        manager._cache.to_snapshot()
+    )
+
+
+@pytest.mark.asyncio
+async def test_journal_replay_reproduces_team_state(
+    event_loop, fixture_load_testdata, test_settings, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+
+    async def change_network(*_, **__):
+        ...
+
+    monkeypatch.setattr(
+        manager, "_change_gamespace_gateway_network", change_network
+    )
+    monkeypatch.setattr(gd_journal.ActionJournal, "_enabled", True)
+    monkeypatch.setattr(gd_journal.ActionJournal, "_pending", [])
+
+    await _new_test_team("test_team")
+    await manager.set_power_mode("test_team", "explorationMode")
+    await manager.scan("test_team")
+    await manager.retract_antenna("test_team")
+    expected = team_data_to_snapshot(
+        manager._cache.team_map.__root__["test_team"]
+    )
+
+    entries = gd_journal.ActionJournal._pending
+    assert [entry.action for entry in entries] == [
+        "new_team", "set_power_mode", "scan", "retract_antenna"
+    ]
+
+    monkeypatch.setattr(gd_journal.ActionJournal, "_enabled", False)
+    with open("initial_state.json") as f:
+        initial_cache = gd_cache.GameDataCacheSnapshot(**json.load(f))
+    await manager.init(initial_cache, test_settings)
+    await manager.replay_journal(entries)
+
+    assert team_data_to_snapshot(
+        manager._cache.team_map.__root__["test_team"]
+    ) == expected
+
+
+@pytest.mark.asyncio
+async def test_team_data_is_rebuilt_only_on_change(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+
+    async def no_data(*_, **__):
+        return None
+
+    monkeypatch.setattr(gd_cache.gameboard, "team_score", no_data)
+    await _new_test_team("test_team")
+
+    first, _ = await manager.get_versioned_team_data("test_team")
+    second, session = await manager.get_versioned_team_data("test_team")
+    assert second is first
+
+    # The body is the response with the latest session data.
+    assert json.loads(second.json(session)) == json.loads(
+        second.response.copy(update={"session": session}).json()
+    )
+    # So is the ETag. The current time is in whole seconds.
+    assert session.gameCurrentTime.microsecond == 0
+    later = session.copy(
+        update={
+            "gameCurrentTime": session.gameCurrentTime + timedelta(seconds=1)
+        }
+    )
+    assert second.etag(later) != second.etag(session)
+
+    await manager.set_power_mode("test_team", "explorationMode")
+    third, _ = await manager.get_versioned_team_data("test_team")
+    assert third.key_digest != first.key_digest
+    assert third.response.currentStatus.powerStatus == "explorationMode"
+
+
+@pytest.mark.asyncio
+async def test_team_data_reads_prefetched_scores(
+    event_loop, fixture_load_testdata, monkeypatch
+):
+    manager = gd_cache.GameStateManager
+    fake = FakeGameboard()
+    for team_id in ("team_a", "team_b"):
+        await _new_test_team(team_id)
+        fake.add_team(team_id, {f"gs_{team_id}": "demomission"})
+        monkeypatch.setitem(
+            manager._cache.gamespace_to_mission,
+            f"gs_{team_id}",
+            "demomission",
+        )
+    monkeypatch.setattr(gd_cache, "FIRST_SCORES_TIMEOUT", 0.05)
+
+    requests = []
+    gameboard_up = asyncio.Event()
+
+    async def team_score(team_id, game_id=None, max_age=None):
+        requests.append((team_id, max_age))
+        if team_id == "team_b":
+            await gameboard_up.wait()
+        return TeamGameScoreQueryResponse(
+            gameInfo=fake._game_info("game", ["demomission"]),
+            score=fake._team_score(team_id),
+        )
+
+    monkeypatch.setattr(gd_cache.gameboard, "team_score", team_score)
+
+    def base_solve_value(game_data: gd_cache.VersionedGameData) -> int:
+        [mission] = [
+            mission
+            for mission in game_data.response.missions
+            if mission.missionID == "demomission"
+        ]
+        return mission.baseSolveValue
+
+    # A team's first GameData waits for its first scores.
+    first, _ = await manager.get_versioned_team_data("team_a")
+    assert requests == [("team_a", 0.0)]
+    assert base_solve_value(first) == 100
+    [max_age] = gd_cache.TEAM_SCORE_MAX_AGE.samples()
+    assert float(max_age.split()[-1]) > 0
+
+    # After that, it's built from the cached scores.
+    await manager.set_power_mode("team_a", "explorationMode")
+    second, _ = await manager.get_versioned_team_data("team_a")
+    assert second.key_digest != first.key_digest
+    assert len(requests) == 1
+
+    # If Gameboard is slow, it only waits so long, and then only once.
+    slow, _ = await manager.get_versioned_team_data("team_b")
+    assert base_solve_value(slow) == 0
+    assert manager._score_refresh_requests == {"team_b"}
+    gameboard_up.set()
+    await manager._first_score_fetches["team_b"]
+    fetched, _ = await manager.get_versioned_team_data("team_b")
+    assert base_solve_value(fetched) == 100
+    assert requests.count(("team_b", 0.0)) == 1
+
+
+@pytest.mark.asyncio
+async def test_session_completion_counts_follow_completions(
+    event_loop, fixture_load_testdata
+):
+    manager = gd_cache.GameStateManager
+    await _new_test_team("team_a")
+    await _new_test_team("team_b")
+    cache = manager._cache
+    global_mission = cache.mission_map.__root__["demomission"]
+
+    def complete(team_id: str):
+        team_data = cache.team_map.__root__[team_id]
+        return manager._complete_mission_and_unlock_next(
+            team_id,
+            team_data,
+            team_data.missions["demomission"],
+            global_mission,
+        )
+
+    await complete("team_a")
+    await manager.register_session(1, ["team_a", "team_b"])
+    assert manager._get_mission_completion_in_team_session(
+        "team_b", "demomission"
+    ) == 1
+
+    await complete("team_b")
+    # Completing a mission again doesn't count twice.
+    await complete("team_b")
+    assert manager._session_completions[1]["demomission"] == 2
+
+    await manager.unregister_session(1)
+    assert manager._get_mission_completion_in_team_session(
+        "team_a", "demomission"
+    ) == 0
+
+
+@pytest.mark.asyncio
+async def test_completions_only_change_their_sessions_team_data(
+    event_loop, fixture_load_testdata
+):
+    manager = gd_cache.GameStateManager
+    for team_id in ("team_a", "team_b", "team_c"):
+        await _new_test_team(team_id)
+    await manager.register_session(1, ["team_a", "team_b"])
+    await manager.register_session(2, ["team_c"])
+
+    def keys():
+        return {
+            team_id: manager._team_data_key(team_id, {})
+            for team_id in ("team_b", "team_c")
+        }
+
+    before = keys()
+    team_data = manager._cache.team_map.__root__["team_a"]
+    await manager._complete_mission_and_unlock_next(
+        "team_a",
+        team_data,
+        team_data.missions["demomission"],
+        manager._cache.mission_map.__root__["demomission"],
+    )
+    after = keys()
+
+    assert after["team_b"] != before["team_b"]
+    assert after["team_c"] == before["team_c"]
+
+    await manager.unregister_session(1)
+    await manager.unregister_session(2)
+
+
+@pytest.mark.asyncio
+async def test_full_location_data_matches_merged_models(
+    event_loop, fixture_load_testdata
+):
+    manager = gd_cache.GameStateManager
+    await _new_test_team("test_team")
+    cache = manager._cache
+    team_data = cache.team_map.__root__["test_team"]
+
+    full_locations = manager._get_team_unlocked_locations(team_data)
+
+    assert full_locations == [
+        gd_cache.LocationDataFull(
+            **cache.location_map.__root__[location_id].dict()
+            | asdict(location)
+        )
+        for location_id, location in team_data.locations.items()
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_orjson", [True, False])
+async def test_json_response_matches_pydantic_encoding(
+    event_loop, fixture_load_testdata, monkeypatch, use_orjson
+):
+    if not use_orjson:
+        monkeypatch.setattr(gd_jsonresponse, "orjson", None)
+    elif gd_jsonresponse.orjson is None:
+        pytest.skip("orjson is not installed.")
+    team_data = gd_cache.GameStateManager._cache.team_initial_state
+    response = gd_cache.GameDataTeamSpecific(
+        currentStatus=team_data.currentStatus,
+        session=team_data.session,
+        ship=team_data.ship,
+        locations=[],
+        missions=[],
+    )
+
+    assert json.loads(gd_jsonresponse.dumps(response)) == json.loads(
+        response.json()
+    )
+
+
+@pytest.mark.asyncio
+async def test_team_clone_is_independent(event_loop, fixture_load_testdata):
+    await _new_test_team("test_team")
+    team_data = gd_cache.GameStateManager._cache.team_map.__root__["test_team"]
+
+    before = team_data_to_snapshot(team_data)
+    clone = team_data.clone()
+    assert clone == team_data
+
+    mission = next(iter(clone.missions.values()))
+    mission.tasks.append("newtask")
+    next(iter(clone.locations.values())).networkEstablished = True
+    next(iter(clone.tasks.values())).complete = True
+    clone.session.teamInfoName = "other_team"
+    clone.currentStatus.powerStatus = "explorationMode"
+
+    assert clone != team_data
+    assert team_data_to_snapshot(team_data) == before
@@ -0,0 +1,106 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+import asyncio
+
+from fastapi import APIRouter, FastAPI, HTTPException
+from httpx import AsyncClient
+import pytest
+
+from .. import metrics
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_histogram_render():
+    histogram = metrics.Histogram(
+        "test_histogram_seconds", "A test histogram.", ("route",), (0.1, 1.0)
+    )
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    assert histogram.count("/a") == 3
+    assert histogram.count("/b") == 0
+    assert histogram.render().splitlines() == [
+        "# HELP test_histogram_seconds A test histogram.",
+        "# TYPE test_histogram_seconds histogram",
+        'test_histogram_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_histogram_seconds_bucket{route="/a",le="1.0"} 2',
+        'test_histogram_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_histogram_seconds_sum{route="/a"} 5.55',
+        'test_histogram_seconds_count{route="/a"} 3',
+    ]
+    assert "# TYPE test_histogram_seconds histogram" in metrics.render()
+
+
+def test_normalize_endpoint():
+    assert metrics.normalize_endpoint("team") == "team"
+    assert (
+        metrics.normalize_endpoint("gamespace/7d2c3c2a-41d4/challenge")
+        == "gamespace/{id}/challenge"
+    )
+
+
+@pytest.mark.asyncio
+async def test_instrumented_lock_labels_by_method(event_loop):
+    lock = metrics.InstrumentedLock("test")
+
+    async def hold_lock():
+        async with lock.labelled("hold_lock"):
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(hold_lock(), hold_lock())
+    async with lock:
+        pass
+
+    assert metrics.LOCK_WAIT.count("test", "hold_lock") == 2
+    assert metrics.LOCK_HOLD.count("test", "hold_lock") == 2
+    assert metrics.LOCK_HOLD.count("test", "unlabelled") == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_route(event_loop):
+    router = APIRouter(prefix="/timed", route_class=metrics.TimedRoute)
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return item_id
+
+    app = FastAPI()
+    app.include_router(router)
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/timed/1")).status_code == 200
+        assert (await client.get("/timed/0")).status_code == 404
+
+    assert metrics.ROUTE_DURATION.count("GET", "/timed/{item_id}", "200") == 1
+    assert metrics.ROUTE_DURATION.count("GET", "/timed/{item_id}", "404") == 1
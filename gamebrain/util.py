@@ -141,6 +141,7 @@ async def cleanup_dead_sessions(nuke: bool = False):
             f"Cleaning up session {session['id']}."
         )
         await deactivate_game_session(session["id"])
+        await GameStateManager.unregister_session(session["id"])
 
 
 async def nuke_active_sessions():
@@ -91,6 +91,55 @@ def get_location_map(location_file_content: JsonStr) -> LocationMap:
     return LocationMap(__root__=data)
 
 
+def validate_initial_state(initial_cache: GameDataCacheSnapshot):
+    comm_map = initial_cache.comm_map
+    task_map = initial_cache.task_map
+    mission_map = initial_cache.mission_map
+    location_map = initial_cache.location_map
+
+    for task_id, task in task_map.__root__.items():
+        assert (
+            task.missionID in mission_map.__root__
+        ), f"Task {task_id} has mission {task.missionID}."
+        assert (
+            not task.next or task.next in task_map.__root__
+        ), f"Task {task_id} has next task {task.next}."
+        if not task.markCompleteWhen:
+            continue
+        for other_task_id in (
+            *(task.markCompleteWhen.alsoComplete or ()),
+            *task.markCompleteWhen.indirectPrerequisiteTasks,
+        ):
+            assert (
+                other_task_id in task_map.__root__
+            ), f"Task {task_id} references task {other_task_id}."
+        assert (
+            not task.markCompleteWhen.unlockLocation
+            or task.markCompleteWhen.unlockLocation in location_map.__root__
+        ), f"Task {task_id} unlocks location {task.markCompleteWhen.unlockLocation}."
+
+    for mission_id, mission in mission_map.__root__.items():
+        for task in mission.taskList:
+            assert (
+                task.taskID in task_map.__root__
+            ), f"Mission {mission_id} has task {task.taskID}."
+        for unlocked_missions in mission.firstNthCompletionUnlocks:
+            for unlocked_mission_id in unlocked_missions:
+                assert (
+                    unlocked_mission_id in mission_map.__root__
+                ), f"Mission {mission_id} unlocks mission {unlocked_mission_id}."
+
+    for comm_id, comm in comm_map.__root__.items():
+        assert (
+            comm.locationID in location_map.__root__
+        ), f"Comm event {comm_id} has location {comm.locationID}."
+
+    for location_id, location in location_map.__root__.items():
+        assert (
+            location.firstContactEvent in comm_map.__root__
+        ), f"Location {location_id} has first contact event {location.firstContactEvent}."
+
+
 def main():
     missing_raw_files = []
     for variable, value in globals().items():
@@ -152,31 +201,10 @@ def main():
         team_initial_state=team_initial_state,
     )
 
-    # Basic validation.
-
-    for task_id, task in task_map.__root__.items():
-        assert (
-            task.missionID in mission_map.__root__
-        ), f"Task {task_id} has mission {task.missionID}."
-
-    for mission_id, mission in mission_map.__root__.items():
-        for task in mission.taskList:
-            assert (
-                task.taskID in task_map.__root__
-            ), f"Mission {mission_id} has task {task.taskID}."
-
-    for comm_id, comm in comm_map.__root__.items():
-        assert (
-            comm.locationID in location_map.__root__
-        ), f"Comm event {comm_id} has location {comm.locationID}."
-
-    for location_id, location in location_map.__root__.items():
-        assert (
-            location.firstContactEvent in comm_map.__root__
-        ), f"Location {location_id} has first contact event {location.firstContactEvent}."
+    validate_initial_state(initial_cache)
 
     with open(f"{FILE_PREFIX}_initial_state.json", "w") as f:
-        json.dump(initial_cache.dict(), f, indent=2)
+        f.write(initial_cache.json(indent=2))
 
 
 if __name__ == "__main__":
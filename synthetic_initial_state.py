@@ -0,0 +1,517 @@
+# Cyber Defenders Video Game
+
+# Copyright 2023 Carnegie Mellon University.
+
+# NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING
+# INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON
+# UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS
+# TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE
+# OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE
+# MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND
+# WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+
+# Released under a MIT (SEI)-style license, please see license.txt or contact
+# permission@sei.cmu.edu for full terms.
+
+# [DISTRIBUTION STATEMENT A] This material has been approved for public
+# release and unlimited distribution.  Please see Copyright notice for
+# non-US Government use and distribution.
+
+# This Software includes and/or makes use of Third-Party Software each subject
+# to its own license.
+
+# DM23-0100
+
+
+###
+# Generates a large, synthetic initial state for benchmarking and capacity
+# planning. The game data is built in the raw game data format and imported
+# the same way initial_state_conversion.py imports the hand-written files.
+# The output only depends on the arguments, so runs with the same seed are
+# reproducible.
+###
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+import random
+import string
+import uuid
+
+from gamebrain.gamedata.cache import GameDataCacheSnapshot, GlobalData, TeamMap
+from gamebrain.gamedata.model import (
+    CurrentLocationGameplayDataTeamSpecific,
+    GameDataTeamSpecific,
+    GamespaceData,
+    LocationDataTeamSpecific,
+    MissionDataTeamSpecific,
+    SessionDataTeamSpecific,
+    ShipDataTeamSpecific,
+    TaskDataTeamSpecific,
+)
+from initial_state_conversion import (
+    get_comm_map,
+    get_location_map,
+    get_mission_map,
+    get_task_map,
+    validate_initial_state,
+)
+
+GATEWAY_VM_NAME = "gateway"
+JUMP_CUTSCENE_URL = "https://example.com/jump.mp4"
+# Fixed so that the output doesn't depend on when it was generated.
+GENERATED_TIME = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+# Relative weights of the task completion types. Challenge and indirect tasks
+# have extra requirements, so they're sometimes replaced with a location task.
+TASK_TYPE_WEIGHTS = {
+    "comm": 4,
+    "jump": 3,
+    "scan": 2,
+    "explorationMode": 1,
+    "antennaExtended": 1,
+    "challenge": 1,
+    "indirect": 1,
+}
+
+
+@dataclass
+class GeneratorConfig:
+    locations: int = 2000
+    missions: int = 500
+    tasks_per_mission: int = 8
+    teams: int = 20
+    initial_locations: int = 5
+    initial_missions: int = 10
+    seed: int = 0
+
+
+def _unlock_codes(rng: random.Random, count: int) -> list[str]:
+    alphabet = string.ascii_lowercase + string.digits
+    codes = set()
+    ordered_codes = []
+    while len(ordered_codes) < count:
+        code = "".join(rng.choices(alphabet, k=6))
+        if code not in codes:
+            codes.add(code)
+            ordered_codes.append(code)
+    return ordered_codes
+
+
+def generate_locations(
+    rng: random.Random, config: GeneratorConfig
+) -> tuple[dict, dict]:
+    """
+    Returns the raw location and first contact comm event data.
+    """
+    locations = {}
+    comms = {}
+    codes = _unlock_codes(rng, config.locations)
+    for n, code in enumerate(codes):
+        location_id = f"loc{n:05}"
+        comm_id = f"{location_id}-contact"
+        locations[location_id] = {
+            "locationID": location_id,
+            "name": f"Location {n}",
+            "imageID": f"image{rng.randint(1, 20)}",
+            "backdropID": f"bkd{rng.randint(1, 20)}",
+            "surroundings": f"Surroundings of location {n}",
+            # Initial locations are unlocked from the start, like Mars in the
+            # default game data.
+            "unlockCode": "" if n < config.initial_locations else code,
+            "trajectoryLaunch": rng.randint(1, 360),
+            "trajectoryCorrection": rng.randint(1, 360),
+            "trajectoryCube": rng.randint(1, 360),
+            "firstContactEvent": comm_id,
+            "networkName": f"net{n:05}",
+        }
+        comms[comm_id] = _comm_event(comm_id, location_id, first_contact=True)
+    return locations, comms
+
+
+def _comm_event(comm_id: str, location_id: str, first_contact: bool) -> dict:
+    return {
+        "commID": comm_id,
+        "videoURL": f"https://example.com/{comm_id}.mp4",
+        "commTemplate": "incoming",
+        "translationMessage": f"Translation for {comm_id}",
+        "scanInfoMessage": f"Scan info for {comm_id}",
+        "firstContact": first_contact,
+        "locationID": location_id,
+    }
+
+
+def _task_type(rng: random.Random, n: int, task_count: int, has_challenge: bool):
+    task_type = rng.choices(
+        tuple(TASK_TYPE_WEIGHTS), weights=tuple(TASK_TYPE_WEIGHTS.values())
+    )[0]
+    if task_type == "challenge" and has_challenge:
+        # There's one challenge gamespace per mission.
+        return "scan"
+    if task_type == "indirect" and not 0 < n < task_count - 1:
+        # An indirect task needs an earlier task as its prerequisite and a
+        # later one to complete it.
+        return "comm"
+    return task_type
+
+
+def generate_mission(
+    rng: random.Random,
+    config: GeneratorConfig,
+    mission_number: int,
+    location_ids: list[str],
+    tasks: dict,
+    comms: dict,
+) -> dict:
+    """
+    Adds the mission's tasks (and their comm events) and returns the raw
+    mission data.
+
+    Tasks form a `next` chain. Jumps are preceded by a task that unlocks the
+    destination, and every indirect task is completed through alsoComplete by
+    the task after it, once its prerequisites are complete.
+    """
+    mission_id = f"mission{mission_number:04}"
+    mission_location = rng.choice(location_ids)
+    task_count = config.tasks_per_mission
+    task_ids = [f"{mission_id}-task{n:02}" for n in range(task_count)]
+
+    mission_tasks = []
+    has_challenge = False
+    previous_type = None
+    for n, task_id in enumerate(task_ids):
+        task_type = _task_type(rng, n, task_count, has_challenge)
+        if previous_type == "indirect" and task_type in ("indirect", "challenge"):
+            task_type = "scan"
+        has_challenge = has_challenge or task_type == "challenge"
+
+        location_id = mission_location
+        if task_type == "jump":
+            location_id = rng.choice(location_ids)
+
+        comm_id = ""
+        if task_type == "comm":
+            comm_id = f"{task_id}-comm"
+            comms[comm_id] = _comm_event(comm_id, location_id, first_contact=False)
+
+        mark_complete_when = {"type": task_type, "locationID": location_id}
+        if task_type == "indirect":
+            mark_complete_when["indirectPrerequisiteTasks"] = rng.sample(
+                task_ids[:n], k=min(n, rng.randint(1, 2))
+            )
+        if previous_type == "indirect":
+            mark_complete_when["alsoComplete"] = [task_ids[n - 1]]
+        if task_type == "jump" and n > 0:
+            mission_tasks[-1]["markCompleteWhen"]["unlockLocation"] = location_id
+
+        mission_tasks.append(
+            {
+                "taskID": task_id,
+                "missionID": mission_id,
+                "descriptionText": f"Task {n} of mission {mission_number}",
+                "infoText": f"Complete the {task_type} objective.",
+                "videoPresent": False,
+                "videoURL": "",
+                "commID": comm_id,
+                "next": task_ids[n + 1] if n < task_count - 1 else None,
+                "completesMission": n == task_count - 1,
+                "markCompleteWhen": mark_complete_when,
+            }
+        )
+        previous_type = task_type
+
+    for task in mission_tasks:
+        tasks[task["taskID"]] = task
+
+    # Unlock a few later missions on first completion, fewer after that.
+    later_missions = range(mission_number + 1, config.missions)
+    unlocks = [
+        [
+            f"mission{n:04}"
+            for n in sorted(rng.sample(later_missions, k=min(k, len(later_missions))))
+        ]
+        for k in (3, 1)
+    ]
+
+    return {
+        "missionID": mission_id,
+        "title": f"Mission {mission_number}",
+        "summaryShort": f"Summary of mission {mission_number}",
+        "summaryLong": f"Long summary of mission {mission_number}",
+        "missionIcon": f"icon{rng.randint(1, 10)}",
+        "roleList": rng.sample(("Pilot", "Engineer", "Navigator", "Comms"), k=2),
+        "points": rng.randrange(100, 2000, 100),
+        "firstNthCompletionUnlocks": [mission_ids for mission_ids in unlocks if mission_ids],
+    }
+
+
+def generate_game_data(rng: random.Random, config: GeneratorConfig) -> dict:
+    """
+    Returns the global game data in the raw game data format.
+    """
+    locations, comms = generate_locations(rng, config)
+    location_ids = list(locations)
+    tasks = {}
+    missions = {}
+    for n in range(config.missions):
+        mission = generate_mission(rng, config, n, location_ids, tasks, comms)
+        missions[mission["missionID"]] = mission
+
+    return {
+        "comms": comms,
+        "tasks": tasks,
+        "missions": missions,
+        "locations": locations,
+    }
+
+
+def _ship_gamespace(gamespace_id: str) -> GamespaceData:
+    return GamespaceData(
+        gamespaceID=gamespace_id,
+        consoleURLs=[],
+        gatewayVmName=GATEWAY_VM_NAME,
+        gatewayNic=1,
+        gatewayWanNetworkName="ship",
+    )
+
+
+def _mission_progress(
+    global_data: GlobalData, mission_id: str, completed: int
+) -> MissionDataTeamSpecific:
+    """
+    Team mission data with the first `completed` tasks complete. Like the
+    game, an incomplete indirect task also makes the task after it visible.
+    """
+    task_ids = [
+        task.taskID
+        for task in global_data.mission_map.__root__[mission_id].taskList
+    ]
+    task_list = [
+        TaskDataTeamSpecific(taskID=task_id, visible=True, complete=True)
+        for task_id in task_ids[:completed]
+    ]
+    for task_id in task_ids[completed:]:
+        task_list.append(TaskDataTeamSpecific(taskID=task_id, visible=True))
+        if global_data.task_map.__root__[task_id].markCompleteWhen.type != "indirect":
+            break
+    return MissionDataTeamSpecific(
+        missionID=mission_id,
+        complete=completed == len(task_ids),
+        taskList=task_list,
+    )
+
+
+def _team_state(
+    global_data: GlobalData,
+    initial_location_ids: list[str],
+    unlocked_mission_ids: list[str],
+    session: SessionDataTeamSpecific,
+    ship: ShipDataTeamSpecific,
+    progress: dict[str, int],
+) -> GameDataTeamSpecific:
+    """
+    Builds team data with the given missions unlocked, where progress is the
+    number of tasks completed in each one. Locations unlocked and visited by
+    completed tasks are included.
+    """
+    location_map = global_data.location_map.__root__
+    task_map = global_data.task_map.__root__
+    current_location = initial_location_ids[0]
+    locations = {
+        location_id: LocationDataTeamSpecific(locationID=location_id)
+        for location_id in initial_location_ids
+    }
+    locations[current_location].visited = True
+    locations[current_location].scanned = True
+
+    missions = []
+    for mission_id in global_data.mission_map.__root__:
+        if mission_id not in unlocked_mission_ids:
+            # Every mission needs team data for the game to unlock it later.
+            missions.append(
+                MissionDataTeamSpecific(
+                    missionID=mission_id, unlocked=False, visible=False, taskList=[]
+                )
+            )
+            continue
+        completed = progress.get(mission_id, 0)
+        mission = _mission_progress(global_data, mission_id, completed)
+        for team_task in mission.taskList[:completed]:
+            criteria = task_map[team_task.taskID].markCompleteWhen
+            if criteria.unlockLocation:
+                locations.setdefault(
+                    criteria.unlockLocation,
+                    LocationDataTeamSpecific(locationID=criteria.unlockLocation),
+                )
+            if criteria.type == "jump":
+                current_location = criteria.locationID
+                locations.setdefault(
+                    current_location,
+                    LocationDataTeamSpecific(locationID=current_location),
+                ).visited = True
+        missions.append(mission)
+
+    return GameDataTeamSpecific(
+        currentStatus=CurrentLocationGameplayDataTeamSpecific(
+            currentLocation=current_location,
+            currentLocationScanned=locations[current_location].scanned,
+            currentLocationSurroundings=location_map[current_location].surroundings,
+            firstContactComplete=True,
+        ),
+        session=session,
+        ship=ship,
+        locations=list(locations.values()),
+        missions=missions,
+        pc4_handling_cllctn6=GENERATED_TIME,
+    )
+
+
+def generate_teams(
+    rng: random.Random,
+    config: GeneratorConfig,
+    global_data: GlobalData,
+) -> tuple[TeamMap, dict, dict]:
+    """
+    Returns the team map, challenge map and gamespace to mission map for
+    teams partway through the game. Each team has a random amount of progress
+    in the initial missions, and completed missions unlock their
+    firstNthCompletionUnlocks missions.
+    """
+    mission_map = global_data.mission_map.__root__
+    initial_location_ids = list(global_data.location_map.__root__)[
+        : config.initial_locations
+    ]
+    initial_mission_ids = list(mission_map)[: config.initial_missions]
+    challenge_tasks = {
+        task.missionID: task
+        for task in global_data.task_map.__root__.values()
+        if task.markCompleteWhen.type == "challenge"
+    }
+
+    team_map = {}
+    challenges = {}
+    gamespace_to_mission = {}
+    for n in range(config.teams):
+        team_id = str(uuid.UUID(int=rng.getrandbits(128)))
+
+        progress = {}
+        unlocked_mission_ids = list(initial_mission_ids)
+        for mission_id in unlocked_mission_ids:
+            task_count = len(mission_map[mission_id].taskList)
+            progress[mission_id] = completed = rng.randint(0, task_count)
+            unlocks = mission_map[mission_id].firstNthCompletionUnlocks
+            if completed < task_count or not unlocks:
+                continue
+            # Missions unlocked here are visited later in this same loop.
+            for unlocked_mission_id in unlocks[0]:
+                if unlocked_mission_id not in unlocked_mission_ids:
+                    unlocked_mission_ids.append(unlocked_mission_id)
+
+        team_map[team_id] = _team_state(
+            global_data,
+            initial_location_ids,
+            unlocked_mission_ids,
+            SessionDataTeamSpecific(
+                teamInfoName=f"Team {n}",
+                jumpCutsceneURL=JUMP_CUTSCENE_URL,
+            ),
+            ShipDataTeamSpecific(gamespaceData=_ship_gamespace(f"{team_id}-ship")),
+            progress,
+        )
+
+        team_challenges = {}
+        for mission_id, task in challenge_tasks.items():
+            gamespace_id = f"{team_id}-{mission_id}"
+            team_challenges[mission_id] = GamespaceData(
+                taskID=task.taskID,
+                locationID=task.markCompleteWhen.locationID,
+                gatewayVmName=GATEWAY_VM_NAME,
+                gatewayNic=1,
+                gamespaceID=gamespace_id,
+                consoleURLs=[],
+            )
+            gamespace_to_mission[gamespace_id] = mission_id
+        challenges[team_id] = team_challenges
+
+    return TeamMap(__root__=team_map), challenges, gamespace_to_mission
+
+
+def generate(config: GeneratorConfig) -> GameDataCacheSnapshot:
+    rng = random.Random(config.seed)
+    game_data = generate_game_data(rng, config)
+
+    task_map = get_task_map(json.dumps(game_data["tasks"]))
+    global_data = GlobalData(
+        comm_map=get_comm_map(json.dumps(game_data["comms"])),
+        task_map=task_map,
+        mission_map=get_mission_map(task_map, json.dumps(game_data["missions"])),
+        location_map=get_location_map(json.dumps(game_data["locations"])),
+    )
+
+    team_initial_state = _team_state(
+        global_data,
+        list(global_data.location_map.__root__)[: config.initial_locations],
+        list(global_data.mission_map.__root__)[: config.initial_missions],
+        SessionDataTeamSpecific(
+            teamInfoName="Default Team Name", jumpCutsceneURL=JUMP_CUTSCENE_URL
+        ),
+        ShipDataTeamSpecific(),
+        {},
+    )
+    team_map, challenges, gamespace_to_mission = generate_teams(
+        rng, config, global_data
+    )
+
+    initial_cache = GameDataCacheSnapshot(
+        comm_map=global_data.comm_map,
+        task_map=global_data.task_map,
+        mission_map=global_data.mission_map,
+        location_map=global_data.location_map,
+        team_map=team_map,
+        team_initial_state=team_initial_state,
+        challenges=challenges,
+        gamespace_to_mission=gamespace_to_mission,
+    )
+    validate_initial_state(initial_cache)
+    return initial_cache
+
+
+def main():
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic initial state for benchmarking."
+    )
+    parser.add_argument("--locations", type=int, default=defaults.locations)
+    parser.add_argument("--missions", type=int, default=defaults.missions)
+    parser.add_argument(
+        "--tasks-per-mission", type=int, default=defaults.tasks_per_mission
+    )
+    parser.add_argument("--teams", type=int, default=defaults.teams)
+    parser.add_argument(
+        "--initial-locations", type=int, default=defaults.initial_locations
+    )
+    parser.add_argument(
+        "--initial-missions", type=int, default=defaults.initial_missions
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--output", default="synthetic_initial_state.json")
+    args = parser.parse_args()
+
+    initial_cache = generate(
+        GeneratorConfig(
+            locations=args.locations,
+            missions=args.missions,
+            tasks_per_mission=args.tasks_per_mission,
+            teams=args.teams,
+            initial_locations=args.initial_locations,
+            initial_missions=args.initial_missions,
+            seed=args.seed,
+        )
+    )
+    with open(args.output, "w") as f:
+        f.write(initial_cache.json(indent=2))
+
+
+if __name__ == "__main__":
+    main()